@@ -10,11 +10,11 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional
 import hashlib
-import sqlite3
-import threading
 import time
+from vault_db import VaultDB
+from schema_migrations import migrate
 
 class AdvancedClaudeIntegration:
     """Advanced Claude integration with personality tracking and deep memory"""
@@ -24,6 +24,7 @@ class AdvancedClaudeIntegration:
         self.claude_folder = self.vault_path / "09-Claude-Integration" 
         self.memory_folder = self.vault_path / "10-Agent-Memory"
         self.db_path = self.vault_path / "claude_evolution.db"
+        self.db = VaultDB.shared(self.db_path)
         
         self.ensure_directories()
         self.init_database()
@@ -39,61 +40,9 @@ class AdvancedClaudeIntegration:
         (self.memory_folder / "Context-Archives").mkdir(exist_ok=True)
         
     def init_database(self):
-        """Initialize SQLite database for advanced tracking"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS conversations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    session_id TEXT,
-                    message_count INTEGER,
-                    topics TEXT,
-                    personality_traits TEXT,
-                    user_satisfaction INTEGER,
-                    model_version TEXT,
-                    context_quality INTEGER,
-                    response_time REAL,
-                    creativity_score INTEGER,
-                    technical_accuracy INTEGER
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS personality_evolution (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    trait_name TEXT,
-                    trait_value REAL,
-                    confidence_level REAL,
-                    context TEXT,
-                    model_version TEXT
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS ai_todos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_date DATE,
-                    todo_text TEXT,
-                    importance INTEGER,
-                    category TEXT,
-                    status TEXT DEFAULT 'pending',
-                    due_date DATE,
-                    completion_date DATE,
-                    notes TEXT
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS context_snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    context_type TEXT,
-                    context_data TEXT,
-                    model_version TEXT,
-                    effectiveness_score INTEGER
-                )
-            """)
+        """Initialize SQLite database for advanced tracking, upgrading older schemas"""
+        with self.db.connection() as conn:
+            migrate(conn)
             
     def log_conversation_start(self, session_type: str = "general", goals: str = "") -> str:
         """Start logging a new conversation with advanced tracking"""
@@ -166,22 +115,20 @@ class AdvancedClaudeIntegration:
             f.write(session_content)
             
         # Log to database
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO conversations (session_id, topics, model_version)
-                VALUES (?, ?, ?)
-            """, (session_id, goals, "claude-sonnet-4-20250514"))
+        self.db.enqueue("""
+            INSERT INTO conversations (session_id, topics, model_version)
+            VALUES (?, ?, ?)
+        """, (session_id, goals, "claude-sonnet-4-20250514"))
             
         print(f"Advanced conversation logging started: {session_id}")
         return session_id
         
     def track_personality_trait(self, trait_name: str, value: float, confidence: float = 0.8, context: str = ""):
         """Track a specific personality trait observation"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO personality_evolution (trait_name, trait_value, confidence_level, context, model_version)
-                VALUES (?, ?, ?, ?, ?)
-            """, (trait_name, value, confidence, context, "claude-sonnet-4-20250514"))
+        self.db.enqueue("""
+            INSERT INTO personality_evolution (trait_name, trait_value, confidence_level, context, model_version)
+            VALUES (?, ?, ?, ?, ?)
+        """, (trait_name, value, confidence, context, "claude-sonnet-4-20250514"))
             
         # Update personality profile file
         self.update_personality_profile(trait_name, value, context)
@@ -218,11 +165,10 @@ class AdvancedClaudeIntegration:
                     
     def add_ai_todo(self, todo_text: str, importance: int = 2, category: str = "general", due_date: Optional[str] = None):
         """Add an AI-related todo item for tracking"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO ai_todos (created_date, todo_text, importance, category, due_date)
-                VALUES (DATE('now'), ?, ?, ?, ?)
-            """, (todo_text, importance, category, due_date))
+        self.db.enqueue("""
+            INSERT INTO ai_todos (created_date, todo_text, importance, category, due_date)
+            VALUES (DATE('now'), ?, ?, ?, ?)
+        """, (todo_text, importance, category, due_date))
             
         # Create AI todo note
         todo_id = int(time.time())
@@ -271,7 +217,7 @@ Why this todo is important for AI relationship/development:
         
     def analyze_conversation_patterns(self, days: int = 30) -> Dict:
         """Analyze conversation patterns over time"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             # Get recent conversations
             conversations = conn.execute("""
                 SELECT * FROM conversations 
@@ -424,11 +370,10 @@ Why this todo is important for AI relationship/development:
         
     def create_context_snapshot(self, context_type: str, context_data: Dict, effectiveness_score: int = 5):
         """Create a snapshot of current context for future reference"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO context_snapshots (context_type, context_data, model_version, effectiveness_score)
-                VALUES (?, ?, ?, ?)
-            """, (context_type, json.dumps(context_data), "claude-sonnet-4-20250514", effectiveness_score))
+        self.db.enqueue("""
+            INSERT INTO context_snapshots (context_type, context_data, model_version, effectiveness_score)
+            VALUES (?, ?, ?, ?)
+        """, (context_type, json.dumps(context_data), "claude-sonnet-4-20250514", effectiveness_score))
             
         # Create context file
         snapshot_id = int(time.time())
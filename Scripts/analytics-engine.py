@@ -4,305 +4,233 @@ Advanced Analytics Engine for Obsidian Vault
 Generates deep insights, patterns, and recommendations from vault data
 """
 
-import os
-import re
 import json
-import pandas as pd
 from pathlib import Path
 from datetime import datetime, date, timedelta
-from collections import Counter, defaultdict
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List, Tuple, Optional
-import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, TextIO
+from vault_index import VaultIndex
+from date_range import DateRange, add_range_arguments, parse_day, resolve_windows
+from instrumentation import enable, finish, timed
+
+SESSION_FOLDER = "09-Claude-Integration"
 
 class VaultAnalytics:
     """Advanced analytics for Obsidian vault data"""
     
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, workers: int = 1, index: Optional[VaultIndex] = None):
         self.vault_path = Path(vault_path)
         self.analytics_folder = self.vault_path / "11-Analytics"
         self.analytics_folder.mkdir(exist_ok=True)
-        
-    def analyze_productivity_patterns(self) -> Dict:
+        self.index = index or VaultIndex(vault_path, workers=workers)
+        self._graph = None
+        self._metrics = None
+        self._aggregate_store = None
+        self._task_store = None
+        self._graph_summary = None
+        
+    def reload(self):
+        """Load the graph, daily metric, aggregate and task stores, re-syncing any already loaded"""
+        if self._graph is not None:
+            self._graph.load()
+        if self._metrics is not None:
+            self._metrics.load()
+        if self._aggregate_store is not None:
+            self._aggregate_store.sync()
+        if self._task_store is not None:
+            self._task_store.sync()
+        self._graph_summary = None
+        self._link_graph()
+        self._daily_metrics()
+        self._aggregates()
+        self._tasks()
+        
+    def _link_graph(self) -> 'LinkGraph':
+        """The vault link graph, loaded once per instance"""
+        if self._graph is None:
+            # Imported on demand so productivity-only reports skip the graph stack
+            from link_graph import LinkGraph
+            self._graph = LinkGraph(self.index).load()
+        return self._graph
+        
+    def _daily_metrics(self) -> 'DailyMetrics':
+        """Per-day metric columns, synced once per instance"""
+        if self._metrics is None:
+            from daily_metrics import DailyMetrics
+            self._metrics = DailyMetrics(self.index).load()
+        return self._metrics
+        
+    def _aggregates(self) -> 'VaultAggregates':
+        """Materialized note counts, synced once per instance"""
+        if self._aggregate_store is None:
+            from vault_aggregates import VaultAggregates
+            self._aggregate_store = VaultAggregates(self.index)
+            self._aggregate_store.sync()
+        return self._aggregate_store
+        
+    def _tasks(self) -> 'TaskIndex':
+        """The persisted task index, synced once per instance"""
+        if self._task_store is None:
+            from task_index import TaskIndex
+            self._task_store = TaskIndex(self.index)
+            self._task_store.sync()
+        return self._task_store
+        
+    def _graph_metrics(self) -> Dict:
+        """Graph rankings and clusters, computed once per load since they do not depend on dates"""
+        if self._graph_summary is None:
+            from graph_metrics import GraphMetrics
+            self._graph_summary = GraphMetrics(self._link_graph()).compute()
+        return self._graph_summary
+        
+    def windows(self, since=None, until=None, period: Optional[str] = None,
+                every: Optional[str] = None) -> List[DateRange]:
+        """Date windows for a since/until range or period, split per period when every is given"""
+        metrics = self._daily_metrics()
+        first_days = [str(metrics.columns['days'][0])] if len(metrics) else []
+        first_days += [day for day in [self._aggregates().first_day()] if day]
+        first_day = parse_day(min(first_days)) if first_days else None
+        return resolve_windows(since, until, period, every, first_day)
+        
+    def _folder_counts(self, folder: str, prefix: str, window: DateRange) -> Dict[str, int]:
+        """Per-folder counters with a prefix, summed over the window's days when it is bounded"""
+        if window.bounded:
+            return self._aggregates().dated_counts(folder, prefix, *window.bounds())
+        return self._aggregates().counts('folder', folder, prefix)
+        
+    def _folder_metric(self, folder: str, name: str, window: DateRange) -> int:
+        """A single per-folder counter, summed over the window's days when it is bounded"""
+        if window.bounded:
+            return self._aggregates().dated_metric(folder, name, *window.bounds())
+        return self._aggregates().metric(folder, name)
+        
+    @timed()
+    def analyze_productivity_patterns(self, window: DateRange = DateRange()) -> Dict:
         """Analyze productivity patterns from daily notes and session logs"""
         patterns = {
-            'daily_consistency': self._analyze_daily_consistency(),
-            'time_patterns': self._analyze_time_patterns(),
-            'energy_patterns': self._analyze_energy_patterns(),
-            'goal_achievement': self._analyze_goal_achievement(),
-            'session_effectiveness': self._analyze_session_effectiveness()
+            'daily_consistency': self._analyze_daily_consistency(window),
+            'time_patterns': self._analyze_time_patterns(window),
+            'energy_patterns': self._analyze_energy_patterns(window),
+            'goal_achievement': self._analyze_goal_achievement(window),
+            'session_effectiveness': self._analyze_session_effectiveness(window)
         }
         
         return patterns
         
-    def _analyze_daily_consistency(self) -> Dict:
+    @timed()
+    def _analyze_daily_consistency(self, window: DateRange = DateRange()) -> Dict:
         """Analyze consistency of daily note creation and completion"""
-        daily_folder = self.vault_path / "01-Daily"
-        if not daily_folder.exists():
-            return {'consistency_score': 0, 'streak': 0, 'gaps': []}
-            
-        daily_files = sorted([f for f in daily_folder.glob('*.md') 
-                            if re.match(r'\d{4}-\d{2}-\d{2}\.md', f.name)])
-        
-        if not daily_files:
-            return {'consistency_score': 0, 'streak': 0, 'gaps': []}
-            
-        # Calculate date range
-        dates = []
-        for file in daily_files:
-            try:
-                file_date = datetime.strptime(file.stem, '%Y-%m-%d').date()
-                dates.append(file_date)
-            except ValueError:
-                continue
-                
-        if not dates:
-            return {'consistency_score': 0, 'streak': 0, 'gaps': []}
-            
-        dates.sort()
-        start_date = dates[0]
-        end_date = dates[-1]
-        total_days = (end_date - start_date).days + 1
-        
-        # Find gaps
-        date_set = set(dates)
-        gaps = []
-        current_date = start_date
-        while current_date <= end_date:
-            if current_date not in date_set:
-                gaps.append(current_date.isoformat())
-            current_date += timedelta(days=1)
-            
-        # Calculate current streak
-        streak = 0
-        check_date = date.today()
-        while check_date in date_set:
-            streak += 1
-            check_date -= timedelta(days=1)
-            
-        consistency_score = (len(dates) / total_days) * 100 if total_days > 0 else 0
+        all_days = self._daily_metrics()
+        metrics = all_days.window(window.since, window.until)
+        days = metrics.columns['days']
+        
+        if not len(days):
+            return {'consistency_score': 0, 'total_days': 0, 'active_days': 0, 'gaps': 0, 'gap_dates': [],
+                    'current_streak': 0, 'longest_streak': 0, 'streaks': [], 'gap_ranges': []}
+            
+        # A bounded window counts its own days, but none before the first daily note
+        first = days[0].item() if window.since is None else max(window.since, all_days.columns['days'][0].item())
+        last = days[-1].item() if window.until is None else min(window.until, date.today())
+        total_days = (last - first).days + 1
+        consistency_score = (len(days) / total_days) * 100
         
         return {
             'consistency_score': round(consistency_score, 1),
             'total_days': total_days,
-            'active_days': len(dates),
-            'gaps': len(gaps),
-            'gap_dates': gaps[-5:],  # Last 5 gaps
-            'current_streak': streak,
-            'longest_streak': self._calculate_longest_streak(dates)
+            'active_days': len(days),
+            'gaps': metrics.missing_day_count(),  # Same days as gap_ranges
+            'gap_dates': metrics.missing_days(limit=5),  # Last 5 gaps
+            'current_streak': metrics.current_streak(window.until),
+            'longest_streak': metrics.longest_streak(),
+            'streaks': metrics.streaks(),
+            'gap_ranges': metrics.gaps()
         }
         
-    def _calculate_longest_streak(self, dates: List[date]) -> int:
-        """Calculate the longest consecutive streak of dates"""
-        if not dates:
-            return 0
-            
-        dates = sorted(set(dates))
-        longest = current = 1
-        
-        for i in range(1, len(dates)):
-            if dates[i] - dates[i-1] == timedelta(days=1):
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-                
-        return longest
-        
-    def _analyze_time_patterns(self) -> Dict:
+    @timed()
+    def _analyze_time_patterns(self, window: DateRange = DateRange()) -> Dict:
         """Analyze when most productive work happens"""
-        session_folder = self.vault_path / "09-Claude-Integration"
-        if not session_folder.exists():
+        if not self._folder_metric(SESSION_FOLDER, 'sessions', window):
             return {'peak_hours': [], 'session_distribution': {}}
             
-        sessions_by_hour = defaultdict(int)
-        sessions_by_day = defaultdict(int)
-        
-        for session_file in session_folder.glob('*-session.md'):
-            try:
-                # Extract timestamp from filename (YYYY-MM-DD-HHMM format)
-                timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2}-\d{4})', session_file.name)
-                if timestamp_match:
-                    timestamp_str = timestamp_match.group(1)
-                    session_time = datetime.strptime(timestamp_str, '%Y-%m-%d-%H%M')
-                    
-                    sessions_by_hour[session_time.hour] += 1
-                    sessions_by_day[session_time.strftime('%A')] += 1
-                    
-            except (ValueError, AttributeError):
-                continue
+        # Session counts by start hour and weekday, taken from the YYYY-MM-DD-HHMM filenames
+        sessions_by_hour = dict(sorted(
+            (int(hour), count) for hour, count in self._folder_counts(SESSION_FOLDER, 'session_hour:', window).items()
+        ))
+        sessions_by_day = self._folder_counts(SESSION_FOLDER, 'session_weekday:', window)
                 
         # Find peak hours (top 3)
         peak_hours = sorted(sessions_by_hour.items(), key=lambda x: x[1], reverse=True)[:3]
         
         return {
-            'sessions_by_hour': dict(sessions_by_hour),
-            'sessions_by_day': dict(sessions_by_day),
+            'sessions_by_hour': sessions_by_hour,
+            'sessions_by_day': sessions_by_day,
             'peak_hours': [{'hour': hour, 'count': count} for hour, count in peak_hours],
             'total_sessions': sum(sessions_by_hour.values())
         }
         
-    def _analyze_energy_patterns(self) -> Dict:
+    @timed()
+    def _analyze_energy_patterns(self, window: DateRange = DateRange()) -> Dict:
         """Analyze energy level patterns from daily notes"""
-        daily_folder = self.vault_path / "01-Daily"
-        if not daily_folder.exists():
-            return {'average_energy': 0, 'energy_trends': {}}
-            
-        energy_data = []
-        mood_data = []
-        
-        for daily_file in daily_folder.glob('*.md'):
-            try:
-                with open(daily_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract energy level (pattern: "Energy level: X/10")
-                energy_match = re.search(r'Energy level:\s*(\d+)/10', content)
-                if energy_match:
-                    energy_level = int(energy_match.group(1))
-                    file_date = datetime.strptime(daily_file.stem, '%Y-%m-%d').date()
-                    energy_data.append({
-                        'date': file_date,
-                        'energy': energy_level,
-                        'weekday': file_date.strftime('%A')
-                    })
-                    
-                # Extract mood
-                mood_match = re.search(r'Mood:\s*([^\n]+)', content)
-                if mood_match:
-                    mood = mood_match.group(1).strip()
-                    mood_data.append(mood.lower())
-                    
-            except (ValueError, UnicodeDecodeError):
-                continue
-                
-        if not energy_data:
-            return {'average_energy': 0, 'energy_trends': {}}
+        metrics = self._daily_metrics().window(window.since, window.until)
+        overall_average = metrics.average_energy()
+        
+        if overall_average is None:
+            return {'average_energy': 0, 'recent_average': 0, 'energy_by_weekday': {}, 'energy_trend': 'stable',
+                    'most_common_moods': [], 'total_entries': 0}
             
-        # Calculate averages by weekday
-        weekday_energy = defaultdict(list)
-        for entry in energy_data:
-            weekday_energy[entry['weekday']].append(entry['energy'])
+        # Energy trend over the last 30 days of the window
+        recent = window.recent()
+        recent_average = metrics.window(recent.since, recent.until).average_energy()
+        if recent_average is None:
+            recent_average = overall_average
             
-        weekday_averages = {
-            day: round(sum(energies) / len(energies), 1) 
-            for day, energies in weekday_energy.items()
-        }
-        
-        # Energy trend over time (last 30 days)
-        recent_data = [e for e in energy_data 
-                      if e['date'] >= date.today() - timedelta(days=30)]
-        
-        overall_average = sum(e['energy'] for e in energy_data) / len(energy_data)
-        recent_average = sum(e['energy'] for e in recent_data) / len(recent_data) if recent_data else overall_average
-        
         return {
             'average_energy': round(overall_average, 1),
             'recent_average': round(recent_average, 1),
-            'energy_by_weekday': weekday_averages,
+            'energy_by_weekday': metrics.weekday_energy(),
             'energy_trend': 'improving' if recent_average > overall_average else 'declining' if recent_average < overall_average else 'stable',
-            'most_common_moods': Counter(mood_data).most_common(5),
-            'total_entries': len(energy_data)
+            'most_common_moods': metrics.mood_counts(5),
+            'total_entries': int(metrics.energy_mask().sum())
         }
         
-    def _analyze_goal_achievement(self) -> Dict:
+    @timed()
+    def _analyze_goal_achievement(self, window: DateRange = DateRange()) -> Dict:
         """Analyze goal setting and achievement patterns"""
-        daily_folder = self.vault_path / "01-Daily"
-        if not daily_folder.exists():
-            return {'completion_rate': 0, 'goal_patterns': {}}
-            
-        total_goals = 0
-        completed_goals = 0
-        goal_categories = defaultdict(int)
-        
-        for daily_file in daily_folder.glob('*.md'):
-            try:
-                with open(daily_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Find task patterns
-                tasks = re.findall(r'- \[([x ])\] (.+)', content)
-                
-                for status, task in tasks:
-                    total_goals += 1
-                    if status == 'x':
-                        completed_goals += 1
-                        
-                    # Categorize tasks
-                    task_lower = task.lower()
-                    if any(word in task_lower for word in ['code', 'develop', 'build', 'implement']):
-                        goal_categories['development'] += 1
-                    elif any(word in task_lower for word in ['learn', 'study', 'research', 'read']):
-                        goal_categories['learning'] += 1
-                    elif any(word in task_lower for word in ['write', 'document', 'note']):
-                        goal_categories['documentation'] += 1
-                    elif any(word in task_lower for word in ['plan', 'organize', 'setup']):
-                        goal_categories['planning'] += 1
-                    else:
-                        goal_categories['other'] += 1
-                        
-            except UnicodeDecodeError:
-                continue
-                
-        completion_rate = (completed_goals / total_goals * 100) if total_goals > 0 else 0
+        completion = self._tasks().completion("01-Daily", *window.bounds())
+        goal_categories = self._folder_counts("01-Daily", 'task:', window)
         
         return {
-            'completion_rate': round(completion_rate, 1),
-            'total_goals': total_goals,
-            'completed_goals': completed_goals,
-            'goal_categories': dict(goal_categories),
+            'completion_rate': completion['rate'],
+            'total_goals': completion['total'],
+            'completed_goals': completion['done'],
+            'goal_categories': goal_categories,
             'most_common_category': max(goal_categories.items(), key=lambda x: x[1]) if goal_categories else None
         }
         
-    def _analyze_session_effectiveness(self) -> Dict:
+    @timed()
+    def _analyze_session_effectiveness(self, window: DateRange = DateRange()) -> Dict:
         """Analyze Claude Code session effectiveness"""
-        session_folder = self.vault_path / "09-Claude-Integration"
-        if not session_folder.exists():
-            return {'average_duration': 0, 'session_types': {}}
-            
-        session_data = []
-        session_types = defaultdict(int)
-        
-        for session_file in session_folder.glob('*-session.md'):
-            try:
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract session type
-                type_match = re.search(r'#session/(\w+)', content)
-                if type_match:
-                    session_type = type_match.group(1)
-                    session_types[session_type] += 1
-                    
-                # Extract duration if available
-                duration_match = re.search(r'Duration:\s*(\d+)', content)
-                if duration_match:
-                    duration = int(duration_match.group(1))
-                    session_data.append({
-                        'type': session_type if type_match else 'unknown',
-                        'duration': duration
-                    })
-                    
-            except UnicodeDecodeError:
-                continue
-                
-        avg_duration = sum(s['duration'] for s in session_data) / len(session_data) if session_data else 0
+        if not self._folder_metric(SESSION_FOLDER, 'sessions', window):
+            return {'total_sessions': 0, 'session_types': {}, 'average_duration': 0, 'most_common_type': None}
+            
+        session_types = self._folder_counts(SESSION_FOLDER, 'session_type:', window)
+        
+        # Duration if available
+        duration_count = self._folder_metric(SESSION_FOLDER, 'duration_count', window)
+        avg_duration = self._folder_metric(SESSION_FOLDER, 'duration_total', window) / duration_count if duration_count else 0
         
         return {
             'total_sessions': sum(session_types.values()),
-            'session_types': dict(session_types),
+            'session_types': session_types,
             'average_duration': round(avg_duration, 1),
             'most_common_type': max(session_types.items(), key=lambda x: x[1]) if session_types else None
         }
         
-    def analyze_knowledge_growth(self) -> Dict:
-        """Analyze knowledge accumulation and connection patterns"""
-        knowledge_folder = self.vault_path / "06-Knowledge"
-        ideas_folder = self.vault_path / "05-Ideas"
-        
-        knowledge_stats = self._analyze_folder_growth(knowledge_folder, 'knowledge')
-        ideas_stats = self._analyze_folder_growth(ideas_folder, 'ideas')
+    @timed()
+    def analyze_knowledge_growth(self, window: DateRange = DateRange()) -> Dict:
+        """Analyze knowledge accumulation and connection patterns; links and graph describe the vault as it is now"""
+        knowledge_stats = self._analyze_folder_growth("06-Knowledge", 'knowledge', window)
+        ideas_stats = self._analyze_folder_growth("05-Ideas", 'ideas', window)
         
         # Analyze cross-connections
         connections = self._analyze_note_connections()
@@ -311,122 +239,82 @@ class VaultAnalytics:
             'knowledge_notes': knowledge_stats,
             'ideas': ideas_stats,
             'connections': connections,
-            'knowledge_velocity': self._calculate_knowledge_velocity()
+            'graph': self._graph_metrics(),
+            'knowledge_velocity': self._calculate_knowledge_velocity(window)
         }
         
-    def _analyze_folder_growth(self, folder: Path, folder_type: str) -> Dict:
+    @timed()
+    def _analyze_folder_growth(self, folder: str, folder_type: str, window: DateRange = DateRange()) -> Dict:
         """Analyze growth patterns in a specific folder"""
-        if not folder.exists():
+        aggregates = self._aggregates()
+        since, until = window.bounds()
+        if window.bounded:
+            total_notes = sum(aggregates.counts('daily', folder, since=since, until=until).values())
+        else:
+            total_notes = aggregates.metric(folder, 'notes')
+        if not total_notes:
             return {'total_notes': 0, 'recent_growth': 0, 'categories': {}}
             
-        files = list(folder.glob('*.md'))
-        
         # Growth over time
-        growth_by_month = defaultdict(int)
-        categories = defaultdict(int)
-        
-        for file in files:
-            creation_time = datetime.fromtimestamp(file.stat().st_ctime)
-            month_key = creation_time.strftime('%Y-%m')
-            growth_by_month[month_key] += 1
-            
-            # Extract categories from tags
-            try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    tags = re.findall(r'#(\w+)', content)
-                    for tag in tags:
-                        if tag not in ['knowledge', 'idea', 'note']:  # Skip generic tags
-                            categories[tag] += 1
-            except UnicodeDecodeError:
-                continue
+        growth_by_month = aggregates.notes_by_month(folder, since, until)
+        
+        # Categories are the leading word of each tag
+        tags = aggregates.dated_counts(folder, 'tag:', since, until) if window.bounded else aggregates.counts('tag', folder)
+        categories = {tag: uses for tag, uses in tags.items()
+                      if tag not in ['knowledge', 'idea', 'note']}  # Skip generic tags
                 
-        # Recent growth (last 30 days)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        recent_files = [f for f in files 
-                       if datetime.fromtimestamp(f.stat().st_ctime) >= thirty_days_ago]
+        # Recent growth (last 30 days of the window, counted in whole days)
+        recent_since, recent_until = window.recent().bounds()
+        recent_growth = sum(aggregates.counts('daily', folder, since=recent_since, until=recent_until).values())
         
         return {
-            'total_notes': len(files),
-            'recent_growth': len(recent_files),
-            'growth_by_month': dict(growth_by_month),
+            'total_notes': total_notes,
+            'recent_growth': recent_growth,
+            'growth_by_month': growth_by_month,
             'categories': dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)[:10]),
             'avg_monthly_growth': sum(growth_by_month.values()) / len(growth_by_month) if growth_by_month else 0
         }
         
+    @timed()
     def _analyze_note_connections(self) -> Dict:
-        """Analyze connections between notes through links"""
-        all_notes = []
-        link_graph = defaultdict(set)
-        
-        for folder in self.vault_path.iterdir():
-            if folder.is_dir() and not folder.name.startswith('.'):
-                for note_file in folder.glob('*.md'):
-                    try:
-                        with open(note_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        # Find internal links
-                        links = re.findall(r'\[\[([^\]]+)\]\]', content)
-                        note_name = note_file.stem
-                        all_notes.append(note_name)
-                        
-                        for link in links:
-                            link_graph[note_name].add(link)
-                            
-                    except UnicodeDecodeError:
-                        continue
-                        
-        # Calculate connection metrics
-        total_notes = len(all_notes)
-        total_connections = sum(len(links) for links in link_graph.values())
-        
-        # Most connected notes
-        connection_counts = {note: len(links) for note, links in link_graph.items()}
-        most_connected = sorted(connection_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Orphaned notes (no incoming or outgoing links)
-        referenced_notes = set()
-        for links in link_graph.values():
-            referenced_notes.update(links)
-            
-        orphaned_notes = set(all_notes) - set(link_graph.keys()) - referenced_notes
+        """Analyze connections between notes through resolved links"""
+        graph = self._link_graph()
+        
+        total_notes = graph.node_count
+        total_connections = graph.edge_count
+        most_connected = graph.most_connected(5)
         
         return {
             'total_notes': total_notes,
             'total_connections': total_connections,
+            'unresolved_links': graph.unresolved,
             'avg_connections_per_note': round(total_connections / total_notes, 2) if total_notes > 0 else 0,
-            'most_connected': [{'note': note, 'connections': count} for note, count in most_connected],
-            'orphaned_count': len(orphaned_notes),
+            'most_connected': [{'note': Path(path).stem, 'connections': count} for path, count in most_connected],
+            'orphaned_count': len(graph.orphans()),
             'connection_density': round(total_connections / (total_notes * total_notes), 4) if total_notes > 0 else 0
         }
         
-    def _calculate_knowledge_velocity(self) -> Dict:
+    @timed()
+    def _calculate_knowledge_velocity(self, window: DateRange = DateRange()) -> Dict:
         """Calculate the velocity of knowledge creation and processing"""
-        # Analyze note creation over time
+        from vault_aggregates import week_key
+        
+        # Note creation per week from the materialized weekly counts, or the window's days bucketed by week
         all_folders = ['05-Ideas', '06-Knowledge', '04-Projects']
-        velocity_data = []
+        aggregates = self._aggregates()
+        since, until = window.bounds()
         
-        for folder_name in all_folders:
-            folder = self.vault_path / folder_name
-            if not folder.exists():
-                continue
-                
-            for file in folder.glob('*.md'):
-                creation_time = datetime.fromtimestamp(file.stat().st_ctime)
-                velocity_data.append({
-                    'date': creation_time.date(),
-                    'type': folder_name.split('-')[1].lower(),
-                    'file': file.name
-                })
-                
-        # Group by week
         weekly_velocity = defaultdict(lambda: defaultdict(int))
-        for item in velocity_data:
-            week = item['date'].isocalendar()[1]
-            year = item['date'].year
-            week_key = f"{year}-W{week:02d}"
-            weekly_velocity[week_key][item['type']] += 1
+        for folder_name in all_folders:
+            note_type = folder_name.split('-')[1].lower()
+            if window.bounded:
+                weekly_counts = defaultdict(int)
+                for day, count in aggregates.counts('daily', folder_name, since=since, until=until).items():
+                    weekly_counts[week_key(date.fromisoformat(day))] += count
+            else:
+                weekly_counts = aggregates.counts('weekly', folder_name)
+            for week, count in weekly_counts.items():
+                weekly_velocity[week][note_type] += count
             
         # Calculate recent velocity (last 4 weeks)
         recent_weeks = sorted(weekly_velocity.keys())[-4:]
@@ -465,17 +353,22 @@ class VaultAnalytics:
         else:
             return 'stable'
             
-    def generate_comprehensive_report(self) -> str:
-        """Generate a comprehensive analytics report"""
+    @timed()
+    def generate_comprehensive_report(self, window: DateRange = DateRange(), out: Optional[TextIO] = None) -> str:
+        """Generate a comprehensive analytics report, for one date window when it is bounded"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
         
         # Gather all analytics
-        productivity = self.analyze_productivity_patterns()
-        knowledge = self.analyze_knowledge_growth()
+        productivity = self.analyze_productivity_patterns(window)
+        knowledge = self.analyze_knowledge_growth(window)
         
         report = f"""# Comprehensive Vault Analytics Report
 **Generated:** {timestamp}
-
+"""
+        if window.bounded:
+            report += f"**Period:** {window.since or 'start'} to {window.until or 'today'}\n"
+        
+        report += f"""
 ## 📊 Executive Summary
 - **Vault Health Score:** {self._calculate_health_score(productivity, knowledge)}/100
 - **Daily Consistency:** {productivity['daily_consistency']['consistency_score']}%
@@ -522,6 +415,13 @@ class VaultAnalytics:
 - **Average Connections/Note:** {knowledge['connections']['avg_connections_per_note']}
 - **Orphaned Notes:** {knowledge['connections']['orphaned_count']}
 
+### Graph Structure
+- **Clusters:** {knowledge['graph']['components']['count']} (largest: {knowledge['graph']['components']['largest']} notes)
+- **Central Notes (PageRank):** {self._format_graph_notes(knowledge['graph']['pagerank'])}
+- **Top Hubs:** {self._format_graph_notes(knowledge['graph']['hubs'])}
+- **Top Authorities:** {self._format_graph_notes(knowledge['graph']['authorities'])}
+- **Bridge Notes:** {self._format_graph_notes(knowledge['graph']['bridge_notes'])}
+
 ### Knowledge Velocity
 - **Current Velocity:** {knowledge['knowledge_velocity']['recent_velocity']} notes/week
 - **Trend:** {knowledge['knowledge_velocity']['velocity_trend']}
@@ -571,11 +471,12 @@ class VaultAnalytics:
 """
         
         # Save report
-        report_file = self.analytics_folder / f"comprehensive-report-{datetime.now().strftime('%Y-%m-%d')}.md"
+        stamp = window.name if window.bounded else datetime.now().strftime('%Y-%m-%d')
+        report_file = self.analytics_folder / f"comprehensive-report-{stamp}.md"
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write(report)
             
-        print(f"Comprehensive report generated: {report_file}")
+        print(f"Comprehensive report generated: {report_file}", file=out)
         return report
         
     def _calculate_health_score(self, productivity: Dict, knowledge: Dict) -> int:
@@ -604,6 +505,12 @@ class VaultAnalytics:
         
         return int(score)
         
+    def _format_graph_notes(self, ranked: List[Dict], limit: int = 3) -> str:
+        """Format the leading notes of a graph ranking as wiki links"""
+        if not ranked:
+            return 'None'
+        return ', '.join(f"[[{Path(item['note']).stem}]]" for item in ranked[:limit])
+        
     def _get_best_energy_days(self, energy_data: Dict) -> str:
         """Get the days with highest average energy"""
         if not energy_data['energy_by_weekday']:
@@ -744,6 +651,27 @@ class VaultAnalytics:
         # This could be expanded with more sophisticated checks
         return "Good (template usage consistent)"
 
+def run_reports(analytics: VaultAnalytics, args, out: Optional[TextIO] = None):
+    """Print (to out, default stdout) or save the requested report for each window the range arguments select"""
+    try:
+        windows = analytics.windows(getattr(args, 'since', None), getattr(args, 'until', None),
+                                    getattr(args, 'period', None), getattr(args, 'every', None))
+    except ValueError as e:
+        print(f"Invalid date range: {e}", file=out)
+        return
+    batch = bool(getattr(args, 'every', None))
+    
+    if args.report in ('productivity', 'knowledge'):
+        analyze = (analytics.analyze_productivity_patterns if args.report == 'productivity'
+                   else analytics.analyze_knowledge_growth)
+        results = {window.name: analyze(window) for window in windows}
+        print(json.dumps(results if batch else results.popitem()[1], indent=2, default=str), file=out)
+    else:
+        for window in windows:
+            analytics.generate_comprehensive_report(window, out)
+        print(f"{len(windows)} comprehensive analytics reports generated!" if batch else "Comprehensive analytics report generated!",
+              file=out)
+
 def main():
     """Main execution function"""
     import argparse
@@ -752,20 +680,20 @@ def main():
     parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
     parser.add_argument('--report', choices=['productivity', 'knowledge', 'comprehensive'], 
                        default='comprehensive', help='Type of report to generate')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Parse changed notes across N processes')
+    parser.add_argument('--timings', action='store_true', help='Print a per-stage timing breakdown at the end')
+    add_range_arguments(parser)
     
     args = parser.parse_args()
+    if args.timings:
+        enable()
     
-    analytics = VaultAnalytics(args.vault)
-    
-    if args.report == 'productivity':
-        patterns = analytics.analyze_productivity_patterns()
-        print(json.dumps(patterns, indent=2, default=str))
-    elif args.report == 'knowledge':
-        knowledge = analytics.analyze_knowledge_growth()
-        print(json.dumps(knowledge, indent=2, default=str))
-    else:
-        report = analytics.generate_comprehensive_report()
-        print("Comprehensive analytics report generated!")
+    analytics = VaultAnalytics(args.vault, workers=args.workers)
+    run_reports(analytics, args)
+        
+    if args.timings:
+        finish(analytics.index.db_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
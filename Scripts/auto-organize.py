@@ -9,17 +9,106 @@ import re
 import json
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, TextIO, Tuple
 from datetime import datetime, date
-import frontmatter
+from vault_index import VaultIndex
+from tag_index import TagIndex, tag_root
+from note_extractors import DAILY_NOTE_PATTERN
+from instrumentation import count, enable, finish, timed
+
+CONTENT_SCAN_LENGTH = 1000
+
+def _scope_inline_flags(pattern: str) -> str:
+    """Turn a leading global flag like (?i) into a scoped group so patterns can be combined"""
+    match = re.match(r'\(\?([aiLmsux]+)\)', pattern)
+    if match:
+        return f"(?{match.group(1)}:{pattern[match.end():]})"
+    return f"(?:{pattern})"
+
+class CompiledRules:
+    """Organization rules compiled once into a single-evaluation matcher"""
+    
+    def __init__(self, rules: Dict):
+        self.frontmatter_rules = {key: dict(value_map) for key, value_map in rules['frontmatter'].items()}
+        self.tag_rules = dict(rules['tags'])
+        self.patterns = list(rules['patterns'].items())
+        
+        # Each rule sits in a zero-width lookahead so every position reports the
+        # highest-priority rule starting there; the lowest rule index found wins,
+        # matching the old "first pattern that matches anywhere" order.
+        self.pattern_matcher = re.compile('|'.join(
+            f"(?=(?P<r{i}>{_scope_inline_flags(pattern)}))"
+            for i, (pattern, _) in enumerate(self.patterns)
+        ))
+        self.daily_matcher = DAILY_NOTE_PATTERN
+        self.daily_filename = re.compile(r'^\d{4}-\d{2}-\d{2}')
+        
+    def _first_pattern(self, text: str) -> Optional[int]:
+        """Index of the highest-priority pattern that matches anywhere in text"""
+        best = None
+        for match in self.pattern_matcher.finditer(text):
+            rule = int(match.lastgroup[1:])
+            if best is None or rule < best:
+                best = rule
+                if best == 0:
+                    break
+        return best
+        
+    def classify(self, filename: str, content: str, metadata: Dict,
+                 tags: Optional[List[str]] = None, daily: Optional[bool] = None) -> Optional[Tuple[str, str]]:
+        """Return (target folder, reason) for a note, or None if no rule applies
+
+        daily is the index's full-body daily_markers flag; without it content is scanned instead.
+        """
+        # 1. Frontmatter metadata
+        if metadata:
+            for key, value_map in self.frontmatter_rules.items():
+                if key in metadata:
+                    value = str(metadata[key]).lower()
+                    if value in value_map:
+                        return value_map[value], f"Frontmatter {key}: {value}"
+                        
+        # 2. Tags, in content order
+        if tags is None:
+            tags = re.findall(r'#[\w-]+', content)
+        for tag in tags:
+            folder = self.tag_rules.get(tag)
+            if folder:
+                return folder, f"Tag: {tag}"
+                
+        # 3. Filename patterns, then 4. content patterns
+        rule = self._first_pattern(filename)
+        if rule is not None:
+            pattern, folder = self.patterns[rule]
+            return folder, f"Filename pattern: {pattern}"
+            
+        rule = self._first_pattern(content[:CONTENT_SCAN_LENGTH])
+        if rule is not None:
+            pattern, folder = self.patterns[rule]
+            return folder, f"Content pattern: {pattern}"
+            
+        # 5. Daily note detection
+        if self.is_daily_note(filename, content, daily):
+            return '01-Daily', "Daily note content"
+            
+        return None
+        
+    def is_daily_note(self, filename: str, content: str, daily: Optional[bool] = None) -> bool:
+        """Check if file appears to be a daily note"""
+        if self.daily_filename.match(filename):
+            return True
+        return bool(self.daily_matcher.search(content)) if daily is None else daily
 
 class VaultOrganizer:
     """Automated file organization for Obsidian vault"""
     
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, index: Optional[VaultIndex] = None):
         self.vault_path = Path(vault_path)
         self.inbox_folder = self.vault_path / "00-Inbox"
         self.rules = self._load_organization_rules()
+        self.matcher = CompiledRules(self.rules)
+        self.index = index or VaultIndex(vault_path)
+        self.tag_index = TagIndex(self.index)
         
     def _load_organization_rules(self) -> Dict:
         """Load file organization rules"""
@@ -70,42 +159,64 @@ class VaultOrganizer:
             }
         }
     
-    def organize_inbox(self, dry_run: bool = False) -> List[Dict]:
-        """Organize all files in the inbox"""
+    @timed()
+    def organize_inbox(self, dry_run: bool = False, out: Optional[TextIO] = None) -> List[Dict]:
+        """Organize all files in the inbox, printing progress to out (default stdout)"""
         if not self.inbox_folder.exists():
-            print("Inbox folder doesn't exist")
+            print("Inbox folder doesn't exist", file=out)
             return []
             
+        # Tag routing reads each note's indexed tags, including frontmatter tags
+        self.tag_index.sync()
+        inbox_tags = self.tag_index.tags_under("00-Inbox/")
+        
         results = []
-        for file_path in self.inbox_folder.glob('*.md'):
-            result = self._organize_file(file_path, dry_run)
+        for note in self.index.notes("00-Inbox", recursive=False):
+            result = self._organize_file(note, dry_run, self._routing_tags(inbox_tags.get(note['path'], [])), out)
             if result:
                 results.append(result)
                 
         return results
     
-    def _organize_file(self, file_path: Path, dry_run: bool = False) -> Optional[Dict]:
-        """Organize a single file based on content analysis"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+    @timed()
+    def organize_paths(self, rel_paths: List[str], dry_run: bool = False) -> List[Dict]:
+        """Organize only the given notes, skipping any that are no longer directly in the inbox"""
+        self.tag_index.sync()
+        
+        results = []
+        for rel_path in rel_paths:
+            note = self.index.get(rel_path)
+            if note is None or note['parent'] != "00-Inbox":
+                continue
+            result = self._organize_file(note, dry_run, self._routing_tags(self.tag_index.tags_of(rel_path)))
+            if result:
+                results.append(result)
                 
-            # Parse frontmatter if present
-            try:
-                post = frontmatter.loads(content)
-                metadata = post.metadata
-                content_only = post.content
-            except:
-                metadata = {}
-                content_only = content
+        return results
+    
+    @staticmethod
+    def _routing_tags(indexed_tags: List[str]) -> List[str]:
+        """Top-level #tags in first-seen order, as the tag rules expect"""
+        return list(dict.fromkeys('#' + tag_root(tag) for tag in indexed_tags))
+    
+    def _organize_file(self, note: Dict, dry_run: bool = False, tags: Optional[List[str]] = None,
+                       out: Optional[TextIO] = None) -> Optional[Dict]:
+        """Organize a single indexed note based on its parsed metadata"""
+        file_path = self.vault_path / note['path']
+        try:
+            # Frontmatter, the leading body text and the full-body daily flag come from the index
+            metadata = note['frontmatter']
+            content_only = note['excerpt']
                 
             # Determine target folder
-            target_folder = self._determine_target_folder(
-                file_path.name, content_only, metadata
-            )
+            if tags is None:
+                tags = ['#' + tag_root(tag.lower()) for tag in note['tags']]
+            classification = self.matcher.classify(file_path.name, content_only, metadata, tags,
+                                                   note.get('daily_markers'))
             
-            if not target_folder:
+            if not classification:
                 return None
+            target_folder, reason = classification
                 
             # Create target path
             target_dir = self.vault_path / target_folder
@@ -120,94 +231,38 @@ class VaultOrganizer:
                 'source': str(file_path),
                 'target': str(target_path),
                 'folder': target_folder,
-                'reason': self._get_organization_reason(file_path.name, content_only, metadata)
+                'reason': reason
             }
             
             if not dry_run:
                 shutil.move(str(file_path), str(target_path))
-                print(f"Moved: {file_path.name} -> {target_folder}/")
+                count(files=1)
+                self.index.move(note['path'], target_path.relative_to(self.vault_path).as_posix())
+                print(f"Moved: {file_path.name} -> {target_folder}/", file=out)
             else:
-                print(f"Would move: {file_path.name} -> {target_folder}/")
+                print(f"Would move: {file_path.name} -> {target_folder}/", file=out)
                 
             return result
             
         except Exception as e:
-            print(f"Error organizing {file_path}: {e}")
+            print(f"Error organizing {file_path}: {e}", file=out)
             return None
     
-    def _determine_target_folder(self, filename: str, content: str, metadata: Dict) -> Optional[str]:
+    def _determine_target_folder(self, filename: str, content: str, metadata: Dict,
+                                 tags: Optional[List[str]] = None) -> Optional[str]:
         """Determine the target folder for a file"""
-        # 1. Check frontmatter metadata
-        if metadata:
-            for key, value_map in self.rules['frontmatter'].items():
-                if key in metadata:
-                    value = str(metadata[key]).lower()
-                    if value in value_map:
-                        return value_map[value]
-        
-        # 2. Check for tags in content
-        tags = re.findall(r'#[\w-]+', content)
-        for tag in tags:
-            if tag in self.rules['tags']:
-                return self.rules['tags'][tag]
-                
-        # 3. Check filename patterns
-        for pattern, folder in self.rules['patterns'].items():
-            if re.search(pattern, filename):
-                return folder
-                
-        # 4. Check content patterns
-        for pattern, folder in self.rules['patterns'].items():
-            if re.search(pattern, content[:1000]):  # Check first 1000 chars
-                return folder
-                
-        # 5. Special date detection
-        if self._is_daily_note(filename, content):
-            return '01-Daily'
-            
-        return None
+        classification = self.matcher.classify(filename, content, metadata, tags)
+        return classification[0] if classification else None
     
     def _is_daily_note(self, filename: str, content: str) -> bool:
         """Check if file appears to be a daily note"""
-        # Check for date in filename
-        if re.match(r'^\d{4}-\d{2}-\d{2}', filename):
-            return True
-            
-        # Check for daily note content patterns
-        daily_patterns = [
-            r'(?i)morning\s+intentions?',
-            r'(?i)daily\s+tasks?',
-            r'(?i)evening\s+reflection',
-            r'(?i)gratitude',
-            r'(?i)today(?:\s|\')?s?\s+(?:goals?|priorities?|focus)'
-        ]
-        
-        return any(re.search(pattern, content) for pattern in daily_patterns)
+        return self.matcher.is_daily_note(filename, content)
     
-    def _get_organization_reason(self, filename: str, content: str, metadata: Dict) -> str:
+    def _get_organization_reason(self, filename: str, content: str, metadata: Dict,
+                                 tags: Optional[List[str]] = None) -> str:
         """Get the reason why file was organized to specific folder"""
-        # Check metadata first
-        if metadata:
-            for key, value_map in self.rules['frontmatter'].items():
-                if key in metadata:
-                    value = str(metadata[key]).lower()
-                    if value in value_map:
-                        return f"Frontmatter {key}: {value}"
-        
-        # Check tags
-        tags = re.findall(r'#[\w-]+', content)
-        for tag in tags:
-            if tag in self.rules['tags']:
-                return f"Tag: {tag}"
-                
-        # Check patterns
-        for pattern, folder in self.rules['patterns'].items():
-            if re.search(pattern, filename):
-                return f"Filename pattern: {pattern}"
-            if re.search(pattern, content[:1000]):
-                return f"Content pattern: {pattern}"
-                
-        return "Manual classification"
+        classification = self.matcher.classify(filename, content, metadata, tags)
+        return classification[1] if classification else "Manual classification"
     
     def _resolve_name_conflict(self, target_path: Path) -> Path:
         """Resolve naming conflicts by adding timestamp"""
@@ -345,8 +400,11 @@ def main():
     parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be moved without moving')
     parser.add_argument('--setup', action='store_true', help='Set up auto-organization')
+    parser.add_argument('--timings', action='store_true', help='Print a per-stage timing breakdown at the end')
     
     args = parser.parse_args()
+    if args.timings:
+        enable()
     
     organizer = VaultOrganizer(args.vault)
     
@@ -361,6 +419,9 @@ def main():
             print(report)
         else:
             print("No files found to organize.")
+            
+    if args.timings:
+        finish(organizer.index.db_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
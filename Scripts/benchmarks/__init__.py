@@ -0,0 +1,4 @@
+"""
+Vault Benchmarks
+Synthetic vault generation and timing of the public vault operations
+"""
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Task Categorizer Benchmark
+Times the keyword automaton against the per-category substring scan on synthetic task lists, reporting JSON
+"""
+
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from benchmarks.generate_vault import WORDS, parse_size
+from task_categorizer import DEFAULT_CATEGORIES, TaskCategorizer
+
+
+def synthetic_tasks(count: int, seed: int) -> List[str]:
+    """Task texts built from the vault generator's vocabulary plus some category keywords"""
+    rng = random.Random(seed)
+    vocabulary = list(WORDS) + [word for words in DEFAULT_CATEGORIES.values() for word in words]
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(3, 10))).capitalize() for _ in range(count)]
+
+
+def synthetic_categories(count: int, seed: int) -> Dict[str, List[str]]:
+    """A large category dictionary mixing single keywords and two-word phrases"""
+    rng = random.Random(seed)
+    return {
+        f"category-{i}": [f"{rng.choice(WORDS)} {rng.choice(WORDS)}", f"{rng.choice(WORDS)}{i}", rng.choice(WORDS) * 2]
+        for i in range(count)
+    }
+
+
+def substring_scan(categories: Dict[str, List[str]]) -> Callable[[str], str]:
+    """The original categorizer: each category's keywords tested in turn with `in`"""
+    groups = [(category, [word.lower() for word in words]) for category, words in categories.items()]
+
+    def categorize(task: str) -> str:
+        task_lower = task.lower()
+        for category, words in groups:
+            if any(word in task_lower for word in words):
+                return category
+        return 'other'
+    return categorize
+
+
+def time_call(operation: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def benchmark(tasks: List[str], categories: Dict[str, List[str]]) -> Dict:
+    """Throughput of each strategy on one task list and category dictionary"""
+    build_start = time.perf_counter()
+    categorizer = TaskCategorizer(categories)
+    build_seconds = time.perf_counter() - build_start
+    scan = substring_scan(categories)
+
+    timings = {
+        'substring_scan': time_call(lambda: [scan(task) for task in tasks]),
+        'categorize': time_call(lambda: [categorizer.categorize(task) for task in tasks]),
+        'categorize_many': time_call(lambda: categorizer.categorize_many(tasks)),
+        'matches': time_call(lambda: [categorizer.matches(task) for task in tasks]),
+    }
+    agree = categorizer.categorize_many(tasks[:100000]) == [scan(task) for task in tasks[:100000]]
+    return {
+        'categories': len(categories),
+        'keywords': len(categorizer.keywords),
+        'states': categorizer.state_count,
+        'build_ms': round(build_seconds * 1000, 3),
+        'agrees_with_substring_scan': agree,
+        'seconds': {name: round(seconds, 3) for name, seconds in timings.items()},
+        'tasks_per_second': {name: round(len(tasks) / seconds) for name, seconds in timings.items()},
+    }
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task Categorizer Benchmark")
+    parser.add_argument('--tasks', default='1m', help='How many tasks to classify: 1k, 10k, 100k, 1m or a number')
+    parser.add_argument('--categories', type=int, default=300, help='Size of the large synthetic dictionary')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    args = parser.parse_args()
+
+    tasks = synthetic_tasks(parse_size(args.tasks), args.seed)
+    report = {
+        'python': platform.python_version(),
+        'tasks': len(tasks),
+        'average_task_chars': round(sum(map(len, tasks)) / len(tasks), 1),
+        'default_categories': benchmark(tasks, DEFAULT_CATEGORIES),
+        'large_categories': benchmark(tasks, synthetic_categories(args.categories, args.seed)),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Synthetic Vault Generator
+Builds realistic vaults of any size from the 08-Templates notes plus a populated claude_evolution.db
+"""
+
+import json
+import random
+import re
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_VAULT = SCRIPTS_DIR.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from schema_migrations import migrate
+
+# Share of generated notes per kind; daily notes are one per day counting back from today
+NOTE_MIX = (
+    ('daily', 0.30),
+    ('session', 0.20),
+    ('knowledge', 0.18),
+    ('idea', 0.10),
+    ('memory', 0.08),
+    ('inbox', 0.06),
+    ('project', 0.04),
+    ('weekly', 0.03),
+    ('monthly', 0.01),
+)
+
+# Fraction of days without a daily note, so streaks and gaps are realistic
+DAILY_SKIP_RATE = 0.12
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+SESSION_TYPES = ['general', 'coding', 'research', 'planning', 'writing', 'debugging']
+MOODS = ['focused', 'calm', 'energized', 'tired', 'motivated', 'stressed', 'curious']
+TOPICS = ['python', 'obsidian', 'automation', 'real-estate', 'wealth', 'ai', 'writing',
+          'health', 'learning', 'productivity', 'design', 'marketing', 'finance', 'research']
+TRAITS = ['curiosity', 'helpfulness', 'creativity', 'technical_depth', 'empathy', 'humor']
+TODO_CATEGORIES = ['general', 'learning', 'relationship', 'technical', 'creative']
+WORDS = ('vault note agent memory context session project idea knowledge review plan task '
+         'build ship learn refactor index graph link metric daily weekly energy focus goal').split()
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)(?:([+-]\d+)([dwMy]))?(?::([^}]*))?\}\}')
+DATE_TOKEN_PATTERN = re.compile(r'YYYY|MMMM|MM|DD|dddd|HH|mm')
+DATE_TOKENS = {'YYYY': '%Y', 'MMMM': '%B', 'MM': '%m', 'DD': '%d', 'dddd': '%A', 'HH': '%H', 'mm': '%M'}
+OFFSET_DAYS = {'d': 1, 'w': 7, 'M': 30, 'y': 365}
+
+TEMPLATES = {
+    'daily': "Daily Journal.md",
+    'session': "Claude Session Log.md",
+    'knowledge': "Knowledge Note.md",
+    'idea': "Idea Capture.md",
+    'project': "Project Charter.md",
+    'weekly': "Weekly Review.md",
+    'monthly': "Monthly Retrospective.md",
+}
+
+
+def moment_format(pattern: str, when: datetime) -> str:
+    """Format a date with Obsidian/moment tokens such as YYYY-MM-DD or dddd"""
+    return when.strftime(DATE_TOKEN_PATTERN.sub(lambda m: DATE_TOKENS[m.group(0)], pattern.replace('%', '%%')))
+
+
+def render_template(template: str, when: datetime, fields: Dict[str, str]) -> str:
+    """Fill {{date:...}}, {{date+30d:...}} and {{field}} placeholders the way Obsidian would"""
+    def replace(match):
+        name, offset, unit, pattern = match.groups()
+        if name == 'date':
+            moment = when + timedelta(days=int(offset) * OFFSET_DAYS[unit]) if offset else when
+            return moment_format(pattern or 'YYYY-MM-DD', moment)
+        if name == 'time':
+            return when.strftime('%H:%M')
+        return fields.get(name, name)
+    return PLACEHOLDER_PATTERN.sub(replace, template)
+
+
+class VaultGenerator:
+    """Writes a synthetic vault whose notes link to and tag each other like a lived-in one"""
+
+    def __init__(self, target: str, notes: int, seed: int = 42, templates: Optional[Path] = None):
+        self.target = Path(target)
+        self.notes = notes
+        self.rng = random.Random(seed)
+        self.templates_folder = templates or REPO_VAULT / "08-Templates"
+        self.today = datetime.now().replace(second=0, microsecond=0)
+        self.titles: List[str] = []
+        self.counts: Dict[str, int] = {}
+
+    def generate(self) -> Dict:
+        """Write every note and the database, returning what was created"""
+        self.target.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(self.templates_folder, self.target / "08-Templates", dirs_exist_ok=True)
+        templates = {kind: (self.templates_folder / name).read_text(encoding='utf-8')
+                     for kind, name in TEMPLATES.items()}
+
+        plan = self._plan()
+        # Titles exist before any note is written so links can point forward as well as back
+        self.titles = [path.stem for _, path, _ in plan]
+        for kind, path, when in plan:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self._note(kind, path.stem, when, templates), encoding='utf-8')
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+        sessions = [(path.stem, when) for kind, path, when in plan if kind == 'session']
+        db_rows = self._populate_database(sessions)
+        return {'path': str(self.target), 'notes': len(plan), 'by_kind': self.counts, 'database': db_rows}
+
+    def _plan(self) -> List[Tuple[str, Path, datetime]]:
+        """Decide the kind, path and date of every note up front"""
+        plan = []
+        for kind, share in NOTE_MIX:
+            count = max(1, round(self.notes * share))
+            plan.extend(getattr(self, f"_plan_{kind}", self._plan_generic)(kind, count))
+        return plan[:self.notes]
+
+    def _plan_daily(self, kind: str, count: int) -> List[Tuple[str, Path, datetime]]:
+        """One note per day going back from today, skipping some days"""
+        plan = []
+        day = self.today
+        while len(plan) < count:
+            if self.rng.random() >= DAILY_SKIP_RATE:
+                plan.append((kind, self.target / "01-Daily" / f"{day:%Y-%m-%d}.md", day))
+            day -= timedelta(days=1)
+        return plan
+
+    def _plan_session(self, kind: str, count: int) -> List[Tuple[str, Path, datetime]]:
+        """Session logs named like create_session_log writes them"""
+        plan = []
+        span = max(count // 3, 30)
+        used = set()
+        while len(plan) < count:
+            when = self.today - timedelta(days=self.rng.randrange(span), minutes=self.rng.randrange(1440))
+            session_type = self.rng.choice(SESSION_TYPES)
+            name = f"{when:%Y-%m-%d-%H%M}-{session_type}-session"
+            if name in used:
+                continue
+            used.add(name)
+            plan.append((kind, self.target / "09-Claude-Integration" / f"{name}.md", when))
+        return plan
+
+    def _plan_generic(self, kind: str, count: int) -> List[Tuple[str, Path, datetime]]:
+        """Topic notes spread across the vault's folders"""
+        folders = {
+            'knowledge': "06-Knowledge", 'idea': "05-Ideas", 'memory': "10-Agent-Memory",
+            'inbox': "00-Inbox", 'project': "04-Projects", 'weekly': "02-Weekly", 'monthly': "03-Monthly"
+        }
+        span = max(count, 30)
+        plan = []
+        for i in range(count):
+            when = self.today - timedelta(days=self.rng.randrange(span), minutes=self.rng.randrange(1440))
+            topic = self.rng.choice(TOPICS).title()
+            if kind == 'weekly':
+                name = f"{when:%Y}-Week-{i + 1}"
+            elif kind == 'monthly':
+                name = f"{when:%Y-%m}-Monthly-{i + 1}"
+            elif kind == 'memory':
+                name = f"Agent-Memory-{topic}-{i + 1}"
+            elif kind == 'inbox':
+                name = f"Untitled-{topic}-{i + 1}"
+            else:
+                name = f"{topic}-{kind.title()}-{i + 1}"
+            plan.append((kind, self.target / folders[kind] / f"{name}.md", when))
+        return plan
+
+    def _note(self, kind: str, title: str, when: datetime, templates: Dict[str, str]) -> str:
+        """Render one note body with filled-in fields, links, tags and tasks"""
+        if kind == 'memory':
+            content = self._memory_note(title, when)
+        elif kind == 'inbox':
+            content = self._inbox_note(title, when)
+        else:
+            fields = {
+                'title': title.replace('-', ' '),
+                'type': self.rng.choice(SESSION_TYPES if kind == 'session' else ['concept', 'reference', 'howto']),
+                'project': self.rng.choice(TOPICS),
+                'category': self.rng.choice(TOPICS),
+                'source': self.rng.choice(['claude', 'book', 'web', 'conversation']),
+                'level': self.rng.choice(['low', 'medium', 'high']),
+                'status': self.rng.choice(['active', 'draft', 'done']),
+            }
+            content = render_template(templates[kind], when, fields)
+
+        if kind == 'daily':
+            content = content.replace("Energy level: /10", f"Energy level: {self.rng.randint(2, 10)}/10", 1)
+            content = content.replace("Mood: \n", f"Mood: {self.rng.choice(MOODS)}\n", 1)
+        elif kind == 'session':
+            content = content.replace("**Duration:** ", f"**Duration:** {self.rng.randint(10, 180)} minutes", 1)
+
+        content = re.sub(r'- \[ \] ', lambda _: '- [x] ' if self.rng.random() < 0.45 else '- [ ] ', content)
+        return content + self._related(kind)
+
+    def _related(self, kind: str) -> str:
+        """A closing section of links to other notes and topic tags"""
+        links = self.rng.sample(self.titles, min(len(self.titles), self.rng.randint(1, 6)))
+        tags = self.rng.sample(TOPICS, self.rng.randint(1, 3))
+        lines = ["", "## Related", *(f"- [[{title}]]" for title in links),
+                 "", " ".join(f"#{tag}" for tag in tags) + f" #{kind}", ""]
+        return "\n".join(lines)
+
+    def _memory_note(self, title: str, when: datetime) -> str:
+        """An agent memory note in the shape update_agent_memory writes"""
+        return "\n".join([
+            f"# {title.replace('-', ' ')}",
+            "",
+            f"**Updated:** {when:%Y-%m-%d %H:%M}",
+            "**Type:** #agent-memory",
+            "",
+            "## Context",
+            self._sentence(),
+            "",
+            "## Open Items",
+            *(f"- [ ] {self._sentence()}" for _ in range(self.rng.randint(1, 4))),
+            "",
+        ])
+
+    def _inbox_note(self, title: str, when: datetime) -> str:
+        """A loose capture waiting to be organized, sometimes with frontmatter"""
+        lines = []
+        if self.rng.random() < 0.4:
+            lines += ["---", f"type: {self.rng.choice(['idea', 'project', 'knowledge', 'memory'])}",
+                      f"created: {when:%Y-%m-%d}", "---", ""]
+        lines += [f"# {title.replace('-', ' ')}", "", self._sentence(), self._sentence(), ""]
+        return "\n".join(lines)
+
+    def _sentence(self) -> str:
+        """A short filler sentence from the vault vocabulary"""
+        return " ".join(self.rng.choices(WORDS, k=self.rng.randint(6, 14))).capitalize() + "."
+
+    def _populate_database(self, sessions: List[Tuple[str, datetime]]) -> Dict[str, int]:
+        """Fill claude_evolution.db with conversations, trait history and todos for the sessions"""
+        conversations = []
+        traits = []
+        for name, when in sessions:
+            stamp = when.isoformat()
+            topics = self.rng.sample(TOPICS, self.rng.randint(1, 3))
+            conversations.append((
+                stamp, when.strftime('%Y%m%d_%H%M%S') + '_' + name[-8:], self.rng.randint(4, 80),
+                json.dumps(topics), json.dumps({}), self.rng.randint(5, 10), "claude-sonnet-4",
+                self.rng.randint(5, 10), round(self.rng.uniform(0.5, 8.0), 2),
+                self.rng.randint(4, 10), self.rng.randint(5, 10)
+            ))
+            for trait in self.rng.sample(TRAITS, 2):
+                traits.append((stamp, trait, round(self.rng.uniform(0.3, 1.0), 2),
+                               round(self.rng.uniform(0.5, 1.0), 2), name, "claude-sonnet-4"))
+
+        todos = []
+        for _ in range(max(10, len(sessions) // 4)):
+            created = self.today - timedelta(days=self.rng.randrange(365))
+            done = self.rng.random() < 0.4
+            todos.append((
+                created.strftime('%Y-%m-%d'), self._sentence(), self.rng.randint(1, 5),
+                self.rng.choice(TODO_CATEGORIES), 'completed' if done else 'pending',
+                (created + timedelta(days=self.rng.randint(1, 60))).strftime('%Y-%m-%d'),
+                (created + timedelta(days=self.rng.randint(0, 30))).strftime('%Y-%m-%d') if done else None
+            ))
+
+        conn = sqlite3.connect(self.target / "claude_evolution.db")
+        try:
+            migrate(conn)
+            with conn:
+                conn.executemany("""
+                    INSERT INTO conversations (timestamp, session_id, message_count, topics, personality_traits,
+                                               user_satisfaction, model_version, context_quality, response_time,
+                                               creativity_score, technical_accuracy)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, conversations)
+                conn.executemany("""
+                    INSERT INTO personality_evolution (timestamp, trait_name, trait_value, confidence_level,
+                                                       context, model_version)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, traits)
+                conn.executemany("""
+                    INSERT INTO ai_todos (created_date, todo_text, importance, category, status, due_date,
+                                          completion_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, todos)
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return {'conversations': len(conversations), 'personality_evolution': len(traits), 'ai_todos': len(todos)}
+
+
+def parse_size(value: str) -> int:
+    """Turn 1k, 10k, 100k, 1m or a plain number into a note count"""
+    value = value.strip().lower()
+    if value in SIZES:
+        return SIZES[value]
+    return int(value)
+
+
+def generate_vault(target: str, notes: int, seed: int = 42) -> Dict:
+    """Generate a synthetic vault of roughly `notes` notes at `target`"""
+    return VaultGenerator(target, notes, seed).generate()
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Synthetic Vault Generator")
+    parser.add_argument('target', help='Directory to create the vault in')
+    parser.add_argument('--size', default='1k', help='Note count: 1k, 10k, 100k, 1m or a number')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible vaults')
+    parser.add_argument('--force', action='store_true', help='Replace the target directory if it exists')
+
+    args = parser.parse_args()
+
+    target = Path(args.target)
+    if target.exists() and any(target.iterdir()):
+        if not args.force:
+            print(f"Target is not empty: {target} (use --force to replace it)")
+            sys.exit(1)
+        shutil.rmtree(target)
+
+    print(json.dumps(generate_vault(args.target, parse_size(args.size), args.seed), indent=2))
+
+if __name__ == "__main__":
+    main()
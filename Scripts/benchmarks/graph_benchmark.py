@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Link Graph Benchmark
+Times the CSR build and every graph metric on a random link graph (100k notes and 500k links by default), reporting JSON
+"""
+
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from benchmarks.generate_vault import parse_size
+from graph_metrics import GraphMetrics
+from link_graph import LinkGraph
+from vault_index import VaultIndex
+
+FOLDERS = ('01-Daily', '04-Projects', '05-Ideas', '06-Knowledge', '09-Claude-Integration')
+
+
+def populate(index: VaultIndex, notes: int, links: int, seed: int):
+    """Write note rows and raw link targets straight into the index tables, skipping the parser"""
+    rng = random.Random(seed)
+    paths = [f"{FOLDERS[i % len(FOLDERS)]}/note-{i:07d}.md" for i in range(notes)]
+    with index.db.connection() as conn:
+        conn.executemany(
+            "INSERT INTO note_index (path, folder, parent, name, mtime_ns, ctime, size, data, seq) "
+            "VALUES (?, ?, ?, ?, 0, 0, 0, '{}', 1)",
+            [(path, path.split('/')[0], path.split('/')[0], path.split('/')[1]) for path in paths]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO link_edges (src_path, target) VALUES (?, ?)",
+            [(rng.choice(paths), f"note-{rng.randrange(notes):07d}") for _ in range(links)]
+        )
+
+
+def time_stage(operation: Callable[[], object], repeat: int) -> Dict:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {'min_ms': round(min(runs), 3), 'median_ms': round(statistics.median(runs), 3)}
+
+
+def benchmark(notes: int, links: int, repeat: int, seed: int) -> Dict:
+    """Cold timings of every stage behind GraphMetrics.compute on one random graph"""
+    workdir = Path(tempfile.mkdtemp(prefix="graph-bench-"))
+    try:
+        index = VaultIndex(str(workdir), db_path=str(workdir / "claude_evolution.db"))
+        graph = LinkGraph(index)
+        populate(index, notes, links, seed)
+
+        def build():
+            with index.db.connection() as conn:
+                graph._build(conn)
+
+        timings = {'LinkGraph._build': time_stage(build, repeat)}
+        metrics = GraphMetrics(graph)
+        _, indices, sources, out_degree = metrics._arrays()
+        node_count = graph.node_count
+        labels = GraphMetrics.connected_components(sources, indices, node_count)
+        timings.update({
+            'pagerank': time_stage(lambda: GraphMetrics.pagerank(sources, indices, out_degree, node_count), repeat),
+            'connected_components': time_stage(
+                lambda: GraphMetrics.connected_components(sources, indices, node_count), repeat),
+            'hits': time_stage(lambda: GraphMetrics.hits(sources, indices, node_count), repeat),
+            'bridge_notes': time_stage(
+                lambda: GraphMetrics.bridge_notes(sources, indices, node_count, labels), repeat),
+            'GraphMetrics._compute_all': time_stage(metrics._compute_all, repeat),
+        })
+        return {
+            'notes': node_count,
+            'links': links,
+            'edges': graph.edge_count,
+            'timings': timings,
+            'cold_total_ms': round(timings['LinkGraph._build']['min_ms'] +
+                                   timings['GraphMetrics._compute_all']['min_ms'], 3),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Link Graph Benchmark")
+    parser.add_argument('--notes', default='100k', help='Notes in the graph: 1k, 10k, 100k, 1m or a number')
+    parser.add_argument('--links', type=int, default=500000, help='Random links between the notes')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    args = parser.parse_args()
+
+    report = {'python': platform.python_version()}
+    report.update(benchmark(parse_size(args.notes), args.links, args.repeat, args.seed))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
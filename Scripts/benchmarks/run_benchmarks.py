@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Vault Benchmark Suite
+Generates synthetic vaults at several sizes and times every public vault operation, reporting JSON
+"""
+
+import inspect
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from benchmarks.generate_vault import generate_vault, parse_size
+from vault import load_script
+
+DEFAULT_SIZES = "1k,10k"
+CONTEXT_TYPES = ("quick", "full", "2000")
+
+# VaultAnalytics reports and the analyses they are assembled from; other helpers just load data
+ANALYTICS_PREFIXES = ('analyze_', 'generate_', '_analyze_', '_calculate_', '_assess_', '_check_')
+
+
+def time_operation(setup: Callable, operation: Callable, repeat: int) -> Dict:
+    """Run setup untimed then time operation on its result, `repeat` times"""
+    runs = []
+    with open(os.devnull, 'w') as quiet, redirect_stdout(quiet):
+        for _ in range(repeat):
+            target = setup()
+            start = time.perf_counter()
+            operation(target)
+            runs.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs_ms': [round(ms, 3) for ms in runs],
+        'min_ms': round(min(runs), 3),
+        'median_ms': round(statistics.median(runs), 3),
+    }
+
+
+def analytics_methods(analytics_class) -> List[str]:
+    """Every VaultAnalytics report or analysis that runs without arguments, public ones first"""
+    names = []
+    for name, method in inspect.getmembers(analytics_class, inspect.isfunction):
+        params = list(inspect.signature(method).parameters.values())[1:]
+        if name.startswith(ANALYTICS_PREFIXES) and all(p.default is not p.empty for p in params):
+            names.append(name)
+    return sorted(names, key=lambda name: (name.startswith('_'), name))
+
+
+class VaultBenchmark:
+    """Times the vault operations against one generated vault"""
+
+    def __init__(self, vault_path: Path, repeat: int = 3):
+        self.vault_path = vault_path
+        self.repeat = repeat
+        self.results: Dict[str, Dict] = {}
+
+    def run(self) -> Dict[str, Dict]:
+        """Time every operation; read-only ones run before those that write notes"""
+        self._bench_index()
+        self._bench_analytics()
+        self._bench_organizer()
+        self._bench_context()
+        self._bench_relationship_report()
+        self._bench_session_log()
+        return self.results
+
+    def _record(self, name: str, setup: Callable, operation: Callable, repeat: int = None):
+        """Time one operation, keeping the error instead of stopping the suite"""
+        try:
+            self.results[name] = time_operation(setup, operation, repeat or self.repeat)
+        except Exception as e:
+            self.results[name] = {'error': f"{type(e).__name__}: {e}"}
+
+    def _bench_index(self):
+        from vault_index import VaultIndex
+
+        # The first refresh parses every note; later ones only stat the files
+        self._record("VaultIndex.refresh[cold]", lambda: VaultIndex(self.vault_path), lambda index: index.refresh(), 1)
+        self._record("VaultIndex.refresh[warm]", lambda: VaultIndex(self.vault_path), lambda index: index.refresh())
+
+    def _bench_analytics(self):
+        analytics_class = load_script('analytics-engine.py').VaultAnalytics
+        for name in analytics_methods(analytics_class):
+            self._record(f"VaultAnalytics.{name}", lambda: analytics_class(str(self.vault_path)),
+                         lambda analytics, name=name: getattr(analytics, name)())
+
+    def _bench_organizer(self):
+        organizer_class = load_script('auto-organize.py').VaultOrganizer
+        self._record("VaultOrganizer.organize_inbox[dry_run]", lambda: organizer_class(str(self.vault_path)),
+                     lambda organizer: organizer.organize_inbox(dry_run=True))
+
+    def _bench_context(self):
+        loader_class = load_script('context-auto-loader.py').ContextAutoLoader
+        for context_type in CONTEXT_TYPES:
+            self._record(f"ContextAutoLoader.generate_comprehensive_context[{context_type},no-cache]",
+                         lambda: loader_class(str(self.vault_path), use_cache=False),
+                         lambda loader, t=context_type: loader.generate_comprehensive_context(t))
+            self._record(f"ContextAutoLoader.generate_comprehensive_context[{context_type},cached]",
+                         lambda: loader_class(str(self.vault_path)),
+                         lambda loader, t=context_type: loader.generate_comprehensive_context(t))
+
+    def _bench_relationship_report(self):
+        integration_class = load_script('advanced-claude-integration.py').AdvancedClaudeIntegration
+        self._record("AdvancedClaudeIntegration.generate_relationship_report",
+                     lambda: integration_class(str(self.vault_path)),
+                     lambda integration: integration.generate_relationship_report())
+
+    def _bench_session_log(self):
+        from claude_integration import ObsidianClaudeIntegration
+        self._record("ObsidianClaudeIntegration.create_session_log",
+                     lambda: ObsidianClaudeIntegration(str(self.vault_path)),
+                     lambda integration: integration.create_session_log("benchmark", "bench", "Time session logging"))
+
+
+def run_suite(sizes: List[str], workdir: Path, repeat: int, seed: int, keep: bool) -> Dict:
+    """Generate and benchmark one vault per size"""
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed,
+        'sizes': [],
+    }
+    for size in sizes:
+        vault_path = workdir / f"vault-{size}"
+        if vault_path.exists():
+            shutil.rmtree(vault_path)
+
+        print(f"Generating {size} vault in {vault_path}...", file=sys.stderr)
+        start = time.perf_counter()
+        summary = generate_vault(str(vault_path), parse_size(size), seed)
+        generate_seconds = time.perf_counter() - start
+
+        print(f"Benchmarking {size} vault...", file=sys.stderr)
+        report['sizes'].append({
+            'size': size,
+            'notes': summary['notes'],
+            'notes_by_kind': summary['by_kind'],
+            'database_rows': summary['database'],
+            'generate_s': round(generate_seconds, 3),
+            'operations': VaultBenchmark(vault_path, repeat).run(),
+        })
+        if not keep:
+            shutil.rmtree(vault_path, ignore_errors=True)
+    return report
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Benchmark Suite")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma-separated vault sizes: 1k, 10k, 100k, 1m')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per operation')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated vaults')
+    parser.add_argument('--workdir', help='Directory for generated vaults (default: a temporary directory)')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated vaults after benchmarking')
+    parser.add_argument('--output', help='Write the JSON results to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="vault-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    report = run_suite(sizes, workdir, args.repeat, args.seed, args.keep)
+    if not args.workdir and not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Vault Change Queue
+Bounded per-path queue between the watcher and the automation layer that coalesces, debounces and dedups note events
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+from vault_watcher import WatchEvent
+
+# Paths held at once before producers have to wait for the consumer
+MAX_PENDING = 1024
+
+# A path is handed out once it has been quiet this long...
+DEBOUNCE_SECONDS = 0.3
+
+# ...or once its first event is this old, so a note being typed into still gets processed
+MAX_DELAY_SECONDS = 5.0
+
+# Recent delivery latencies kept for the percentile metrics
+LATENCY_SAMPLES = 1000
+
+
+class PendingChange:
+    """Net effect of every event seen for one path since it was last handed out"""
+
+    __slots__ = ('kind', 'origin', 'first_seen', 'last_seen', 'modified')
+
+    def __init__(self, kind: str, origin: Optional[str], first_seen: float, last_seen: float,
+                 modified: bool = False):
+        self.kind = kind
+        self.origin = origin
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        # A move whose content was also written before or after the rename
+        self.modified = modified
+
+
+class ChangeQueue:
+    """Thread-safe queue keyed by note path; producers block while it is full"""
+
+    def __init__(self, max_pending: int = MAX_PENDING, debounce: float = DEBOUNCE_SECONDS,
+                 max_delay: float = MAX_DELAY_SECONDS):
+        self.max_pending = max_pending
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._pending: 'OrderedDict[str, PendingChange]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._counters = dict.fromkeys(
+            ('received', 'coalesced', 'cancelled', 'delivered', 'backpressure_waits'), 0)
+        self._backpressure_seconds = 0.0
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def put(self, event: WatchEvent, timeout: Optional[float] = None) -> bool:
+        """Merge an event into the queue, waiting while it is full; False if the wait timed out"""
+        with self._not_full:
+            # Only a path not already pending takes a new slot
+            if self._needs_slot(event) and len(self._pending) >= self.max_pending:
+                self._counters['backpressure_waits'] += 1
+                start = time.monotonic()
+                acquired = self._not_full.wait_for(lambda: len(self._pending) < self.max_pending, timeout)
+                self._backpressure_seconds += time.monotonic() - start
+                if not acquired:
+                    return False
+
+            self._counters['received'] += 1
+            self._merge(event, time.monotonic())
+            self._max_depth = max(self._max_depth, len(self._pending))
+            self._not_empty.notify()
+        return True
+
+    def _needs_slot(self, event: WatchEvent) -> bool:
+        key = event.dest if event.kind == 'moved' else event.path
+        return key not in self._pending
+
+    def _merge(self, event: WatchEvent, now: float):
+        """Fold one event into the pending change for its path"""
+        pending = self._pending
+        existing = pending.get(event.path)
+        first_seen = existing.first_seen if existing else now
+
+        if event.kind == 'moved':
+            modified = existing is not None and (existing.kind == 'modified' or existing.modified)
+            if existing:
+                del pending[event.path]
+                self._counters['coalesced'] += 1
+            if existing and existing.kind == 'created':
+                # A note created and then renamed is simply a new note at its final name
+                change = PendingChange('created', None, first_seen, now)
+            elif existing and existing.kind == 'moved':
+                # Chained renames collapse; renaming back to the start is just an edit
+                origin = existing.origin
+                change = PendingChange('modified' if origin == event.dest else 'moved',
+                                       None if origin == event.dest else origin, first_seen, now, modified)
+            else:
+                change = PendingChange('moved', event.path, first_seen, now, modified)
+            pending.pop(event.dest, None)
+            pending[event.dest] = change
+            return
+
+        if event.kind == 'deleted':
+            if existing is None and any(change.kind == 'moved' and change.origin == event.path
+                                        for change in pending.values()):
+                # Some platforms report the source of a move as deleted too
+                self._counters['coalesced'] += 1
+                return
+            if existing and existing.kind == 'created':
+                # Created and deleted before anyone looked: nothing happened
+                del pending[event.path]
+                self._counters['cancelled'] += 1
+                self._not_full.notify()
+                return
+            if existing and existing.kind == 'moved':
+                # The note left its original path and is now gone, unless a newer note took that path
+                del pending[event.path]
+                if existing.origin not in pending:
+                    pending[existing.origin] = PendingChange('deleted', None, first_seen, now)
+                else:
+                    self._not_full.notify()
+                self._counters['coalesced'] += 1
+                return
+            kind = 'deleted'
+        elif existing is None:
+            kind = event.kind
+        elif existing.kind == 'deleted':
+            # Deleted then recreated, as editors do on atomic saves
+            kind = 'modified'
+        else:
+            # created, moved and modified all absorb later writes
+            kind = existing.kind
+
+        if existing:
+            self._counters['coalesced'] += 1
+            existing.kind = kind
+            existing.last_seen = now
+            if kind == 'moved':
+                existing.modified = True
+            else:
+                existing.origin = None
+        else:
+            pending[event.path] = PendingChange(kind, None, now, now)
+
+    def _ready(self, change: PendingChange, now: float) -> bool:
+        return now - change.last_seen >= self.debounce or now - change.first_seen >= self.max_delay
+
+    def _next_ready_in(self, now: float) -> float:
+        """Seconds until the earliest pending change settles"""
+        return min(min(change.last_seen + self.debounce, change.first_seen + self.max_delay) - now
+                   for change in self._pending.values())
+
+    def get_batch(self, timeout: Optional[float] = None, limit: Optional[int] = None) -> List[WatchEvent]:
+        """Settled changes in arrival order, waiting up to timeout for at least one
+
+        A move that was also edited is followed by a 'modified' event for its destination.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while True:
+                now = time.monotonic()
+                ready = [path for path, change in self._pending.items() if self._ready(change, now)]
+                if ready:
+                    break
+                wait = self._next_ready_in(now) if self._pending else None
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return []
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._not_empty.wait(wait)
+
+            batch = []
+            for path in ready[:limit]:
+                change = self._pending.pop(path)
+                self._latencies.append(now - change.first_seen)
+                if change.kind == 'moved':
+                    batch.append(WatchEvent('moved', change.origin, path))
+                    if change.modified:
+                        batch.append(WatchEvent('modified', path))
+                else:
+                    batch.append(WatchEvent(change.kind, path))
+            self._counters['delivered'] += len(ready[:limit])
+            self._not_full.notify_all()
+        return batch
+
+    def metrics(self) -> Dict:
+        """Queue depth, event counters and delivery latency percentiles in milliseconds"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics = dict(self._counters, depth=len(self._pending), max_depth=self._max_depth,
+                           backpressure_ms=round(self._backpressure_seconds * 1000, 1))
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 1)
+
+        metrics.update({'latency_p50_ms': percentile(0.5), 'latency_p95_ms': percentile(0.95),
+                        'latency_max_ms': percentile(1.0)})
+        return metrics
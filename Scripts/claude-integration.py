@@ -20,8 +20,17 @@ class ObsidianClaudeIntegration:
         self.claude_folder = self.vault_path / "09-Claude-Integration"
         self.memory_folder = self.vault_path / "10-Agent-Memory"
         self.templates_folder = self.vault_path / "08-Templates"
+        self._index = None
         self.ensure_directories()
         
+    @property
+    def index(self):
+        """Vault index, opened on first use so note creation stays fast"""
+        if self._index is None:
+            from vault_index import VaultIndex
+            self._index = VaultIndex(self.vault_path)
+        return self._index
+        
     def ensure_directories(self):
         """Create necessary directories if they don't exist"""
         for folder in [self.claude_folder, self.memory_folder]:
@@ -195,29 +204,29 @@ class ObsidianClaudeIntegration:
             'recent_activity': []
         }
         
-        for folder in self.vault_path.iterdir():
-            if folder.is_dir() and not folder.name.startswith('.'):
-                files = list(folder.glob('*.md'))
-                metrics['total_files'] += len(files)
+        folder_metrics = {
+            "01-Daily": 'daily_notes',
+            "04-Projects": 'projects',
+            "05-Ideas": 'ideas',
+            "06-Knowledge": 'knowledge_notes',
+            "09-Claude-Integration": 'claude_sessions'
+        }
+        recent_cutoff = (datetime.datetime.now() - datetime.timedelta(days=7)).timestamp()
+        
+        for note in self.index.notes():
+            if not note['folder']:
+                continue  # Skip loose files in the vault root
+                
+            metrics['total_files'] += 1
+            if note['folder'] in folder_metrics:
+                metrics[folder_metrics[note['folder']]] += 1
                 
-                if folder.name == "01-Daily":
-                    metrics['daily_notes'] = len(files)
-                elif folder.name == "04-Projects":
-                    metrics['projects'] = len(files)
-                elif folder.name == "05-Ideas":
-                    metrics['ideas'] = len(files)
-                elif folder.name == "06-Knowledge":
-                    metrics['knowledge_notes'] = len(files)
-                elif folder.name == "09-Claude-Integration":
-                    metrics['claude_sessions'] = len(files)
-                    
-                # Track recent files
-                for file in files:
-                    if file.stat().st_mtime > (datetime.datetime.now() - datetime.timedelta(days=7)).timestamp():
-                        metrics['recent_activity'].append({
-                            'file': str(file),
-                            'modified': datetime.datetime.fromtimestamp(file.stat().st_mtime).isoformat()
-                        })
+            # Track recent files
+            if note['mtime'] > recent_cutoff:
+                metrics['recent_activity'].append({
+                    'file': str(self.vault_path / note['path']),
+                    'modified': datetime.datetime.fromtimestamp(note['mtime']).isoformat()
+                })
                         
         return metrics
         
@@ -263,21 +272,17 @@ class ObsidianClaudeIntegration:
         
     def _calculate_daily_consistency(self) -> float:
         """Calculate daily note consistency percentage"""
-        daily_folder = self.vault_path / "01-Daily"
-        if not daily_folder.exists():
-            return 0.0
-            
-        daily_files = list(daily_folder.glob('*.md'))
-        if not daily_files:
+        daily_notes = self.index.notes("01-Daily", recursive=False)
+        if not daily_notes:
             return 0.0
             
         # Count days in the last 30 days
         thirty_days_ago = datetime.date.today() - datetime.timedelta(days=30)
         recent_files = 0
         
-        for file in daily_files:
+        for note in daily_notes:
             try:
-                file_date = datetime.datetime.strptime(file.stem, '%Y-%m-%d').date()
+                file_date = datetime.datetime.strptime(note['stem'], '%Y-%m-%d').date()
                 if file_date >= thirty_days_ago:
                     recent_files += 1
             except ValueError:
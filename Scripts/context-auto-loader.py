@@ -6,43 +6,176 @@ to operate as your central mind palace and strategic thinking partner
 """
 
 import os
-import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as SectionTimeout
 from pathlib import Path
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, TextIO, Any
 import sqlite3
-import re
-from collections import defaultdict
+from vault_index import VaultIndex
+from task_index import TaskIndex
+from context_cache import ContextCache, DEFAULT_TTL
+from context_packer import ContextItem, PackResult, pack_context
+from schema_migrations import migrate
+from instrumentation import Span, current, enable, finish, span, timed
 
+# Seconds to wait for a section before falling back to its last good value, or marking it unavailable
+SECTION_TIMEOUT = 5.0
+
+# Recently modified notes offered to the packer as retrieved context
+RETRIEVED_NOTES = 10
+
+# Cache lifetimes in seconds; change detection invalidates sooner
+SECTION_TTLS = {
+    "user_profile": 86400,
+    "thinking_context": 86400,
+    "strategic_overview": 86400,
+    "current_situation": 900,
+    "priority_actions": 900
+}
+
+class UnavailableSection:
+    """Stand-in for a section that timed out with nothing cached; every field reads as unavailable"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        
+    def __getitem__(self, key) -> 'UnavailableSection':
+        return self
+        
+    def get(self, key, default=None):
+        return default
+        
+    def items(self):
+        return iter(())
+        
+    def __iter__(self):
+        return iter(())
+        
+    def __len__(self) -> int:
+        return 0
+        
+    def __str__(self) -> str:
+        return f"({self.name} unavailable: timed out)"
+        
+    def __format__(self, spec: str) -> str:
+        return str(self)
+        
 class ContextAutoLoader:
     """Automatically generates and loads context for Claude agents"""
     
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, section_timeout: float = SECTION_TIMEOUT, use_cache: bool = True,
+                 index: Optional[VaultIndex] = None):
         self.vault_path = Path(vault_path)
         self.db_path = self.vault_path / "claude_evolution.db"
-        self.context_cache = {}
-        
-    def generate_comprehensive_context(self, context_type: str = "full") -> str:
-        """Generate complete context summary for Claude agents"""
-        
-        context_sections = {
-            "user_profile": self._get_user_profile(),
-            "current_situation": self._get_current_situation(),
-            "active_goals": self._get_active_goals(),
-            "recent_patterns": self._get_recent_patterns(),
-            "relationship_status": self._get_relationship_status(),
-            "priority_actions": self._get_priority_actions(),
-            "thinking_context": self._get_thinking_context(),
-            "strategic_overview": self._get_strategic_overview()
-        }
+        self.section_timeout = section_timeout
+        self.use_cache = use_cache
+        self.index = index or VaultIndex(vault_path)
+        self.db = self.index.db
+        self.init_schema()
+        self.tasks = TaskIndex(self.index)
+        self.context_cache = ContextCache(self.db)
+        self.last_pack: Optional[PackResult] = None
+        
+    def init_schema(self):
+        """Bring the tracking tables and their change counter up to date"""
+        with self.db.connection() as conn:
+            migrate(conn)
+            
+    @timed()
+    def generate_comprehensive_context(self, context_type: str = "full", err: Optional[TextIO] = None) -> str:
+        """Generate complete context summary for Claude agents.
+        
+        context_type is "quick", "full", or a token budget such as "1500". Section
+        warnings go to err (default stderr).
+        """
+        
+        context_sections = self._gather_sections(err)
         
-        if context_type == "quick":
+        if str(context_type).isdigit():
+            # Budgeted context packed from ranked items
+            return self._generate_budgeted_context(context_sections, int(context_type))
+        elif context_type == "quick":
             # Short context for routine interactions
             return self._generate_quick_context(context_sections)
         else:
             # Full context for complex sessions
             return self._generate_full_context(context_sections)
             
+    def _section_builders(self) -> Dict[str, Callable[[], Any]]:
+        """Independent context sections and the functions that build them"""
+        return {
+            "user_profile": self._get_user_profile,
+            "current_situation": self._get_current_situation,
+            "active_goals": self._get_active_goals,
+            "recent_patterns": self._get_recent_patterns,
+            "relationship_status": self._get_relationship_status,
+            "priority_actions": self._get_priority_actions,
+            "thinking_context": self._get_thinking_context,
+            "strategic_overview": self._get_strategic_overview
+        }
+        
+    @timed()
+    def _gather_sections(self, err: Optional[TextIO] = None) -> Dict:
+        """Serve unchanged sections from cache and build the rest concurrently"""
+        err = err or sys.stderr
+        builders = self._section_builders()
+        self.index.ensure_fresh()
+        state = self.context_cache.current_state(self.index.generation)
+        sections = {}
+        
+        if self.use_cache:
+            for name in list(builders):
+                hit, value = self.context_cache.get(name, state)
+                if hit:
+                    sections[name] = value
+                    del builders[name]
+                    
+        if not builders:
+            return sections
+            
+        # Sections read tasks from the task index, so bring it up to date once before fanning out
+        self.tasks.sync()
+        executor = ThreadPoolExecutor(max_workers=len(builders), thread_name_prefix="context-section")
+        futures = {name: executor.submit(self._build_section, name, builder, current())
+                   for name, builder in builders.items()}
+        deadline = time.monotonic() + self.section_timeout
+        
+        try:
+            for name, future in futures.items():
+                stale = self.context_cache.get_stale(name)
+                try:
+                    sections[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except SectionTimeout:
+                    if stale is None:
+                        print(f"Context section '{name}' timed out with no cached value, marking it unavailable",
+                              file=err)
+                        sections[name] = UnavailableSection(name)
+                    else:
+                        print(f"Context section '{name}' timed out, using cached value", file=err)
+                        sections[name] = stale
+                    continue
+                except Exception as e:
+                    if stale is None:
+                        raise
+                    print(f"Error building context section '{name}': {e}, using cached value", file=err)
+                    sections[name] = stale
+                    continue
+                self.context_cache.put(name, state, sections[name], SECTION_TTLS.get(name, DEFAULT_TTL))
+        finally:
+            # shutdown(cancel_futures=True) needs Python 3.9; cancelling by hand leaves running sections be
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            
+        return sections
+        
+    def _build_section(self, name: str, builder: Callable[[], Any], parent: Optional[Span]) -> Any:
+        """Build one section on a worker thread, timed under the span that gathered it"""
+        with span(f"section:{name}", parent):
+            return builder()
+            
     def _get_user_profile(self) -> Dict:
         """Get current user profile and preferences"""
         profile = {
@@ -66,27 +199,18 @@ class ContextAutoLoader:
         today = date.today()
         
         # Get today's daily note if it exists
-        daily_file = self.vault_path / "01-Daily" / f"{today.isoformat()}.md"
-        current_priorities = []
+        daily_note = self.index.get(f"01-Daily/{today.isoformat()}.md")
+        current_priorities = self._get_today_priorities()
         energy_level = "Unknown"
         mood = "Unknown"
         
-        if daily_file.exists():
-            with open(daily_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Extract current priorities
-            priorities = re.findall(r'- \[ \] (.+)', content)
-            current_priorities = priorities[:3]  # Top 3
-            
+        if daily_note:
             # Extract energy and mood
-            energy_match = re.search(r'Energy level:\s*(\d+)/10', content)
-            if energy_match:
-                energy_level = f"{energy_match.group(1)}/10"
+            if daily_note['energy'] is not None:
+                energy_level = f"{daily_note['energy']}/10"
                 
-            mood_match = re.search(r'Mood:\s*([^\n]+)', content)
-            if mood_match:
-                mood = mood_match.group(1).strip()
+            if daily_note['mood'] is not None:
+                mood = daily_note['mood']
                 
         # Get active projects
         active_projects = self._get_active_projects()
@@ -113,21 +237,15 @@ class ContextAutoLoader:
             "ai_relationship": []  # AI collaboration goals
         }
         
-        # Extract from recent weekly/monthly notes
-        weekly_folder = self.vault_path / "02-Weekly"
-        monthly_folder = self.vault_path / "03-Monthly"
-        
-        # Get most recent weekly goals
-        if weekly_folder.exists():
-            recent_weekly = sorted(weekly_folder.glob('*.md'))
-            if recent_weekly:
-                goals["short_term"] = self._extract_goals_from_file(recent_weekly[-1])
+        # Extract from the most recent weekly/monthly notes (last in path order)
+        recent_weekly = self.index.last_path("02-Weekly")
+        if recent_weekly:
+            goals["short_term"] = self._extract_goals_from_note(recent_weekly)
                 
         # Get most recent monthly goals  
-        if monthly_folder.exists():
-            recent_monthly = sorted(monthly_folder.glob('*.md'))
-            if recent_monthly:
-                goals["medium_term"] = self._extract_goals_from_file(recent_monthly[-1])
+        recent_monthly = self.index.last_path("03-Monthly")
+        if recent_monthly:
+            goals["medium_term"] = self._extract_goals_from_note(recent_monthly)
                 
         # Get AI-related goals from todos
         goals["ai_relationship"] = self._get_ai_todos()
@@ -158,7 +276,7 @@ class ContextAutoLoader:
             }
             
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.db.connection() as conn:
                 # Get recent personality observations
                 recent_traits = conn.execute("""
                     SELECT trait_name, AVG(trait_value) as avg_value
@@ -241,6 +359,7 @@ class ContextAutoLoader:
         
         return strategy
         
+    @timed()
     def _generate_quick_context(self, sections: Dict) -> str:
         """Generate condensed context for routine interactions"""
         user = sections["user_profile"]
@@ -272,6 +391,7 @@ class ContextAutoLoader:
         
         return context
         
+    @timed()
     def _generate_full_context(self, sections: Dict) -> str:
         """Generate comprehensive context for complex sessions"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
@@ -372,6 +492,73 @@ class ContextAutoLoader:
         
         return context
         
+    @timed()
+    def _generate_budgeted_context(self, sections: Dict, budget: int) -> str:
+        """Generate the highest-value context that fits a token budget"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+        self.last_pack = pack_context(
+            f"Agent Context - {timestamp} ({budget} token budget)",
+            self._context_items(sections),
+            budget
+        )
+        return self.last_pack.text
+        
+    def _context_items(self, sections: Dict) -> List[ContextItem]:
+        """Every candidate context line, ranked by priority then recency"""
+        user = sections['user_profile']
+        situation = sections['current_situation']
+        goals = sections['active_goals']
+        relationship = sections['relationship_status']
+        strategy = sections['strategic_overview']
+        now = datetime.now().timestamp()
+        
+        items = [
+            ContextItem("Current Situation", f"- **User:** {user['name']} ({user['role']})", 100),
+            ContextItem("Current Situation", f"- **Today:** {situation['date']} | Energy: {situation['energy_level']} | Mood: {situation['mood']}", 100, now),
+            ContextItem("Current Situation", f"- **Communication:** {user['communication_preference']}", 80),
+            ContextItem("Current Situation", f"- **Working Style:** {user['working_style']}", 60),
+            ContextItem("Current Situation", f"- **Current Focus:** {user['current_focus']}", 55),
+        ]
+        items += [ContextItem("Today's Priorities", f"- {priority}", 95, now - rank)
+                  for rank, priority in enumerate(situation['current_priorities'])]
+        items += [ContextItem("Priority Actions", f"- {action}", 90, now - rank)
+                  for rank, action in enumerate(sections['priority_actions'])]
+        items += [ContextItem("Goals", f"- This week: {goal}", 75, -rank)
+                  for rank, goal in enumerate(goals['short_term'])]
+        items += [ContextItem("Goals", f"- This month: {goal}", 65, -rank)
+                  for rank, goal in enumerate(goals['medium_term'])]
+        items += [ContextItem("Goals", f"- AI relationship: {goal['text']}", 60 + (goal['importance'] or 0) * 5, -rank)
+                  for rank, goal in enumerate(goals['ai_relationship'])]
+        items += [ContextItem("Active Projects", f"- {project['name']} ({project['status']})", 70)
+                  for project in situation['active_projects']]
+        items += [ContextItem("Recent Sessions", f"- {session['file']} ({session['date'][:16]})", 55,
+                              datetime.fromisoformat(session['date']).timestamp())
+                  for session in situation['recent_sessions']]
+        items += [
+            ContextItem("Relationship", f"- **Stage:** {relationship['stage']} ({relationship['total_interactions']} interactions)", 50),
+        ]
+        items += [ContextItem("Relationship", f"- {trait}: {value:.1f}/10", 45)
+                  for trait, value in relationship['recent_traits'].items()]
+        items += [ContextItem("Retrieved Notes", note_line, 35, mtime)
+                  for note_line, mtime in self._retrieve_recent_notes()]
+        items += [
+            ContextItem("Strategy", f"- **Mission:** {strategy['mission']}", 40),
+            ContextItem("Strategy", f"- **Phase:** {strategy['current_phase']}", 30),
+            ContextItem("Strategy", f"- **Next Milestone:** {strategy['next_milestone']}", 30),
+        ]
+        items += [ContextItem("Thinking Context", f"- {model}", 20)
+                  for model in sections['thinking_context']['active_frameworks'][:3]]
+        return items
+        
+    def _retrieve_recent_notes(self, limit: int = RETRIEVED_NOTES) -> List[tuple]:
+        """Most recently modified notes as (summary line, mtime) pairs"""
+        notes = sorted(self.index.notes(), key=lambda note: note['mtime'], reverse=True)[:limit]
+        results = []
+        for note in notes:
+            excerpt = ' '.join(note['excerpt'].split())[:160]
+            results.append((f"- **{note['stem']}** ({note['parent'] or 'root'}): {excerpt}", note['mtime']))
+        return results
+        
     # Helper methods for data extraction
     def _extract_recent_user_insights(self) -> Dict:
         """Extract recent insights about user from notes"""
@@ -380,30 +567,26 @@ class ContextAutoLoader:
     def _get_active_projects(self) -> List[Dict]:
         """Get list of active projects"""
         projects = []
-        projects_folder = self.vault_path / "04-Projects"
         
-        if projects_folder.exists():
-            for project_file in projects_folder.glob('*.md'):
-                projects.append({
-                    "name": project_file.stem,
-                    "status": "active"  # Would extract from file content
-                })
+        for project_note in self.index.notes("04-Projects", recursive=False):
+            projects.append({
+                "name": project_note['stem'],
+                "status": "active"  # Would extract from file content
+            })
                 
         return projects
         
     def _get_recent_sessions(self, days: int = 7) -> List[Dict]:
         """Get recent Claude sessions"""
         sessions = []
-        session_folder = self.vault_path / "09-Claude-Integration"
-        
-        if session_folder.exists():
-            cutoff_date = datetime.now() - timedelta(days=days)
-            for session_file in session_folder.glob('*-session.md'):
-                if datetime.fromtimestamp(session_file.stat().st_mtime) > cutoff_date:
-                    sessions.append({
-                        "file": session_file.name,
-                        "date": datetime.fromtimestamp(session_file.stat().st_mtime).isoformat()
-                    })
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        
+        for session_note in self.index.notes("09-Claude-Integration", recursive=False):
+            if session_note['name'].endswith('-session.md') and session_note['mtime'] > cutoff:
+                sessions.append({
+                    "file": session_note['name'],
+                    "date": datetime.fromtimestamp(session_note['mtime']).isoformat()
+                })
                     
         return sessions
         
@@ -411,25 +594,16 @@ class ContextAutoLoader:
         """Get immediate context from recent activities"""
         return "Building comprehensive AI integration system"
         
-    def _extract_goals_from_file(self, file_path: Path) -> List[str]:
-        """Extract goals from a note file"""
-        goals = []
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Extract checkbox items as goals
-                goal_matches = re.findall(r'- \[ \] (.+)', content)
-                goals = goal_matches[:5]  # Top 5 goals
-        except (UnicodeDecodeError, FileNotFoundError):
-            pass
-        return goals
+    def _extract_goals_from_note(self, path: str) -> List[str]:
+        """Extract goals (open checkbox items) from a note via the task index"""
+        return self.tasks.open_tasks(path, limit=5)  # Top 5 goals
         
     def _get_ai_todos(self, status: str = "pending", limit: int = 10) -> List[Dict]:
         """Get AI-related todos"""
         if not self.db_path.exists():
             return []
             
-        with sqlite3.connect(self.db_path) as conn:
+        with self.db.connection() as conn:
             todos = conn.execute("""
                 SELECT todo_text, importance, category, due_date
                 FROM ai_todos
@@ -503,17 +677,7 @@ class ContextAutoLoader:
     def _get_today_priorities(self) -> List[str]:
         """Get today's priorities from daily note"""
         today = date.today()
-        daily_file = self.vault_path / "01-Daily" / f"{today.isoformat()}.md"
-        
-        if daily_file.exists():
-            try:
-                with open(daily_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                priorities = re.findall(r'- \[ \] (.+)', content)
-                return priorities[:3]
-            except (UnicodeDecodeError, FileNotFoundError):
-                pass
-        return []
+        return self.tasks.open_tasks(f"01-Daily/{today.isoformat()}.md", limit=3)
         
     def _extract_mental_models(self) -> List[str]:
         """Extract active mental models"""
@@ -589,15 +753,28 @@ def main():
     """Main execution function"""
     import argparse
     
+    def context_type_arg(value: str) -> str:
+        """Accept quick, full, or a positive token budget"""
+        if value in ('quick', 'full') or (value.isdigit() and int(value) > 0):
+            return value
+        raise argparse.ArgumentTypeError(f"expected quick, full or a token budget, got '{value}'")
+    
     parser = argparse.ArgumentParser(description="Context Auto-Loader")
     parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
-    parser.add_argument('--type', choices=['quick', 'full'], default='full', help='Context type')
+    parser.add_argument('--type', type=context_type_arg, default='full',
+                       help='Context type: quick, full, or a token budget such as 1500')
     parser.add_argument('--save', action='store_true', help='Save context to file')
     parser.add_argument('--print', action='store_true', help='Print context to console')
+    parser.add_argument('--timeout', type=float, default=SECTION_TIMEOUT,
+                       help='Seconds to wait per section before using its cached value')
+    parser.add_argument('--no-cache', action='store_true', help='Rebuild every section instead of using cached values')
+    parser.add_argument('--timings', action='store_true', help='Print a per-stage timing breakdown at the end')
     
     args = parser.parse_args()
+    if args.timings:
+        enable()
     
-    loader = ContextAutoLoader(args.vault)
+    loader = ContextAutoLoader(args.vault, section_timeout=args.timeout, use_cache=not args.no_cache)
     context = loader.generate_comprehensive_context(args.type)
     
     if args.save:
@@ -606,6 +783,12 @@ def main():
         
     if args.print or not args.save:
         print(context)
+        
+    if loader.last_pack:
+        print(loader.last_pack.report(), file=sys.stderr)
+        
+    if args.timings:
+        finish(loader.db_path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Context Section Cache
+In-memory LRU over a SQLite disk tier, invalidated by vault and database changes
+"""
+
+import json
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from vault_db import VaultDB
+
+MAX_MEMORY_ENTRIES = 64
+
+# Safety net on top of change detection, in seconds
+DEFAULT_TTL = 3600
+
+
+class CacheState(NamedTuple):
+    """Everything a cached section may depend on"""
+    generation: int
+    data_version: int
+    db_changes: int
+    day: str
+
+    @property
+    def memory_key(self) -> str:
+        # data_version is only comparable within one connection, so it suits the in-process tier
+        return f"{self.generation}:{self.data_version}:{self.day}"
+
+    @property
+    def disk_key(self) -> str:
+        # The trigger-maintained counter survives restarts, so it keys the persistent tier
+        return f"{self.generation}:{self.db_changes}:{self.day}"
+
+
+class ContextCache:
+    """Two-tier cache of context sections with LRU eviction and per-entry TTLs"""
+
+    def __init__(self, db: VaultDB, max_entries: int = MAX_MEMORY_ENTRIES):
+        self.db = db
+        self.max_entries = max_entries
+        self.memory: 'OrderedDict[str, Tuple[str, float, Any]]' = OrderedDict()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the disk tier table if it doesn't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS context_sections (
+                    name TEXT PRIMARY KEY,
+                    value TEXT,
+                    updated REAL,
+                    cache_key TEXT,
+                    expires REAL
+                )
+            """)
+
+            # Tables created before keyed caching only stored the last value
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(context_sections)")}
+            for column, kind in (('cache_key', 'TEXT'), ('expires', 'REAL')):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE context_sections ADD COLUMN {column} {kind}")
+
+    def current_state(self, generation: int) -> CacheState:
+        """Snapshot the change markers a cached value must match"""
+        with self.db.connection() as conn:
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            row = conn.execute("SELECT value FROM db_changes WHERE id = 1").fetchone()
+        return CacheState(generation, data_version, row[0] if row else 0, date.today().isoformat())
+
+    def get(self, name: str, state: CacheState) -> Tuple[bool, Any]:
+        """Return (hit, value) for a section valid under the given state"""
+        now = time.time()
+
+        entry = self.memory.get(name)
+        if entry and entry[0] == state.memory_key and entry[1] > now:
+            self.memory.move_to_end(name)
+            self.stats['memory_hits'] += 1
+            return True, entry[2]
+
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT value, cache_key, expires FROM context_sections WHERE name = ?", (name,)
+            ).fetchone()
+        if row and row[1] == state.disk_key and (row[2] or 0) > now:
+            value = json.loads(row[0])
+            self._remember(name, state.memory_key, row[2], value)
+            self.stats['disk_hits'] += 1
+            return True, value
+
+        self.stats['misses'] += 1
+        return False, None
+
+    def get_stale(self, name: str) -> Optional[Any]:
+        """Last stored value regardless of validity, for fallback when rebuilding fails"""
+        entry = self.memory.get(name)
+        if entry:
+            return entry[2]
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT value FROM context_sections WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, name: str, state: CacheState, value: Any, ttl: float = DEFAULT_TTL):
+        """Store a freshly built section in both tiers"""
+        now = time.time()
+        # Round-trip through JSON so both tiers hand back identical values
+        value = json.loads(json.dumps(value, default=str))
+        self._remember(name, state.memory_key, now + ttl, value)
+        self.db.enqueue(
+            "INSERT OR REPLACE INTO context_sections (name, value, updated, cache_key, expires) VALUES (?, ?, ?, ?, ?)",
+            (name, json.dumps(value), now, state.disk_key, now + ttl)
+        )
+
+    def invalidate(self):
+        """Drop every cached section"""
+        self.memory.clear()
+        self.db.enqueue("UPDATE context_sections SET expires = 0")
+
+    def _remember(self, name: str, key: str, expires: float, value: Any):
+        """Insert into the memory tier, evicting the least recently used entry when full"""
+        self.memory[name] = (key, expires, value)
+        self.memory.move_to_end(name)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
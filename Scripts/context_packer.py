@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Context Packer
+Fits ranked context items into a token budget and reports what was left out
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple
+
+# Rough characters per token for English prose in BPE vocabularies
+CHARS_PER_TOKEN = 4
+
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate: one per symbol, one per CHARS_PER_TOKEN of each word"""
+    return sum(1 + (len(piece) - 1) // CHARS_PER_TOKEN for piece in TOKEN_PATTERN.findall(text))
+
+
+class ContextItem(NamedTuple):
+    """One line of candidate context"""
+    section: str
+    text: str
+    priority: int
+    recency: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + 1
+
+
+class PackResult(NamedTuple):
+    """A packed context and the accounting behind it"""
+    text: str
+    budget: int
+    used: int
+    included: List[ContextItem]
+    dropped: List[ContextItem]
+
+    def report(self) -> str:
+        """One-paragraph summary of what fit and what was dropped"""
+        lines = [f"Packed {len(self.included)} items into {self.used}/{self.budget} tokens"]
+        if self.dropped:
+            dropped_tokens = sum(item.tokens for item in self.dropped)
+            by_section = Counter(item.section for item in self.dropped)
+            lines.append(f"Dropped {len(self.dropped)} items (~{dropped_tokens} tokens): " +
+                         ", ".join(f"{section} ({count})" for section, count in by_section.items()))
+        return "\n".join(lines)
+
+
+def pack_context(title: str, items: List[ContextItem], budget: int) -> PackResult:
+    """Greedily add items by priority then recency while they fit the budget.
+
+    Section headings are charged when a section gets its first item, and the
+    output keeps the candidates' original section and item order.
+    """
+    header = f"# {title}\n"
+    used = estimate_tokens(header)
+    heading_cost = {item.section: estimate_tokens(f"\n## {item.section}\n") for item in items}
+
+    ranked = sorted(range(len(items)), key=lambda i: (-items[i].priority, -items[i].recency, i))
+    chosen = set()
+    opened = set()
+    for i in ranked:
+        item = items[i]
+        cost = item.tokens + (0 if item.section in opened else heading_cost[item.section])
+        if used + cost <= budget:
+            chosen.add(i)
+            opened.add(item.section)
+            used += cost
+
+    sections: Dict[str, List[str]] = {}
+    for i, item in enumerate(items):
+        if i in chosen:
+            sections.setdefault(item.section, []).append(item.text)
+
+    text = header + "".join(
+        f"\n## {section}\n" + "\n".join(lines) + "\n" for section, lines in sections.items()
+    )
+    return PackResult(
+        text=text,
+        budget=budget,
+        used=used,
+        included=[items[i] for i in sorted(chosen)],
+        dropped=[item for i, item in enumerate(items) if i not in chosen]
+    )
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Daily Metrics Store
+Columnar per-day energy, mood and task arrays kept in sync with the vault index
+"""
+
+import re
+import copy
+import json
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from vault_index import VaultIndex
+from instrumentation import timed
+
+CURSOR_NAME = 'daily_metrics'
+
+DAILY_FOLDER = "01-Daily"
+DAILY_NAME_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})\.md$')
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Column name -> dtype; rows are days in ascending order
+COLUMNS = {
+    'days': 'datetime64[D]',
+    'energy': 'float64',      # NaN when the note has no energy level
+    'mood': 'int32',          # index into the mood vocabulary, -1 when missing
+    'tasks_total': 'int32',
+    'tasks_done': 'int32',
+}
+
+
+def daily_note_day(path: str) -> Optional[np.datetime64]:
+    """The day a daily note path stands for, or None for any other note"""
+    folder, _, name = path.rpartition('/')
+    match = DAILY_NAME_PATTERN.match(name)
+    if folder != DAILY_FOLDER or not match:
+        return None
+    try:
+        return np.datetime64(match.group(1), 'D')
+    except ValueError:
+        return None
+
+
+def day_runs(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Run-length encode sorted unique days into (first day, length) of each consecutive run"""
+    if not len(days):
+        return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype='int64')
+    # A run ends wherever the next day is not exactly one day later
+    breaks = np.flatnonzero(np.diff(days).astype('int64') != 1)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(days) - 1]))
+    return days[starts], ends - starts + 1
+
+
+def day_gaps(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(first missing day, length) of every hole between the first and last day"""
+    if len(days) < 2:
+        return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype='int64')
+    steps = np.diff(days).astype('int64')
+    holes = np.flatnonzero(steps > 1)
+    return days[holes] + 1, steps[holes] - 1
+
+
+class DailyMetrics:
+    """Per-day metric columns persisted in claude_evolution.db and updated from the index change feed"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+        self.db = index.db
+        self.moods: List[str] = []
+        self.columns: Dict[str, np.ndarray] = {}
+        self._reset()
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the metrics table if it doesn't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS daily_metrics (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    columns TEXT,
+                    moods TEXT,
+                    data BLOB
+                )
+            """)
+
+    def __len__(self) -> int:
+        return len(self.columns['days'])
+
+    @timed()
+    def sync(self) -> Dict:
+        """Fold index changes since the last sync into the stored columns"""
+        cursor = self.index.get_cursor(CURSOR_NAME)
+        with self.db.connection() as conn:
+            if not conn.execute("SELECT 1 FROM daily_metrics WHERE id = 1").fetchone():
+                cursor = 0
+        changed, removed, generation = self.index.snapshot_changes(cursor)
+
+        with self.db.connection() as conn:
+            if cursor > 0:
+                self._read(conn)
+            else:
+                # First sync: the change feed holds every note
+                self._reset()
+
+            rows = [(day, note) for day, note in ((daily_note_day(note['path']), note) for note in changed)
+                    if day is not None]
+            touched = [day for day in (daily_note_day(path) for path in removed) if day is not None]
+            touched += [day for day, _ in rows]
+
+            if touched:
+                self._merge(np.array(touched, dtype='datetime64[D]'), self._rows_to_columns(rows))
+                self._write(conn)
+            self.index.set_cursor(CURSOR_NAME, generation, conn)
+
+        return {'updated_days': len(rows), 'days': len(self)}
+
+    @timed()
+    def load(self) -> 'DailyMetrics':
+        """Sync with the index and return the up-to-date store"""
+        self.sync()
+        return self
+
+    def _rows_to_columns(self, rows: List[Tuple[np.datetime64, Dict]]) -> Dict[str, np.ndarray]:
+        """Turn parsed daily notes into column arrays"""
+        mood_codes = {mood: code for code, mood in enumerate(self.moods)}
+        moods = []
+        for _, note in rows:
+            mood = note['mood'].lower() if note['mood'] else None
+            if mood is not None and mood not in mood_codes:
+                mood_codes[mood] = len(self.moods)
+                self.moods.append(mood)
+            moods.append(mood_codes[mood] if mood is not None else -1)
+
+        return {
+            'days': np.array([day for day, _ in rows], dtype='datetime64[D]'),
+            'energy': np.array([np.nan if note['energy'] is None else note['energy'] for _, note in rows],
+                               dtype='float64'),
+            'mood': np.array(moods, dtype='int32'),
+            'tasks_total': np.array([len(note['tasks']) for _, note in rows], dtype='int32'),
+            'tasks_done': np.array([sum(1 for status, _ in note['tasks'] if status == 'x') for _, note in rows],
+                                   dtype='int32'),
+        }
+
+    def _merge(self, touched: np.ndarray, fresh: Dict[str, np.ndarray]):
+        """Replace every touched day with the fresh rows and keep days sorted"""
+        keep = ~np.isin(self.columns['days'], touched)
+        merged = {name: np.concatenate([self.columns[name][keep], fresh[name]]) for name in COLUMNS}
+        order = np.argsort(merged['days'], kind='stable')
+        self.columns = {name: values[order] for name, values in merged.items()}
+
+    def _reset(self):
+        """Empty every column"""
+        self.moods = []
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def _read(self, conn):
+        """Load the stored columns"""
+        row = conn.execute("SELECT columns, moods, data FROM daily_metrics WHERE id = 1").fetchone()
+        if row is None:
+            self._reset()
+            return
+
+        layout = json.loads(row[0])
+        self.moods = json.loads(row[1])
+        self.columns = {}
+        offset = 0
+        for name, dtype in COLUMNS.items():
+            size = layout[name]
+            self.columns[name] = np.frombuffer(row[2], dtype=dtype, count=size // np.dtype(dtype).itemsize,
+                                               offset=offset).copy()
+            offset += size
+
+    def _write(self, conn):
+        """Store all columns as one contiguous blob"""
+        layout = {name: self.columns[name].nbytes for name in COLUMNS}
+        data = b''.join(self.columns[name].tobytes() for name in COLUMNS)
+        conn.execute(
+            "INSERT OR REPLACE INTO daily_metrics (id, columns, moods, data) VALUES (1, ?, ?, ?)",
+            (json.dumps(layout), json.dumps(self.moods), data)
+        )
+
+    # Vectorized queries
+
+    def day_slice(self, since: Optional[date] = None, until: Optional[date] = None) -> slice:
+        """Rows for days in [since, until], found by binary search over the sorted days"""
+        days = self.columns['days']
+        start = 0 if since is None else int(np.searchsorted(days, np.datetime64(since, 'D'), side='left'))
+        stop = len(days) if until is None else int(np.searchsorted(days, np.datetime64(until, 'D'), side='right'))
+        return slice(start, stop)
+
+    def window(self, since: Optional[date] = None, until: Optional[date] = None) -> 'DailyMetrics':
+        """The store restricted to days in [since, until]; its columns are views, nothing is copied"""
+        rows = self.day_slice(since, until)
+        view = copy.copy(self)
+        view.columns = {name: values[rows] for name, values in self.columns.items()}
+        return view
+
+    def since(self, days_back: int, today: Optional[date] = None) -> np.ndarray:
+        """Boolean mask of rows within the last days_back days, ending today"""
+        end = np.datetime64(today or date.today(), 'D')
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.day_slice((end - days_back).item(), end.item())] = True
+        return mask
+
+    def energy_mask(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows with a recorded energy level, optionally restricted by mask"""
+        has_energy = ~np.isnan(self.columns['energy'])
+        return has_energy if mask is None else has_energy & mask
+
+    def average_energy(self, mask: Optional[np.ndarray] = None) -> Optional[float]:
+        """Mean energy over the selected days, None when there is no data"""
+        values = self.columns['energy'][self.energy_mask(mask)]
+        return float(values.mean()) if len(values) else None
+
+    def weekdays(self) -> np.ndarray:
+        """Weekday number per row, Monday = 0 (1970-01-01 was a Thursday)"""
+        return (self.columns['days'].astype('int64') + 3) % 7
+
+    def weekday_energy(self) -> Dict[str, float]:
+        """Average energy for each weekday that has data"""
+        valid = self.energy_mask()
+        weekday = self.weekdays()[valid]
+        counts = np.bincount(weekday, minlength=7)
+        totals = np.bincount(weekday, weights=self.columns['energy'][valid], minlength=7)
+        return {WEEKDAYS[day]: round(float(totals[day] / counts[day]), 1) for day in np.flatnonzero(counts)}
+
+    def energy_slope(self, mask: Optional[np.ndarray] = None) -> float:
+        """Least-squares change in energy per day over the selected days"""
+        valid = self.energy_mask(mask)
+        if np.count_nonzero(valid) < 2:
+            return 0.0
+        x = self.columns['days'][valid].astype('float64')
+        y = self.columns['energy'][valid]
+        x = x - x.mean()
+        denominator = (x * x).sum()
+        return float((x * (y - y.mean())).sum() / denominator) if denominator else 0.0
+
+    def completion_rate(self, mask: Optional[np.ndarray] = None) -> float:
+        """Share of daily-note tasks checked off, in percent"""
+        total = self.columns['tasks_total'] if mask is None else self.columns['tasks_total'][mask]
+        done = self.columns['tasks_done'] if mask is None else self.columns['tasks_done'][mask]
+        total_sum = int(total.sum())
+        return float(done.sum()) / total_sum * 100 if total_sum else 0.0
+
+    def streaks(self) -> List[Dict]:
+        """Every run of consecutive daily notes, oldest first"""
+        starts, lengths = day_runs(self.columns['days'])
+        ends = starts + (lengths - 1)
+        return [{'start': str(start), 'end': str(end), 'days': int(length)}
+                for start, end, length in zip(starts, ends, lengths)]
+
+    def missing_day_count(self) -> int:
+        """Missing days between the first and last note, the same days gaps() lists"""
+        _, lengths = day_gaps(self.columns['days'])
+        return int(lengths.sum())
+
+    def gaps(self) -> List[Dict]:
+        """Every stretch of missing daily notes, oldest first"""
+        starts, lengths = day_gaps(self.columns['days'])
+        ends = starts + (lengths - 1)
+        return [{'start': str(start), 'end': str(end), 'days': int(length)}
+                for start, end, length in zip(starts, ends, lengths)]
+
+    def current_streak(self, today: Optional[date] = None) -> int:
+        """Length of the run ending today, 0 when today has no note"""
+        starts, lengths = day_runs(self.columns['days'])
+        if not len(starts):
+            return 0
+        end = np.datetime64(today or date.today(), 'D')
+        return int(lengths[-1]) if starts[-1] + (lengths[-1] - 1) == end else 0
+
+    def longest_streak(self) -> int:
+        """Length of the longest run of consecutive daily notes"""
+        _, lengths = day_runs(self.columns['days'])
+        return int(lengths.max()) if len(lengths) else 0
+
+    def missing_days(self, limit: Optional[int] = None) -> List[str]:
+        """Missing days between the first and last note, newest last; limit keeps the most recent"""
+        starts, lengths = day_gaps(self.columns['days'])
+        if limit is not None:
+            # Only the trailing gaps can contribute to the last `limit` days
+            keep = np.flatnonzero(np.cumsum(lengths[::-1]) >= limit)
+            first = len(lengths) - 1 - keep[0] if len(keep) else 0
+            starts, lengths = starts[first:], lengths[first:]
+        # Expand each (start, length) into its days without a Python loop
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        missing = np.repeat(starts, lengths) + offsets
+        if limit is not None:
+            missing = missing[-limit:] if limit else missing[:0]
+        return [str(day) for day in missing]
+
+    def mood_counts(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Most frequent moods, ties broken by first appearance"""
+        codes = self.columns['mood']
+        codes = codes[codes >= 0]
+        if not len(codes):
+            return []
+        counts = np.bincount(codes, minlength=len(self.moods))
+        first_seen = np.full(len(self.moods), len(codes))
+        unique, first_index = np.unique(codes, return_index=True)
+        first_seen[unique] = first_index
+        order = np.lexsort((first_seen, -counts))
+        return [(self.moods[code], int(counts[code])) for code in order[:limit] if counts[code]]
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Daily Metrics Store")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+
+    args = parser.parse_args()
+
+    metrics = DailyMetrics(VaultIndex(args.vault))
+    summary = metrics.sync()
+    recent = metrics.since(30)
+    print(json.dumps({
+        **summary,
+        'average_energy': metrics.average_energy(),
+        'recent_average_energy': metrics.average_energy(recent),
+        'energy_by_weekday': metrics.weekday_energy(),
+        'completion_rate': round(metrics.completion_rate(), 1),
+        'most_common_moods': metrics.mood_counts()
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
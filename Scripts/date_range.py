@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Date Ranges
+Inclusive day windows for analytics, calendar period shortcuts and splitting a span into periods
+"""
+
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+PERIODS = ('week', 'month', 'quarter', 'year')
+
+# Days before a window's end that count as "recent"
+RECENT_DAYS = 30
+
+# Months per period for the calendar arithmetic in next_period_start
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+
+def parse_day(value) -> Optional[date]:
+    """A date from YYYY-MM-DD text, None for an empty value"""
+    if value is None or value == '':
+        return None
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def period_start(day: date, period: str) -> date:
+    """First day of the calendar week (Monday), month, quarter or year holding day"""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    if period == 'quarter':
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    if period == 'year':
+        return date(day.year, 1, 1)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def next_period_start(start: date, period: str) -> date:
+    """First day of the period following the one that starts on start"""
+    if period == 'week':
+        return start + timedelta(days=7)
+    month = start.month - 1 + PERIOD_MONTHS[period]
+    return date(start.year + month // 12, month % 12 + 1, 1)
+
+
+def period_label(start: date, period: str) -> str:
+    """2024-W07, 2024-02, 2024-Q1 or 2024 for the period starting on start"""
+    if period == 'week':
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == 'month':
+        return start.strftime('%Y-%m')
+    if period == 'quarter':
+        return f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    return str(start.year)
+
+
+class DateRange(NamedTuple):
+    """Inclusive day window; None on either side leaves it open"""
+    since: Optional[date] = None
+    until: Optional[date] = None
+    label: str = ''
+
+    @classmethod
+    def of_period(cls, day: date, period: str, today: Optional[date] = None) -> 'DateRange':
+        """The calendar period holding day, ending no later than today"""
+        start = period_start(day, period)
+        end = next_period_start(start, period) - timedelta(days=1)
+        return cls(start, min(end, today or date.today()), period_label(start, period))
+
+    @property
+    def bounded(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    @property
+    def name(self) -> str:
+        """The period label, or since_until for a custom window"""
+        return self.label or f"{self.since or 'start'}_{self.until or date.today()}"
+
+    def bounds(self) -> Tuple[Optional[str], Optional[str]]:
+        """since and until as ISO day strings for key range scans"""
+        return (self.since.isoformat() if self.since else None,
+                self.until.isoformat() if self.until else None)
+
+    def recent(self, days: int = RECENT_DAYS, today: Optional[date] = None) -> 'DateRange':
+        """The last `days` days up to the window's end (today when open), never before its start"""
+        start = (self.until or today or date.today()) - timedelta(days=days)
+        if self.since is not None and self.since > start:
+            start = self.since
+        return DateRange(start, self.until)
+
+    def split(self, period: str, first_day: Optional[date] = None,
+              today: Optional[date] = None) -> List['DateRange']:
+        """Calendar periods covering the window, clipped to it; an open start begins at first_day"""
+        today = today or date.today()
+        since = self.since or first_day
+        until = self.until or today
+        if since is None:
+            return []
+        windows = []
+        start = period_start(since, period)
+        while start <= until:
+            following = next_period_start(start, period)
+            windows.append(DateRange(max(start, since), min(following - timedelta(days=1), until),
+                                     period_label(start, period)))
+            start = following
+        return windows
+
+
+def resolve_windows(since=None, until=None, period: Optional[str] = None, every: Optional[str] = None,
+                    first_day: Optional[date] = None, today: Optional[date] = None) -> List[DateRange]:
+    """Windows asked for on the command line: a range or the period holding until, optionally split per period"""
+    since, until = parse_day(since), parse_day(until)
+    if since is not None and until is not None and since > until:
+        raise ValueError(f"--since {since} is after --until {until}")
+    if until is not None:
+        # Nothing after today has happened yet; clipping keeps streaks and consistency meaningful
+        until = min(until, today or date.today())
+    if period:
+        window = DateRange.of_period(until or today or date.today(), period, today)
+    else:
+        window = DateRange(since, until)
+    return window.split(every, first_day, today) if every else [window]
+
+
+def add_range_arguments(parser):
+    """--since, --until, --period and --every for commands that analyze a date range"""
+    parser.add_argument('--since', help='First day to analyze (YYYY-MM-DD)')
+    parser.add_argument('--until', help='Last day to analyze (YYYY-MM-DD)')
+    parser.add_argument('--period', choices=PERIODS,
+                        help='Analyze the calendar week, month, quarter or year holding --until (default today)')
+    parser.add_argument('--every', choices=PERIODS,
+                        help='One report per week, month, quarter or year of the range, in one batch')
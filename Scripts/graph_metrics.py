@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Vault Graph Metrics
+Vectorized PageRank, connected components, hub/authority scores and bridge notes
+over the link graph's CSR arrays
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from link_graph import LinkGraph
+
+TOP_N = 10
+
+# bridge_notes builds its spanning forest with one NumPy pass per breadth-first level; graphs
+# deeper than this (long chains of notes) are walked depth-first instead
+MIN_BFS_LEVELS = 64
+NOTES_PER_BFS_LEVEL = 100
+
+
+class GraphMetrics:
+    """Graph analytics over a LinkGraph, cached per index generation"""
+
+    def __init__(self, graph: LinkGraph):
+        self.graph = graph
+        self.db_path = graph.db_path
+        self.db = graph.db
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the metrics cache table if it doesn't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS graph_metrics_cache (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    generation INTEGER,
+                    metrics TEXT
+                )
+            """)
+
+    def compute(self) -> Dict:
+        """Return graph metrics, recomputing only when the index generation moved"""
+        self.graph.load()
+        generation = self.graph.generation
+
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT metrics FROM graph_metrics_cache WHERE id = 1 AND generation = ?",
+                (generation,)
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+
+            metrics = self._compute_all()
+            conn.execute(
+                "INSERT OR REPLACE INTO graph_metrics_cache (id, generation, metrics) VALUES (1, ?, ?)",
+                (generation, json.dumps(metrics))
+            )
+        return metrics
+
+    def _arrays(self):
+        """Forward CSR as NumPy arrays plus the expanded source of every edge"""
+        indptr = np.frombuffer(self.graph.indptr, dtype=np.int64)
+        indices = np.frombuffer(self.graph.indices, dtype=np.int64)
+        out_degree = np.diff(indptr)
+        sources = np.repeat(np.arange(len(out_degree), dtype=np.int64), out_degree)
+        return indptr, indices, sources, out_degree
+
+    def _compute_all(self) -> Dict:
+        """Compute every metric in one pass over the arrays"""
+        node_count = self.graph.node_count
+        if node_count == 0:
+            return {'pagerank': [], 'components': {'count': 0, 'largest': 0, 'isolated': 0},
+                    'hubs': [], 'authorities': [], 'bridge_notes': [], 'bridge_count': 0}
+
+        indptr, indices, sources, out_degree = self._arrays()
+        pagerank = self.pagerank(sources, indices, out_degree, node_count)
+        labels = self.connected_components(sources, indices, node_count)
+        hubs, authorities = self.hits(sources, indices, node_count)
+        bridges = self.bridge_notes(sources, indices, node_count, labels)
+
+        component_sizes = np.bincount(np.unique(labels, return_inverse=True)[1])
+        in_degree = np.bincount(indices, minlength=node_count)
+        degree = out_degree + in_degree
+
+        return {
+            'pagerank': self._top(pagerank),
+            'components': {
+                'count': int(len(component_sizes)),
+                'largest': int(component_sizes.max()),
+                'isolated': int(np.count_nonzero(degree == 0))
+            },
+            'hubs': self._top(hubs),
+            'authorities': self._top(authorities),
+            'bridge_notes': [
+                {'note': self.graph.paths[node], 'degree': int(degree[node])}
+                for node in sorted(bridges, key=lambda node: (-degree[node], self.graph.paths[node]))[:TOP_N]
+            ],
+            'bridge_count': len(bridges)
+        }
+
+    def _top(self, scores: np.ndarray) -> List[Dict]:
+        """Highest scoring notes, ties broken by path order"""
+        # Only notes scoring at least the TOP_N-th best can place, so sort just those
+        candidates = np.arange(len(scores))
+        if len(scores) > TOP_N:
+            candidates = np.flatnonzero(scores >= np.partition(scores, -TOP_N)[-TOP_N])
+        order = candidates[np.lexsort((candidates, -scores[candidates]))][:TOP_N]
+        return [{'note': self.graph.paths[node], 'score': round(float(scores[node]), 6)}
+                for node in order if scores[node] > 0]
+
+    @staticmethod
+    def pagerank(sources: np.ndarray, targets: np.ndarray, out_degree: np.ndarray, node_count: int,
+                 damping: float = 0.85, tolerance: float = 1e-10, max_iterations: int = 100) -> np.ndarray:
+        """Power-iteration PageRank with dangling mass spread uniformly"""
+        rank = np.full(node_count, 1.0 / node_count)
+        dangling = out_degree == 0
+        inverse_degree = np.zeros(node_count)
+        inverse_degree[~dangling] = 1.0 / out_degree[~dangling]
+
+        for _ in range(max_iterations):
+            flow = np.bincount(targets, weights=(rank * inverse_degree)[sources], minlength=node_count)
+            updated = damping * (flow + rank[dangling].sum() / node_count) + (1 - damping) / node_count
+            converged = np.abs(updated - rank).sum() < tolerance
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    @staticmethod
+    def connected_components(sources: np.ndarray, targets: np.ndarray, node_count: int) -> np.ndarray:
+        """Weakly connected component labels (each component's smallest note id) by hooking and pointer jumping"""
+        labels = np.arange(node_count)
+        while True:
+            source_labels, target_labels = labels[sources], labels[targets]
+            crossing = source_labels != target_labels
+            if not crossing.any():
+                return labels
+            source_labels, target_labels = source_labels[crossing], target_labels[crossing]
+            # Hang the larger label under the smaller, then flatten so every label is a root again;
+            # plain min-label propagation needs one pass per hop along a chain of notes
+            np.minimum.at(labels, np.maximum(source_labels, target_labels),
+                          np.minimum(source_labels, target_labels))
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+
+    @staticmethod
+    def hits(sources: np.ndarray, targets: np.ndarray, node_count: int,
+             tolerance: float = 1e-9, max_iterations: int = 100):
+        """Hub and authority scores (HITS), L2-normalized, iterated until no hub score moves by tolerance"""
+        hubs = np.ones(node_count)
+        authorities = np.zeros(node_count)
+        if len(sources) == 0:
+            return np.zeros(node_count), authorities
+
+        for _ in range(max_iterations):
+            authorities = np.bincount(targets, weights=hubs[sources], minlength=node_count)
+            authorities /= np.linalg.norm(authorities) or 1.0
+            updated = np.bincount(sources, weights=authorities[targets], minlength=node_count)
+            updated /= np.linalg.norm(updated) or 1.0
+            # A per-score bound; a summed one tightens with every note added to the vault
+            converged = np.abs(updated - hubs).max() < tolerance
+            hubs = updated
+            if converged:
+                break
+        return hubs, authorities
+
+    @staticmethod
+    def bridge_notes(sources: np.ndarray, targets: np.ndarray, node_count: int,
+                     labels: Optional[np.ndarray] = None) -> List[int]:
+        """Articulation points of the undirected graph: notes whose removal splits a cluster
+
+        labels are the connected_components result when the caller already has it.
+        """
+        # Undirected CSR with duplicate edges removed, via one sort of packed edge keys
+        # (sort plus an adjacent-difference mask; np.unique is several times slower at this size)
+        keys = np.sort(np.concatenate([sources * node_count + targets, targets * node_count + sources]))
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        owners = keys // node_count
+        neighbors = keys % node_count
+        neighbor_ptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=node_count), out=neighbor_ptr[1:])
+
+        if labels is None:
+            labels = GraphMetrics.connected_components(sources, targets, node_count)
+        roots = np.flatnonzero(labels == np.arange(node_count))
+        forest = GraphMetrics._bfs_forest(neighbors, neighbor_ptr, roots,
+                                          max(MIN_BFS_LEVELS, node_count // NOTES_PER_BFS_LEVEL))
+        if forest is None:
+            # Long chains of notes: one NumPy pass per level would cost more than a depth-first walk
+            return GraphMetrics._dfs_cut_vertices(owners, neighbors, neighbor_ptr, node_count)
+        return GraphMetrics._tree_cut_vertices(owners, neighbors, *forest)
+
+    @staticmethod
+    def _bfs_forest(neighbors: np.ndarray, neighbor_ptr: np.ndarray, roots: np.ndarray,
+                    max_levels: int) -> Optional[Tuple[np.ndarray, List[np.ndarray]]]:
+        """Breadth-first forest over the undirected CSR: each node's parent (-1 for roots) and the nodes
+        per level, or None once it is deeper than max_levels"""
+        node_count = len(neighbor_ptr) - 1
+        degree = np.diff(neighbor_ptr)
+        parent = np.full(node_count, -1, dtype=np.int64)
+        visited = np.zeros(node_count, dtype=bool)
+        visited[roots] = True
+        levels = [roots]
+        frontier = roots[degree[roots] > 0]
+
+        while len(frontier):
+            if len(levels) > max_levels:
+                return None
+            # Every adjacency slot of the frontier, gathered in one pass
+            counts = degree[frontier]
+            ends = np.cumsum(counts)
+            positions = np.arange(ends[-1]) + np.repeat(neighbor_ptr[frontier] - ends + counts, counts)
+            reached = neighbors[positions]
+            owner = np.repeat(frontier, counts)
+            fresh = ~visited[reached]
+            reached, owner = reached[fresh], owner[fresh]
+            # Several frontier notes may claim the same note; whichever write lands becomes its parent
+            parent[reached] = owner
+            level = reached[parent[reached] == owner]
+            visited[level] = True
+            levels.append(level)
+            frontier = level[degree[level] > 1]
+        return parent, levels
+
+    @staticmethod
+    def _tree_cut_vertices(owners: np.ndarray, neighbors: np.ndarray, parent: np.ndarray,
+                           levels: List[np.ndarray]) -> List[int]:
+        """Cut vertices from any spanning forest, after Tarjan and Vishkin's biconnectivity algorithm"""
+        node_count = len(parent)
+
+        # Subtree sizes bottom-up, then preorder numbers top-down; each subtree is a contiguous range
+        size = np.ones(node_count, dtype=np.int64)
+        for level in reversed(levels[1:]):
+            np.add.at(size, parent[level], size[level])
+        preorder = np.zeros(node_count, dtype=np.int64)
+        preorder[levels[0]] = np.cumsum(size[levels[0]]) - size[levels[0]]
+        for level in levels[1:]:
+            level = level[np.argsort(parent[level], kind='stable')]
+            ups = parent[level]
+            before = np.cumsum(size[level]) - size[level]
+            first = np.maximum.accumulate(np.where(np.concatenate(([True], ups[1:] != ups[:-1])),
+                                                   np.arange(len(level)), 0))
+            preorder[level] = preorder[ups] + 1 + before - before[first]
+
+        # Lowest and highest preorder a subtree reaches over edges other than its own tree edge
+        reach = preorder[neighbors]
+        tree_edge = neighbors == parent[owners]
+        low = preorder.copy()
+        high = preorder.copy()
+        np.minimum.at(low, owners, np.where(tree_edge, node_count, reach))
+        np.maximum.at(high, owners, np.where(tree_edge, -1, reach))
+        for level in reversed(levels[1:]):
+            np.minimum.at(low, parent[level], low[level])
+            np.maximum.at(high, parent[level], high[level])
+
+        # Tree edges, named by their child, share a block when a subtree reaches outside its
+        # parent's subtree, or when a non-tree edge joins two unrelated subtrees
+        children = np.flatnonzero(parent != -1)
+        ups = parent[children]
+        joined = (parent[ups] != -1) & ((low[children] < preorder[ups]) |
+                                        (high[children] >= preorder[ups] + size[ups]))
+        cross = (preorder[owners] < reach) & (reach >= preorder[owners] + size[owners])
+        blocks = GraphMetrics.connected_components(np.concatenate([children[joined], owners[cross]]),
+                                                   np.concatenate([ups[joined], neighbors[cross]]),
+                                                   node_count)
+
+        # A note is a cut vertex when its tree edges fall into two or more blocks
+        members = np.sort(np.concatenate([ups * node_count + blocks[children],
+                                          children * node_count + blocks[children]]))
+        members = members[np.concatenate(([True], members[1:] != members[:-1]))] if len(members) else members
+        return np.flatnonzero(np.bincount(members // node_count, minlength=node_count) > 1).tolist()
+
+    @staticmethod
+    def _dfs_cut_vertices(owners: np.ndarray, neighbors: np.ndarray, neighbor_ptr: np.ndarray,
+                          node_count: int) -> List[int]:
+        """Cut vertices from Tarjan's low-link values over a depth-first forest"""
+        parent_list, order = GraphMetrics._dfs_forest(neighbors.tolist(), neighbor_ptr.tolist(), node_count)
+        parent = np.array(parent_list, dtype=np.int64)
+        discovery = np.zeros(node_count, dtype=np.int64)
+        discovery[order] = np.arange(len(order))
+
+        # Earliest discovery reachable over one edge other than the tree edge to the parent
+        reach = discovery[neighbors]
+        reach[neighbors == parent[owners]] = node_count
+        low = discovery.copy()
+        linked = np.flatnonzero(np.diff(neighbor_ptr))
+        if len(linked):
+            low[linked] = np.minimum(low[linked], np.minimum.reduceat(reach, neighbor_ptr[linked]))
+
+        # Children hand their low value to their parent; reverse discovery order visits children first
+        low_list = low.tolist()
+        for node in reversed(order):
+            up = parent_list[node]
+            if up != -1 and low_list[node] < low_list[up]:
+                low_list[up] = low_list[node]
+        low = np.array(low_list, dtype=np.int64)
+
+        # A non-root is a cut vertex when some child cannot reach above it; a root when it has two children
+        children = np.flatnonzero(parent != -1)
+        ups = parent[children]
+        is_root = parent[ups] == -1
+        cut = ups[~is_root & (low[children] >= discovery[ups])]
+        split_roots = np.flatnonzero(np.bincount(ups[is_root], minlength=node_count) > 1)
+        return np.union1d(cut, split_roots).tolist()
+
+    @staticmethod
+    def _dfs_forest(neighbors: List[int], neighbor_ptr: List[int], node_count: int) -> Tuple[List[int], List[int]]:
+        """Depth-first forest over the undirected CSR: each node's parent (-1 for roots) and the discovery order"""
+        parent = [-1] * node_count
+        seen = [False] * node_count
+        order = []
+
+        # One neighbor iterator per node on the path, so each edge is looked at once
+        for root in range(node_count):
+            if seen[root] or neighbor_ptr[root] == neighbor_ptr[root + 1]:
+                continue
+            seen[root] = True
+            order.append(root)
+            path = [root]
+            pending = [iter(neighbors[neighbor_ptr[root]:neighbor_ptr[root + 1]])]
+            while pending:
+                for child in pending[-1]:
+                    if not seen[child]:
+                        seen[child] = True
+                        parent[child] = path[-1]
+                        order.append(child)
+                        path.append(child)
+                        pending.append(iter(neighbors[neighbor_ptr[child]:neighbor_ptr[child + 1]]))
+                        break
+                else:
+                    pending.pop()
+                    path.pop()
+        return parent, order
+
+def main():
+    """Main execution function"""
+    import argparse
+    from vault_index import VaultIndex
+
+    parser = argparse.ArgumentParser(description="Vault Graph Metrics")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+
+    args = parser.parse_args()
+
+    metrics = GraphMetrics(LinkGraph(VaultIndex(args.vault))).compute()
+    print(json.dumps(metrics, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Vault Instrumentation
+Nested timing spans counting files, bytes and rows per stage, printed as a tree and kept in claude_evolution.db
+"""
+
+import functools
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+COUNTERS = ('files', 'bytes', 'rows')
+
+_enabled = False
+_local = threading.local()
+_root: Optional['Span'] = None
+_finished: List['Span'] = []
+
+
+class Span:
+    """One timed stage with its own counters and nested child stages"""
+
+    __slots__ = ('name', 'children', 'counters', 'start', 'elapsed')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.children: List[Span] = []
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def total(self, counter: str) -> int:
+        """Counter value for this span including every descendant"""
+        return self.counters[counter] + sum(child.total(counter) for child in self.children)
+
+    def walk(self, depth: int = 0, path: str = '') -> Iterator[tuple]:
+        """Yield (depth, path, span) for this span and its descendants, depth first"""
+        path = f"{path}/{self.name}" if path else self.name
+        yield depth, path, self
+        for child in self.children:
+            yield from child.walk(depth + 1, path)
+
+
+def enable():
+    """Start recording spans; until then span() and timed() cost almost nothing"""
+    global _enabled
+    _enabled = True
+
+
+def enabled() -> bool:
+    """Whether spans are being recorded"""
+    return _enabled
+
+
+def current() -> Optional[Span]:
+    """The innermost open span on this thread, for handing to worker threads"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def span(name: str, parent: Optional[Span] = None):
+    """Time a block as a child of the current span (or of `parent` in a worker thread)"""
+    global _root
+    if not _enabled:
+        yield None
+        return
+
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    # Threads without their own stack hang their spans off the open top-level span
+    parent = parent or (stack[-1] if stack else _root)
+
+    stage = Span(name)
+    if parent is not None:
+        parent.children.append(stage)
+    elif _root is None:
+        _root = stage
+    stack.append(stage)
+    try:
+        yield stage
+    finally:
+        stage.elapsed = time.perf_counter() - stage.start
+        stack.pop()
+        if parent is None:
+            _finished.append(stage)
+            if _root is stage:
+                _root = None
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of a function as a span named after it"""
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(files: int = 0, bytes: int = 0, rows: int = 0):
+    """Add file, byte and row counts to the current span"""
+    if not _enabled:
+        return
+    stage = current() or _root
+    if stage is not None:
+        stage.counters['files'] += files
+        stage.counters['bytes'] += bytes
+        stage.counters['rows'] += rows
+
+
+class CountingCursor(sqlite3.Cursor):
+    """Cursor that counts the rows it hands back against the current span"""
+
+    def __next__(self):
+        row = super().__next__()
+        count(rows=1)
+        return row
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            count(rows=1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        count(rows=len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        count(rows=len(rows))
+        return rows
+
+
+class CountingConnection(sqlite3.Connection):
+    """Connection whose queries return CountingCursor objects"""
+
+    def cursor(self, factory=CountingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def report(spans: Optional[List[Span]] = None) -> str:
+    """Breakdown tree of finished spans with inclusive wall time and counters"""
+    spans = _finished if spans is None else spans
+    rows = []
+    for top in spans:
+        for depth, _, stage in top.walk():
+            rows.append(("  " * depth + stage.name, stage))
+    if not rows:
+        return "No timings recorded"
+
+    width = max(len(label) for label, _ in rows)
+    lines = [f"{'Stage':<{width}}  {'wall ms':>10}  {'files':>7}  {'bytes':>10}  {'rows':>8}"]
+    for label, stage in rows:
+        lines.append(f"{label:<{width}}  {stage.elapsed * 1000:>10.1f}  {stage.total('files'):>7}  "
+                     f"{_format_bytes(stage.total('bytes')):>10}  {stage.total('rows'):>8}")
+    return "\n".join(lines)
+
+
+def save(db, spans: Optional[List[Span]] = None) -> int:
+    """Queue one instrumentation row per span on a VaultDB and return how many"""
+    spans = _finished if spans is None else spans
+    with db.connection() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS instrumentation (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT,
+                recorded DATETIME DEFAULT CURRENT_TIMESTAMP,
+                stage TEXT,
+                depth INTEGER,
+                wall_ms REAL,
+                files INTEGER,
+                bytes INTEGER,
+                rows INTEGER
+            )
+        """)
+
+    run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    saved = 0
+    for top in spans:
+        for depth, path, stage in top.walk():
+            # Counters are stored per stage so sums over a run never double count
+            db.enqueue(
+                "INSERT INTO instrumentation (run_id, stage, depth, wall_ms, files, bytes, rows) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, path, depth, round(stage.elapsed * 1000, 3),
+                 stage.counters['files'], stage.counters['bytes'], stage.counters['rows'])
+            )
+            saved += 1
+    db.flush()
+    return saved
+
+
+def finish(db_path) -> int:
+    """Print the timing tree to stderr and store it in the vault database"""
+    from vault_db import VaultDB
+
+    print(report(), file=sys.stderr)
+    saved = 0
+    try:
+        saved = save(VaultDB.shared(Path(db_path)))
+    except sqlite3.Error as e:
+        print(f"Error saving timings: {e}", file=sys.stderr)
+    _finished.clear()
+    return saved
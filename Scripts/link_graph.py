@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Vault Link Graph
+Resolved [[wiki link]] graph with backlinks, stored as interned CSR arrays
+"""
+
+import json
+import sqlite3
+from array import array
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from vault_index import VaultIndex
+from instrumentation import timed
+
+CURSOR_NAME = 'links'
+
+# Past this share of notes rewritten since the stored arrays, a full rebuild beats patching rows
+MAX_PATCH_FRACTION = 0.25
+
+
+def normalize_target(raw_link: str) -> str:
+    """Reduce [[folder/Note#Heading|Alias]] to the lookup key 'folder/note'"""
+    target = raw_link.split('|', 1)[0].split('#', 1)[0].split('^', 1)[0].strip()
+    if target.lower().endswith('.md'):
+        target = target[:-3]
+    return target.replace('\\', '/').strip('/').lower()
+
+
+def resolution_keys(path: str) -> List[str]:
+    """Every key a link may use to reach a note: its stem and each trailing path"""
+    parts = (path[:-3] if path.endswith('.md') else path).lower().split('/')
+    return ['/'.join(parts[i:]) for i in range(len(parts) - 1, -1, -1)]
+
+
+def to_array(values: np.ndarray) -> array:
+    """Copy an int64 NumPy array into the array('q') form the graph keeps and stores"""
+    packed = array('q')
+    packed.frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+    return packed
+
+
+def pack_csr(rows: np.ndarray, columns: np.ndarray, node_count: int) -> Tuple[array, array]:
+    """CSR row pointers and column ids for unique (row, column) pairs, each row's columns ascending"""
+    keys = np.sort(rows * node_count + columns)
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // node_count, minlength=node_count), out=indptr[1:])
+    return to_array(indptr), to_array(keys % node_count)
+
+
+class LinkGraph:
+    """Incrementally maintained link graph over the vault index"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+        self.db_path = index.db_path
+        self.db = index.db
+        self.paths: List[str] = []
+        self.node_ids: Dict[str, int] = {}
+        self.indptr = array('q', [0])
+        self.indices = array('q')
+        self.rev_indptr = array('q', [0])
+        self.rev_indices = array('q')
+        self.unresolved = 0
+        self.unresolved_counts = array('q')
+        self.generation = -1
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the link tables if they don't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS link_edges (
+                    src_path TEXT,
+                    target TEXT,
+                    PRIMARY KEY (src_path, target)
+                ) WITHOUT ROWID
+            """)
+
+            # Finds the notes whose links a newly added or removed note may now resolve
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_link_edges_target ON link_edges (target)")
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS link_csr (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    generation INTEGER,
+                    paths TEXT,
+                    indptr BLOB,
+                    indices BLOB,
+                    rev_indptr BLOB,
+                    rev_indices BLOB,
+                    unresolved INTEGER,
+                    unresolved_counts BLOB
+                )
+            """)
+
+            # Arrays stored before patching kept only the total unresolved count
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(link_csr)")}
+            if 'unresolved_counts' not in columns:
+                conn.execute("ALTER TABLE link_csr ADD COLUMN unresolved_counts BLOB")
+
+    @timed()
+    def sync(self) -> Dict:
+        """Apply index changes since the last sync to the stored edge list"""
+        cursor = self.index.get_cursor(CURSOR_NAME)
+        changed, removed, generation = self.index.snapshot_changes(cursor)
+
+        with self.db.connection() as conn:
+            if cursor == 0:
+                # First sync: the change feed holds every note
+                conn.execute("DELETE FROM link_edges")
+                conn.execute("DELETE FROM link_csr")
+
+            stale = [(path,) for path in removed] + [(note['path'],) for note in changed]
+            conn.executemany("DELETE FROM link_edges WHERE src_path = ?", stale)
+
+            edges = []
+            for note in changed:
+                targets = {normalize_target(link) for link in note['links']}
+                edges.extend((note['path'], target) for target in sorted(targets) if target)
+            conn.executemany("INSERT OR IGNORE INTO link_edges (src_path, target) VALUES (?, ?)", edges)
+
+            self.index.set_cursor(CURSOR_NAME, generation, conn)
+
+        return {'changed_notes': len(changed), 'removed_notes': len(removed), 'edges_written': len(edges)}
+
+    @timed()
+    def load(self) -> 'LinkGraph':
+        """Bring the graph up to date, reusing the stored CSR arrays and patching the rows of changed notes"""
+        self.sync()
+        # The generation the stored edges reflect, not the live one a concurrent refresh may have moved
+        generation = self.index.get_cursor(CURSOR_NAME)
+        if generation == self.generation:
+            return self
+
+        with self.db.connection() as conn:
+            row = conn.execute("""
+                SELECT generation, paths, indptr, indices, rev_indptr, rev_indices, unresolved_counts
+                FROM link_csr WHERE id = 1
+            """).fetchone()
+
+            if row and row[0] == generation and row[6] is not None:
+                self._load_arrays(*row[1:])
+            else:
+                if not (row and self._patch(conn, *row)):
+                    self._build(conn)
+                conn.execute("""
+                    INSERT OR REPLACE INTO link_csr (id, generation, paths, indptr, indices,
+                                                     rev_indptr, rev_indices, unresolved, unresolved_counts)
+                    VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (generation, json.dumps(self.paths), self.indptr.tobytes(), self.indices.tobytes(),
+                      self.rev_indptr.tobytes(), self.rev_indices.tobytes(), self.unresolved,
+                      self.unresolved_counts.tobytes()))
+
+        self.generation = generation
+        return self
+
+    def _load_arrays(self, paths: str, indptr: bytes, indices: bytes,
+                     rev_indptr: bytes, rev_indices: bytes, unresolved_counts: bytes):
+        """Restore the interned node list and CSR arrays from their stored form"""
+        self.paths = json.loads(paths)
+        self.node_ids = {path: node for node, path in enumerate(self.paths)}
+        for name, blob in (('indptr', indptr), ('indices', indices), ('rev_indptr', rev_indptr),
+                           ('rev_indices', rev_indices), ('unresolved_counts', unresolved_counts)):
+            values = array('q')
+            values.frombytes(blob)
+            setattr(self, name, values)
+        self.unresolved = sum(self.unresolved_counts)
+
+    def _build(self, conn: sqlite3.Connection):
+        """Resolve stored link targets to note ids and pack both directions as CSR"""
+        self.paths = [path for path, in conn.execute("SELECT path FROM note_index ORDER BY path")]
+        self.node_ids = {path: node for node, path in enumerate(self.paths)}
+
+        edges = conn.execute("SELECT src_path, target FROM link_edges").fetchall()
+        resolver = self._resolve_keys({target for _, target in edges})
+        sources = np.array([self.node_ids.get(src_path, -1) for src_path, _ in edges], dtype=np.int64)
+        targets = np.array([resolver.get(target, -1) for _, target in edges], dtype=np.int64)
+        self._pack(sources, targets)
+
+    def _patch(self, conn: sqlite3.Connection, generation: int, paths: str, indptr: bytes, indices: bytes,
+               rev_indptr: bytes, rev_indices: bytes, unresolved_counts: Optional[bytes]) -> bool:
+        """Update arrays stored at an earlier generation instead of rebuilding them
+
+        Only notes written since then, and notes whose links name a note added or removed since
+        then, are resolved again; every other row is kept and renumbered. False when so many
+        notes are affected that a full build is cheaper.
+        """
+        if unresolved_counts is None:
+            return False
+        self._load_arrays(paths, indptr, indices, rev_indptr, rev_indices, unresolved_counts)
+        current = [path for path, in conn.execute("SELECT path FROM note_index ORDER BY path")]
+        node_ids = {path: node for node, path in enumerate(current)}
+        affected = {path for path, in conn.execute("SELECT path FROM note_index WHERE seq > ?", (generation,))}
+
+        # An added or removed note can take over or give up any key that reaches it
+        moved = [path for path in current if path not in self.node_ids]
+        moved += [path for path in self.paths if path not in node_ids]
+        keys = sorted({key for path in moved for key in resolution_keys(path)})
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            affected.update(src_path for src_path, in conn.execute(
+                f"SELECT src_path FROM link_edges WHERE target IN ({','.join('?' * len(chunk))})", chunk))
+        affected &= node_ids.keys()
+        if len(affected) > MAX_PATCH_FRACTION * len(current):
+            return False
+
+        # Renumber the kept rows, dropping the affected notes and anything pointing at removed ones
+        renumber = np.array([node_ids.get(path, -1) for path in self.paths], dtype=np.int64)
+        old_sources = renumber[np.repeat(np.arange(len(self.paths), dtype=np.int64),
+                                         np.diff(np.frombuffer(self.indptr, dtype=np.int64)))]
+        old_targets = renumber[np.frombuffer(self.indices, dtype=np.int64)]
+        rewritten = np.zeros(len(current), dtype=bool)
+        rewritten[[node_ids[path] for path in affected]] = True
+        kept = (old_sources >= 0) & (old_targets >= 0)
+        kept[kept] = ~rewritten[old_sources[kept]]
+        counts = np.zeros(len(current), dtype=np.int64)
+        survivors = renumber >= 0
+        counts[renumber[survivors]] = np.frombuffer(self.unresolved_counts, dtype=np.int64)[survivors]
+        counts[rewritten] = 0
+
+        self.paths, self.node_ids = current, node_ids
+        links = [(node_ids[src_path], target) for src_path in sorted(affected) for target, in conn.execute(
+            "SELECT target FROM link_edges WHERE src_path = ?", (src_path,))]
+        resolver = self._resolve_keys({target for _, target in links})
+        new_sources = np.array([src for src, _ in links], dtype=np.int64)
+        new_targets = np.array([resolver.get(target, -1) for _, target in links], dtype=np.int64)
+        self._pack(np.concatenate([old_sources[kept], new_sources]),
+                   np.concatenate([old_targets[kept], new_targets]), counts)
+        return True
+
+    def _resolve_keys(self, keys: Set[str]) -> Dict[str, int]:
+        """Node ids for these link keys; the shallowest matching note wins, then the first in path order,
+        mirroring Obsidian's nearest-match resolution"""
+        names = {key[key.rfind('/') + 1:] for key in keys}
+        candidates: Dict[str, List[Tuple[int, str, int]]] = {}
+        for node, path in enumerate(self.paths):
+            stem = (path[:-3] if path.endswith('.md') else path).lower()
+            name = stem[stem.rfind('/') + 1:]
+            if name in names:
+                candidates.setdefault(name, []).append((stem.count('/'), stem, node))
+
+        resolver: Dict[str, int] = {}
+        for name, matches in candidates.items():
+            # Path order already holds within each depth, so a stable sort on depth ranks them
+            matches.sort(key=lambda match: match[0])
+            if name in keys:
+                resolver[name] = matches[0][2]
+        for key in [key for key in keys if '/' in key]:
+            suffix = '/' + key
+            for _, stem, node in candidates.get(key[key.rfind('/') + 1:], ()):
+                if stem == key or stem.endswith(suffix):
+                    resolver[key] = node
+                    break
+        return resolver
+
+    def _pack(self, sources: np.ndarray, targets: np.ndarray, unresolved_counts: Optional[np.ndarray] = None):
+        """Store resolved edges as forward and backlink CSR, counting unresolved targets per note
+
+        A source of -1 is not a note in the graph and a target of -1 did not resolve.
+        """
+        node_count = len(self.paths)
+        known = sources >= 0
+        if unresolved_counts is None:
+            unresolved_counts = np.zeros(node_count, dtype=np.int64)
+        unresolved_counts += np.bincount(sources[known & (targets < 0)], minlength=node_count)
+        self.unresolved_counts = to_array(unresolved_counts)
+        self.unresolved = int(unresolved_counts.sum())
+
+        # Self-links are dropped and duplicates (two keys reaching one note) collapse
+        linked = known & (targets >= 0) & (targets != sources)
+        keys = np.sort(sources[linked] * node_count + targets[linked])
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        sources, targets = keys // node_count, keys % node_count
+        self.indptr, self.indices = pack_csr(sources, targets, node_count)
+        self.rev_indptr, self.rev_indices = pack_csr(targets, sources, node_count)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.paths)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def out_degree(self, path: str) -> int:
+        node = self.node_ids[path]
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def in_degree(self, path: str) -> int:
+        node = self.node_ids[path]
+        return self.rev_indptr[node + 1] - self.rev_indptr[node]
+
+    def outlinks(self, path: str) -> List[str]:
+        """Notes this note links to"""
+        node = self.node_ids[path]
+        return [self.paths[dst] for dst in self.indices[self.indptr[node]:self.indptr[node + 1]]]
+
+    def backlinks(self, path: str) -> List[str]:
+        """Notes linking to this note"""
+        node = self.node_ids[path]
+        return [self.paths[src] for src in self.rev_indices[self.rev_indptr[node]:self.rev_indptr[node + 1]]]
+
+    def orphans(self) -> List[str]:
+        """Notes with no resolved links in either direction"""
+        return [
+            path for node, path in enumerate(self.paths)
+            if self.indptr[node] == self.indptr[node + 1]
+            and self.rev_indptr[node] == self.rev_indptr[node + 1]
+        ]
+
+    def most_connected(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Notes ranked by total resolved degree (in + out)"""
+        degrees = [
+            (path, (self.indptr[node + 1] - self.indptr[node]) +
+                   (self.rev_indptr[node + 1] - self.rev_indptr[node]))
+            for node, path in enumerate(self.paths)
+        ]
+        degrees.sort(key=lambda item: (-item[1], item[0]))
+        return degrees[:limit]
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Link Graph")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--backlinks', help='Show backlinks for a note path')
+    parser.add_argument('--orphans', action='store_true', help='List orphaned notes')
+
+    args = parser.parse_args()
+
+    graph = LinkGraph(VaultIndex(args.vault)).load()
+
+    if args.backlinks:
+        print(json.dumps(graph.backlinks(args.backlinks), indent=2))
+    elif args.orphans:
+        print(json.dumps(graph.orphans(), indent=2))
+    else:
+        print(json.dumps({
+            'notes': graph.node_count,
+            'links': graph.edge_count,
+            'unresolved_links': graph.unresolved,
+            'orphans': len(graph.orphans()),
+            'most_connected': graph.most_connected()
+        }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Note Extractor Pipeline
+Reads each note once and runs every registered extractor over its content
+"""
+
+import re
+import json
+from typing import Callable, Dict, Optional, Tuple
+
+TAG_PATTERN = re.compile(r'#(\w[\w/-]*)')
+LINK_PATTERN = re.compile(r'\[\[([^\]]+)\]\]')
+TASK_PATTERN = re.compile(r'- \[([x ])\] (.+)')
+DUE_PATTERN = re.compile(r'(?:📅|\bdue(?:-date)?::?)\s*(\d{4}-\d{2}-\d{2})', re.IGNORECASE)
+ENERGY_PATTERN = re.compile(r'Energy level:\s*(\d+)/10')
+MOOD_PATTERN = re.compile(r'Mood:\s*([^\n]+)')
+SESSION_TYPE_PATTERN = re.compile(r'#session/(\w+)')
+DURATION_PATTERN = re.compile(r'Duration:\s*(\d+)')
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+DAILY_NOTE_PATTERN = re.compile('|'.join([
+    r'morning\s+intentions?',
+    r'daily\s+tasks?',
+    r'evening\s+reflection',
+    r'gratitude',
+    r'today(?:\s|\')?s?\s+(?:goals?|priorities?|focus)'
+]), re.IGNORECASE)
+
+EXCERPT_LENGTH = 1000
+
+# Bump when an existing extractor changes its output so indexes re-parse
+EXTRACTOR_VERSION = 1
+
+EXTRACTORS: Dict[str, Callable[[Dict], object]] = {}
+
+_frontmatter_module = None
+
+
+def _load_frontmatter():
+    """Import python-frontmatter on first use; it pulls in PyYAML, which is slow to load"""
+    global _frontmatter_module
+    if _frontmatter_module is None:
+        try:
+            import frontmatter
+            _frontmatter_module = frontmatter
+        except ImportError:
+            _frontmatter_module = False
+    return _frontmatter_module
+
+
+def register_extractor(name: str):
+    """Register a function that derives one field from a note"""
+    def decorator(func: Callable[[Dict], object]):
+        EXTRACTORS[name] = func
+        return func
+    return decorator
+
+
+def extractor_signature() -> str:
+    """Identify the registered extractor set so stale index rows can be detected"""
+    return f"{EXTRACTOR_VERSION}:{','.join(sorted(EXTRACTORS))}"
+
+
+def split_frontmatter(content: str) -> Tuple[Dict, str]:
+    """Split a note into its frontmatter metadata and body"""
+    if not content.startswith('---'):
+        return {}, content
+
+    frontmatter = _load_frontmatter()
+    if frontmatter:
+        try:
+            post = frontmatter.loads(content)
+            return dict(post.metadata), post.content
+        except Exception:
+            return {}, content
+
+    # Minimal "key: value" fallback when python-frontmatter is unavailable
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return {}, content
+
+    metadata = {}
+    for line in match.group(1).splitlines():
+        if ':' in line and not line.startswith((' ', '-')):
+            key, value = line.split(':', 1)
+            metadata[key.strip()] = value.strip().strip('"\'')
+    return metadata, content[match.end():]
+
+
+def run_extractors(content: str, extractors: Optional[Dict[str, Callable]] = None) -> Dict:
+    """Run every extractor over a single read of the note content"""
+    metadata, body = split_frontmatter(content)
+    note = {'content': content, 'body': body, 'frontmatter': metadata}
+
+    return {
+        name: extractor(note)
+        for name, extractor in (extractors or EXTRACTORS).items()
+    }
+
+
+@register_extractor('frontmatter')
+def extract_frontmatter(note: Dict) -> Dict:
+    """Frontmatter metadata, normalized to JSON-safe values"""
+    return json.loads(json.dumps(note['frontmatter'], default=str))
+
+
+@register_extractor('tags')
+def extract_tags(note: Dict) -> list:
+    """Inline #tags, including nested tags such as status/pending"""
+    return TAG_PATTERN.findall(note['content'])
+
+
+@register_extractor('links')
+def extract_links(note: Dict) -> list:
+    """Raw [[wiki link]] targets"""
+    return LINK_PATTERN.findall(note['content'])
+
+
+@register_extractor('tasks')
+def extract_tasks(note: Dict) -> list:
+    """Checkbox tasks as [status, text] pairs"""
+    return [[status, text] for status, text in TASK_PATTERN.findall(note['content'])]
+
+
+@register_extractor('task_items')
+def extract_task_items(note: Dict) -> list:
+    """Tasks with position and nesting as [line, depth, parent line, status, text, due date]"""
+    items = []
+    open_parents = []  # (indent, line) of the enclosing tasks
+    for line_number, line in enumerate(note['content'].splitlines(), 1):
+        match = TASK_PATTERN.search(line)
+        if not match:
+            continue
+        indent = len(line.expandtabs(4)) - len(line.expandtabs(4).lstrip())
+        while open_parents and open_parents[-1][0] >= indent:
+            open_parents.pop()
+        parent = open_parents[-1][1] if open_parents else None
+        due = DUE_PATTERN.search(match.group(2))
+        items.append([line_number, len(open_parents), parent, match.group(1), match.group(2),
+                      due.group(1) if due else None])
+        open_parents.append((indent, line_number))
+    return items
+
+
+@register_extractor('energy')
+def extract_energy(note: Dict) -> Optional[int]:
+    """Energy level from "Energy level: X/10" """
+    match = ENERGY_PATTERN.search(note['content'])
+    return int(match.group(1)) if match else None
+
+
+@register_extractor('mood')
+def extract_mood(note: Dict) -> Optional[str]:
+    """Mood from "Mood: ..." """
+    match = MOOD_PATTERN.search(note['content'])
+    return match.group(1).strip() if match else None
+
+
+@register_extractor('session_type')
+def extract_session_type(note: Dict) -> Optional[str]:
+    """Session type from a #session/<type> tag"""
+    match = SESSION_TYPE_PATTERN.search(note['content'])
+    return match.group(1) if match else None
+
+
+@register_extractor('duration')
+def extract_duration(note: Dict) -> Optional[int]:
+    """Session duration in minutes from "Duration: N" """
+    match = DURATION_PATTERN.search(note['content'])
+    return int(match.group(1)) if match else None
+
+
+@register_extractor('daily_markers')
+def extract_daily_markers(note: Dict) -> bool:
+    """Whether the body anywhere uses daily-note headings such as "Morning intentions" """
+    return bool(DAILY_NOTE_PATTERN.search(note['body']))
+
+
+@register_extractor('excerpt')
+def extract_excerpt(note: Dict) -> str:
+    """Leading body text used for content-based classification"""
+    return note['body'][:EXCERPT_LENGTH]
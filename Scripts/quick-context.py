@@ -6,6 +6,7 @@ Quick Context Loader - Simple version without Unicode issues
 from pathlib import Path
 from datetime import datetime, date
 import json
+from vault_walker import list_folder
 
 def generate_quick_context(vault_path: str) -> str:
     """Generate simple context summary"""
@@ -14,7 +15,7 @@ def generate_quick_context(vault_path: str) -> str:
     
     # Get basic info
     daily_file = vault / "01-Daily" / f"{today.isoformat()}.md"
-    projects = list((vault / "04-Projects").glob('*.md')) if (vault / "04-Projects").exists() else []
+    projects = list(list_folder(vault, "04-Projects"))
     
     context = f"""# Claude Context Summary - {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
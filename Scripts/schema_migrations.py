@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Claude Evolution Schema Migrations
+Versioned upgrades for claude_evolution.db tracked in PRAGMA user_version
+"""
+
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# Each entry upgrades the schema by one version; append only, never edit
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    ("Core tracking tables", [
+        """
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            session_id TEXT,
+            message_count INTEGER,
+            topics TEXT,
+            personality_traits TEXT,
+            user_satisfaction INTEGER,
+            model_version TEXT,
+            context_quality INTEGER,
+            response_time REAL,
+            creativity_score INTEGER,
+            technical_accuracy INTEGER
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS personality_evolution (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            trait_name TEXT,
+            trait_value REAL,
+            confidence_level REAL,
+            context TEXT,
+            model_version TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ai_todos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_date DATE,
+            todo_text TEXT,
+            importance INTEGER,
+            category TEXT,
+            status TEXT DEFAULT 'pending',
+            due_date DATE,
+            completion_date DATE,
+            notes TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS context_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            context_type TEXT,
+            context_data TEXT,
+            model_version TEXT,
+            effectiveness_score INTEGER
+        )
+        """,
+    ]),
+    ("Covering indexes for context and report queries", [
+        # Recent-trait averages: range on timestamp, read trait and value from the index
+        """
+        CREATE INDEX IF NOT EXISTS idx_personality_timestamp
+        ON personality_evolution (timestamp, trait_name, trait_value)
+        """,
+        # Pending todos by importance: equality on status, rows already in ORDER BY order
+        """
+        CREATE INDEX IF NOT EXISTS idx_ai_todos_status
+        ON ai_todos (status, importance DESC, created_date DESC, todo_text, category, due_date)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON conversations (timestamp)",
+        "ANALYZE",
+    ]),
+    ("Persistent change counter for cache invalidation", [
+        """
+        CREATE TABLE IF NOT EXISTS db_changes (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            value INTEGER
+        )
+        """,
+        "INSERT OR IGNORE INTO db_changes (id, value) VALUES (1, 0)",
+    ] + [
+        # PRAGMA data_version only compares within one connection; this survives restarts
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()} AFTER {event} ON {table}
+        BEGIN
+            UPDATE db_changes SET value = value + 1 WHERE id = 1;
+        END
+        """
+        for table in ('conversations', 'personality_evolution', 'ai_todos')
+        for event in ('INSERT', 'UPDATE', 'DELETE')
+    ]),
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+# The hot queries the indexes were designed for, as issued by the scripts
+BENCHMARK_QUERIES = {
+    'recent_traits': ("""
+        SELECT trait_name, AVG(trait_value) as avg_value
+        FROM personality_evolution
+        WHERE timestamp >= date('now', '-7 days')
+        GROUP BY trait_name
+    """, ()),
+    'pending_todos': ("""
+        SELECT todo_text, importance, category, due_date
+        FROM ai_todos
+        WHERE status = ?
+        ORDER BY importance DESC, created_date DESC
+        LIMIT ?
+    """, ('pending', 10)),
+}
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in the database header"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[str]:
+    """Apply pending migrations in order, one transaction each; returns what ran"""
+    target = LATEST_VERSION if target is None else target
+    applied = []
+
+    conn.commit()
+    for version in range(schema_version(conn) + 1, target + 1):
+        description, statements = MIGRATIONS[version - 1]
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append(f"v{version}: {description}")
+    return applied
+
+
+def _populate(conn: sqlite3.Connection, rows: int):
+    """Fill the benchmark database with a year of synthetic tracking data"""
+    rng = random.Random(42)
+    now = datetime.now()
+    traits = ['Analytical Style', 'Creativity', 'Directness', 'Empathy', 'Technical Accuracy']
+    statuses = ['pending'] * 3 + ['completed'] * 6 + ['cancelled']
+
+    conn.executemany(
+        "INSERT INTO personality_evolution (timestamp, trait_name, trait_value) VALUES (?, ?, ?)",
+        [((now - timedelta(minutes=rng.randrange(525600))).strftime('%Y-%m-%d %H:%M:%S'),
+          rng.choice(traits), rng.uniform(1, 10)) for _ in range(rows)]
+    )
+    conn.executemany(
+        "INSERT INTO ai_todos (created_date, todo_text, importance, category, status) VALUES (?, ?, ?, ?, ?)",
+        [((now - timedelta(days=rng.randrange(365))).strftime('%Y-%m-%d'), f"Todo {i}",
+          rng.randint(1, 3), 'general', rng.choice(statuses)) for i in range(rows)]
+    )
+    conn.commit()
+
+
+def _measure(conn: sqlite3.Connection, repeat: int) -> List[Tuple[str, List[str], float]]:
+    """Query plan and mean runtime in milliseconds for every benchmark query"""
+    results = []
+    for name, (sql, params) in BENCHMARK_QUERIES.items():
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, params).fetchall()
+        results.append((name, plan, (time.perf_counter() - start) * 1000 / repeat))
+    return results
+
+
+def benchmark(rows: int = 100000, repeat: int = 20) -> str:
+    """Compare query plans and timings before and after the index migration"""
+    conn = sqlite3.connect(":memory:")
+    migrate(conn, target=1)
+    _populate(conn, rows)
+
+    before = _measure(conn, repeat)
+    migrate(conn)
+    after = _measure(conn, repeat)
+
+    lines = [f"Benchmark: {rows} rows per table, {repeat} runs per query", ""]
+    for (name, old_plan, old_ms), (_, new_plan, new_ms) in zip(before, after):
+        lines.append(f"## {name}")
+        lines.append(f"Before ({old_ms:.2f} ms):")
+        lines.extend(f"  {step}" for step in old_plan)
+        lines.append(f"After ({new_ms:.2f} ms):")
+        lines.extend(f"  {step}" for step in new_plan)
+        lines.append(f"Speedup: {old_ms / new_ms:.1f}x" if new_ms else "Speedup: n/a")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    """Main execution function"""
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Claude Evolution Schema Migrations")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Show query plans and timings before and after indexing (synthetic data)')
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic rows per table for --benchmark')
+
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(benchmark(args.rows))
+        return
+
+    with sqlite3.connect(Path(args.vault) / "claude_evolution.db") as conn:
+        previous = schema_version(conn)
+        applied = migrate(conn)
+
+    if applied:
+        print(f"Upgraded schema from v{previous} to v{LATEST_VERSION}:")
+        for step in applied:
+            print(f"- {step}")
+    else:
+        print(f"Schema is up to date (v{previous})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Vault Tag Index
+Tag to note postings with nested tag rollups, frontmatter tags and a sparse co-occurrence table
+"""
+
+import json
+import re
+from collections import Counter
+from itertools import permutations
+from typing import Dict, List, Tuple
+from vault_index import VaultIndex
+from vault_db import prefix_end
+from instrumentation import timed
+
+CURSOR_NAME = 'tags'
+
+FRONTMATTER_TAG_SPLIT = re.compile(r'[,\s]+')
+
+
+def normalize_tag(raw: str) -> str:
+    """Lowercase a tag and drop the leading # and any stray slashes, as Obsidian matches tags"""
+    return raw.strip().lstrip('#').strip('/').lower()
+
+
+def tag_ancestors(tag: str) -> List[str]:
+    """A nested tag and every tag above it: status/pending -> [status, status/pending]"""
+    parts = tag.split('/')
+    return ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+
+def tag_root(tag: str) -> str:
+    """Top level of a nested tag"""
+    return tag.split('/', 1)[0]
+
+
+def note_tags(note: Dict) -> Counter:
+    """Uses of each tag in a note, inline #tags first then frontmatter tags, in first-seen order"""
+    uses = Counter(normalize_tag(tag) for tag in note['tags'])
+
+    declared = note['frontmatter'].get('tags') if isinstance(note['frontmatter'], dict) else None
+    if isinstance(declared, str):
+        declared = FRONTMATTER_TAG_SPLIT.split(declared)
+    if isinstance(declared, list):
+        for tag in declared:
+            tag = normalize_tag(str(tag))
+            if tag:
+                uses[tag] += 1
+
+    uses.pop('', None)
+    return uses
+
+
+class TagIndex:
+    """Persisted tag postings and co-occurrence counts kept current from the index change feed"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+        self.db = index.db
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the tag tables if they don't exist"""
+        with self.db.connection() as conn:
+            # One row per note and tag, plus rollup rows (direct = 0) for each parent of a nested tag
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tag_notes (
+                    tag TEXT,
+                    path TEXT,
+                    uses INTEGER,
+                    direct INTEGER,
+                    position INTEGER,
+                    PRIMARY KEY (tag, path)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tag_notes_path ON tag_notes (path, position)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tag_counts (
+                    tag TEXT PRIMARY KEY,
+                    notes INTEGER,
+                    uses INTEGER
+                ) WITHOUT ROWID
+            """)
+            # Symmetric: each pair of direct tags on a note is stored in both directions
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tag_pairs (
+                    tag TEXT,
+                    other TEXT,
+                    notes INTEGER,
+                    PRIMARY KEY (tag, other)
+                ) WITHOUT ROWID
+            """)
+
+    @timed()
+    def sync(self) -> Dict:
+        """Replace the postings of changed notes and apply their count and pair deltas"""
+        cursor = self.index.get_cursor(CURSOR_NAME)
+        changed, removed, generation = self.index.snapshot_changes(cursor)
+
+        with self.db.connection() as conn:
+            if cursor == 0:
+                # First sync: the change feed holds every note
+                conn.execute("DELETE FROM tag_notes")
+                conn.execute("DELETE FROM tag_counts")
+                conn.execute("DELETE FROM tag_pairs")
+
+            count_delta = Counter()
+            pair_delta = Counter()
+            for path in removed + [note['path'] for note in changed]:
+                old = conn.execute("SELECT tag, uses, direct FROM tag_notes WHERE path = ?", (path,)).fetchall()
+                self._collect(old, count_delta, pair_delta, -1)
+
+            postings = []
+            for note in changed:
+                rows = self._postings(note['path'], note_tags(note))
+                postings.extend(rows)
+                self._collect([(tag, uses, direct) for tag, _, uses, direct, _ in rows],
+                              count_delta, pair_delta, 1)
+
+            conn.executemany("DELETE FROM tag_notes WHERE path = ?",
+                             [(path,) for path in removed] + [(note['path'],) for note in changed])
+            conn.executemany(
+                "INSERT INTO tag_notes (tag, path, uses, direct, position) VALUES (?, ?, ?, ?, ?)", postings
+            )
+            self._apply(conn, count_delta, pair_delta)
+
+            self.index.set_cursor(CURSOR_NAME, generation, conn)
+
+        return {'changed_notes': len(changed), 'removed_notes': len(removed), 'postings_written': len(postings)}
+
+    def _postings(self, path: str, uses: Counter) -> List[tuple]:
+        """tag_notes rows for one note: its own tags plus rollups to each parent tag"""
+        rows = {}
+        for position, (tag, count) in enumerate(uses.items()):
+            for ancestor in tag_ancestors(tag):
+                direct = ancestor == tag
+                if ancestor in rows:
+                    _, _, total, was_direct, first = rows[ancestor]
+                    rows[ancestor] = (ancestor, path, total + count, int(was_direct or direct), first)
+                else:
+                    rows[ancestor] = (ancestor, path, count, int(direct), position)
+        return list(rows.values())
+
+    @staticmethod
+    def _collect(rows: List[Tuple[str, int, int]], count_delta: Counter, pair_delta: Counter, sign: int):
+        """Add (or with sign -1 remove) one note's tags to the count and pair deltas"""
+        for tag, uses, _ in rows:
+            count_delta[tag, 'notes'] += sign
+            count_delta[tag, 'uses'] += sign * uses
+        direct = sorted(tag for tag, _, is_direct in rows if is_direct)
+        for pair in permutations(direct, 2):
+            pair_delta[pair] += sign
+
+    @staticmethod
+    def _apply(conn, count_delta: Counter, pair_delta: Counter):
+        """Fold deltas into tag_counts and tag_pairs, dropping rows that reach zero"""
+        tags = {tag for tag, _ in count_delta}
+        rows = [(tag, count_delta[tag, 'notes'], count_delta[tag, 'uses']) for tag in tags
+                if count_delta[tag, 'notes'] or count_delta[tag, 'uses']]
+        conn.executemany("""
+            INSERT INTO tag_counts (tag, notes, uses) VALUES (?, ?, ?)
+            ON CONFLICT (tag) DO UPDATE SET notes = notes + excluded.notes, uses = uses + excluded.uses
+        """, rows)
+        conn.executemany("DELETE FROM tag_counts WHERE tag = ? AND notes <= 0", [(tag,) for tag, _, _ in rows])
+
+        pairs = [(tag, other, count) for (tag, other), count in pair_delta.items() if count]
+        conn.executemany("""
+            INSERT INTO tag_pairs (tag, other, notes) VALUES (?, ?, ?)
+            ON CONFLICT (tag, other) DO UPDATE SET notes = notes + excluded.notes
+        """, pairs)
+        conn.executemany("DELETE FROM tag_pairs WHERE tag = ? AND other = ? AND notes <= 0",
+                         [(tag, other) for tag, other, _ in pairs])
+
+    def notes_with(self, tag: str, nested: bool = True) -> List[str]:
+        """Paths of notes carrying a tag; nested=True also matches its child tags"""
+        query = "SELECT path FROM tag_notes WHERE tag = ?"
+        if not nested:
+            query += " AND direct = 1"
+        with self.db.connection() as conn:
+            return [path for path, in conn.execute(query + " ORDER BY path", (normalize_tag(tag),))]
+
+    def count(self, tag: str) -> Dict[str, int]:
+        """Notes and total uses of a tag including its child tags"""
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT notes, uses FROM tag_counts WHERE tag = ?", (normalize_tag(tag),)).fetchone()
+        return {'notes': row[0], 'uses': row[1]} if row else {'notes': 0, 'uses': 0}
+
+    def top_tags(self, limit: int = 10, top_level: bool = False) -> List[Tuple[str, int]]:
+        """Most used tags by note count, optionally only top-level tags"""
+        query = "SELECT tag, notes FROM tag_counts"
+        if top_level:
+            query += " WHERE instr(tag, '/') = 0"
+        with self.db.connection() as conn:
+            return conn.execute(query + " ORDER BY notes DESC, tag LIMIT ?", (limit,)).fetchall()
+
+    def children(self, tag: str) -> List[Tuple[str, int]]:
+        """Nested tags directly below a tag with their note counts"""
+        prefix = normalize_tag(tag) + '/'
+        with self.db.connection() as conn:
+            rows = conn.execute("""
+                SELECT tag, notes FROM tag_counts WHERE tag >= ? AND tag < ? ORDER BY tag
+            """, (prefix, prefix_end(prefix))).fetchall()
+        return [(child, notes) for child, notes in rows if '/' not in child[len(prefix):]]
+
+    def related(self, tag: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Tags that most often appear on the same notes as this one"""
+        with self.db.connection() as conn:
+            return conn.execute("""
+                SELECT other, notes FROM tag_pairs WHERE tag = ?
+                ORDER BY notes DESC, other LIMIT ?
+            """, (normalize_tag(tag), limit)).fetchall()
+
+    def tags_of(self, path: str, direct: bool = True) -> List[str]:
+        """A note's tags in the order they first appear"""
+        return self.tags_under(path, direct).get(path, [])
+
+    def tags_under(self, prefix: str, direct: bool = True) -> Dict[str, List[str]]:
+        """Tags of every note whose path starts with prefix (a folder with trailing / or a path)"""
+        query = "SELECT path, tag FROM tag_notes WHERE path >= ? AND path < ?"
+        if direct:
+            query += " AND direct = 1"
+        tags: Dict[str, List[str]] = {}
+        with self.db.connection() as conn:
+            for path, tag in conn.execute(query + " ORDER BY path, position", (prefix, prefix_end(prefix))):
+                tags.setdefault(path, []).append(tag)
+        return tags
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Tag Index")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--tag', help='Show notes, child tags and related tags for this tag')
+    parser.add_argument('--top', type=int, default=10, help='How many tags to list')
+
+    args = parser.parse_args()
+
+    tags = TagIndex(VaultIndex(args.vault))
+    summary = tags.sync()
+    if args.tag:
+        summary.update({
+            'tag': normalize_tag(args.tag),
+            'count': tags.count(args.tag),
+            'children': tags.children(args.tag),
+            'related': tags.related(args.tag, args.top),
+            'notes': tags.notes_with(args.tag)[:args.top]
+        })
+    else:
+        summary['top_tags'] = tags.top_tags(args.top)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Task Categorizer
+Aho-Corasick matcher over a configurable category -> keyword dictionary, classifying a task in one scan
+"""
+
+import json
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Category -> keywords or phrases; earlier categories win when several match
+DEFAULT_CATEGORIES = {
+    'development': ('code', 'develop', 'build', 'implement'),
+    'learning': ('learn', 'study', 'research', 'read'),
+    'documentation': ('write', 'document', 'note'),
+    'planning': ('plan', 'organize', 'setup'),
+}
+
+FALLBACK_CATEGORY = 'other'
+
+# Tasks per numpy batch in categorize_many, bounding the padded character matrix
+BATCH_SIZE = 16384
+
+
+def load_categories(path) -> Dict[str, List[str]]:
+    """Read a {category: [keyword, ...]} JSON file, keeping its category order"""
+    with open(path, 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    if not isinstance(categories, dict):
+        raise ValueError(f"{path}: expected an object mapping categories to keyword lists")
+    return {str(category): [str(word) for word in words] for category, words in categories.items()}
+
+
+class TaskCategorizer:
+    """Keyword automaton with failure links folded into a full transition table"""
+
+    def __init__(self, categories: Optional[Dict[str, Iterable[str]]] = None,
+                 fallback: str = FALLBACK_CATEGORY):
+        categories = DEFAULT_CATEGORIES if categories is None else categories
+        self.categories = list(categories)
+        self.fallback = fallback
+        self.keywords: List[Tuple[str, int]] = []  # (phrase, category rank)
+        for rank, words in enumerate(categories.values()):
+            for word in words:
+                word = word.lower()
+                if word:
+                    self.keywords.append((word, rank))
+        self._build()
+
+    @classmethod
+    def from_file(cls, path, fallback: str = FALLBACK_CATEGORY) -> 'TaskCategorizer':
+        """Categorizer for a JSON category file"""
+        return cls(load_categories(path), fallback)
+
+    def _build(self):
+        """Build the keyword trie, then resolve failure links into per-state transition dicts"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword_id, (word, _) in enumerate(self.keywords):
+            state = 0
+            for char in word:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(keyword_id)
+
+        # Breadth-first, so every state's failure target is complete before the state itself
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = outputs
+        # Best (lowest) category rank ending at each state; len(categories) means none
+        none = len(self.categories)
+        self._best = [min((self.keywords[k][1] for k in out), default=none) for out in outputs]
+        self._table = None
+
+    @property
+    def state_count(self) -> int:
+        return len(self._delta)
+
+    def matches(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """Every keyword occurrence as (start, end, category, phrase), in order of where it ends"""
+        found = []
+        delta, outputs, keywords = self._delta, self._outputs, self.keywords
+        state = 0
+        for position, char in enumerate(text.lower()):
+            state = delta[state].get(char, 0)
+            for keyword_id in outputs[state]:
+                word, rank = keywords[keyword_id]
+                found.append((position + 1 - len(word), position + 1, self.categories[rank], word))
+        return found
+
+    def categories_of(self, text: str) -> List[str]:
+        """Every category with at least one keyword in the text, in dictionary order"""
+        ranks = {self.categories.index(category) for _, _, category, _ in self.matches(text)}
+        return [self.categories[rank] for rank in sorted(ranks)]
+
+    def categorize(self, text: str) -> str:
+        """The first category in dictionary order whose keywords appear in the text"""
+        delta, best_of = self._delta, self._best
+        best = none = len(self.categories)
+        state = 0
+        for char in text.lower():
+            state = delta[state].get(char, 0)
+            if best_of[state] < best:
+                best = best_of[state]
+                if best == 0:
+                    break
+        return self.categories[best] if best < none else self.fallback
+
+    def _dense_table(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Flat transition and best-category tables indexed by state * width + symbol
+
+        Symbols number the keyword alphabet from 1; 0 is every other character. Transitions
+        store the next state already multiplied by the width so a step is one add and one take.
+        """
+        if self._table is None:
+            alphabet = sorted({char for word, _ in self.keywords for char in word})
+            width = len(alphabet) + 1
+            # Code point -> symbol; the extra last slot catches every code point above the alphabet
+            symbols = np.zeros((ord(alphabet[-1]) if alphabet else 0) + 2, dtype=np.int64)
+            for symbol, char in enumerate(alphabet, 1):
+                symbols[ord(char)] = symbol
+
+            targets = np.zeros((len(self._delta), width), dtype=np.int64)
+            for state, row in enumerate(self._delta):
+                for symbol, char in enumerate(alphabet, 1):
+                    targets[state, symbol] = row.get(char, 0)
+            best = np.array(self._best, dtype=np.int32)[targets].ravel()
+            self._table = (symbols, (targets * width).ravel(), best)
+        return self._table
+
+    def categorize_many(self, texts: Sequence[str]) -> List[str]:
+        """categorize() for many tasks at once, stepping every task's automaton together with numpy"""
+        labels = self.categories + [self.fallback]
+        symbol_of, transitions, best_of = self._dense_table()
+        lowered = [text.lower() for text in texts]
+        lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+        # Longest first, so similar lengths share a batch and each step only touches unfinished tasks
+        order = np.argsort(-lengths, kind='stable')
+        ranks = np.full(len(lowered), len(self.categories), dtype=np.int32)
+
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start:start + BATCH_SIZE]
+            batch_lengths = lengths[batch]
+            if not batch_lengths[0]:
+                break
+
+            # Characters -> symbols as a (position, task) matrix; NUL padding maps to symbol 0
+            width = int(batch_lengths[0])
+            padded = ''.join(lowered[i].ljust(width, '\0') for i in batch).encode('utf-32-le')
+            points = np.frombuffer(padded, dtype=np.uint32).reshape(len(batch), width)
+            matrix = np.ascontiguousarray(symbol_of[np.minimum(points, len(symbol_of) - 1)].T)
+
+            offsets = np.zeros(len(batch), dtype=np.int64)
+            best = np.full(len(batch), len(self.categories), dtype=np.int32)
+            # Tasks still running at each position; lengths are descending within the batch
+            active = np.searchsorted(-batch_lengths, -np.arange(len(matrix)), side='left')
+            for position, count in enumerate(active):
+                step = offsets[:count] + matrix[position, :count]
+                np.minimum(best[:count], best_of.take(step), out=best[:count])
+                transitions.take(step, out=offsets[:count])
+            ranks[batch] = best
+        return np.array(labels, dtype=object)[ranks].tolist()
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Task Categorizer")
+    parser.add_argument('tasks', nargs='+', help='Task texts to categorize')
+    parser.add_argument('--categories', help='JSON file mapping categories to keyword lists')
+
+    args = parser.parse_args()
+
+    categorizer = TaskCategorizer.from_file(args.categories) if args.categories else TaskCategorizer()
+    print(json.dumps([{
+        'task': task,
+        'category': categorizer.categorize(task),
+        'categories': categorizer.categories_of(task),
+        'matches': categorizer.matches(task)
+    } for task in args.tasks], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Vault Task Index
+Every checkbox task with its note, line, nesting, due date and owning note date, kept current from the index change feed
+"""
+
+import json
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from vault_index import VaultIndex
+from instrumentation import timed
+
+CURSOR_NAME = 'tasks'
+
+NOTE_DATE_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})')
+
+# Frontmatter keys that may carry a note's date, in order of preference
+NOTE_DATE_KEYS = ('date', 'created')
+
+
+def note_date(note: Dict) -> str:
+    """The day a note belongs to: a YYYY-MM-DD name prefix, a frontmatter date, else its creation day"""
+    match = NOTE_DATE_PATTERN.match(note['name'])
+    if match:
+        return match.group(1)
+    frontmatter = note['frontmatter'] if isinstance(note['frontmatter'], dict) else {}
+    for key in NOTE_DATE_KEYS:
+        match = NOTE_DATE_PATTERN.match(str(frontmatter.get(key, '')))
+        if match:
+            return match.group(1)
+    return datetime.fromtimestamp(note['ctime']).date().isoformat()
+
+
+class TaskIndex:
+    """Persisted task rows replaced per note as notes change"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+        self.db = index.db
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the task table if it doesn't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_items (
+                    path TEXT,
+                    line INTEGER,
+                    folder TEXT,
+                    note_date TEXT,
+                    depth INTEGER,
+                    parent_line INTEGER,
+                    status TEXT,
+                    text TEXT,
+                    due TEXT,
+                    PRIMARY KEY (path, line)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_items_folder ON task_items (folder, note_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_items_due ON task_items (due) WHERE due IS NOT NULL")
+
+    @timed()
+    def sync(self) -> Dict:
+        """Replace the task rows of every note changed or removed since the last sync"""
+        cursor = self.index.get_cursor(CURSOR_NAME)
+        changed, removed, generation = self.index.snapshot_changes(cursor)
+
+        with self.db.connection() as conn:
+            if cursor == 0:
+                # First sync: the change feed holds every note
+                conn.execute("DELETE FROM task_items")
+
+            conn.executemany("DELETE FROM task_items WHERE path = ?",
+                             [(path,) for path in removed] + [(note['path'],) for note in changed])
+
+            rows = []
+            for note in changed:
+                day = note_date(note)
+                for line, depth, parent_line, status, text, due in note['task_items']:
+                    rows.append((note['path'], line, note['parent'], day, depth, parent_line, status, text, due))
+            conn.executemany("""
+                INSERT INTO task_items (path, line, folder, note_date, depth, parent_line, status, text, due)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            self.index.set_cursor(CURSOR_NAME, generation, conn)
+
+        return {'changed_notes': len(changed), 'removed_notes': len(removed), 'tasks_written': len(rows)}
+
+    def tasks_of(self, path: str) -> List[Dict]:
+        """Every task in a note in line order"""
+        with self.db.connection() as conn:
+            rows = conn.execute("""
+                SELECT line, depth, parent_line, status, text, due FROM task_items
+                WHERE path = ? ORDER BY line
+            """, (path,)).fetchall()
+        return [{'line': line, 'depth': depth, 'parent_line': parent_line, 'done': status == 'x',
+                 'text': text, 'due': due} for line, depth, parent_line, status, text, due in rows]
+
+    def open_tasks(self, path: str, limit: Optional[int] = None) -> List[str]:
+        """Text of a note's unchecked tasks in line order"""
+        with self.db.connection() as conn:
+            rows = conn.execute("""
+                SELECT text FROM task_items WHERE path = ? AND status = ' ' ORDER BY line LIMIT ?
+            """, (path, -1 if limit is None else limit)).fetchall()
+        return [text for text, in rows]
+
+    def completion(self, folder: Optional[str] = None, since: Optional[str] = None,
+                   until: Optional[str] = None) -> Dict:
+        """Total and completed tasks with the completion rate, optionally for one folder and note date range"""
+        query = "SELECT COUNT(*), COALESCE(SUM(status = 'x'), 0) FROM task_items WHERE 1 = 1"
+        params = ()
+        if folder is not None:
+            query += " AND folder = ?"
+            params += (folder,)
+        if since is not None:
+            query += " AND note_date >= ?"
+            params += (since,)
+        if until is not None:
+            query += " AND note_date <= ?"
+            params += (until,)
+        with self.db.connection() as conn:
+            total, done = conn.execute(query, params).fetchone()
+        return {'total': total, 'done': done, 'rate': round(done / total * 100, 1) if total else 0}
+
+    def due(self, until: str, since: Optional[str] = None) -> List[Dict]:
+        """Open tasks due on or before a day (and on or after since), soonest first"""
+        query = "SELECT path, line, text, due FROM task_items WHERE due <= ? AND status = ' '"
+        params = (until,)
+        if since is not None:
+            query += " AND due >= ?"
+            params += (since,)
+        with self.db.connection() as conn:
+            rows = conn.execute(query + " ORDER BY due, path, line", params).fetchall()
+        return [{'path': path, 'line': line, 'text': text, 'due': due} for path, line, text, due in rows]
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Task Index")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--note', help="List one note's tasks")
+    parser.add_argument('--folder', help='Limit the completion rate to this folder')
+
+    args = parser.parse_args()
+
+    tasks = TaskIndex(VaultIndex(args.vault))
+    summary = tasks.sync()
+    if args.note:
+        summary['tasks'] = tasks.tasks_of(args.note)
+    else:
+        summary['completion'] = tasks.completion(args.folder)
+        summary['due_today'] = tasks.due(date.today().isoformat())
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
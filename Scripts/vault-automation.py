@@ -5,17 +5,25 @@ Runs automated tasks for vault maintenance and optimization
 """
 
 import sys
-import os
 from pathlib import Path
 from datetime import datetime, date
+from typing import Dict
+import shutil
 import schedule
+import threading
 import time
 
 sys.path.append(r'Scripts')
 
 try:
     from claude_integration import ObsidianClaudeIntegration
-    from auto_organize import VaultOrganizer
+    from vault_walker import list_folder
+    from vault_index import VaultIndex
+    from vault_aggregates import VaultAggregates
+    from vault_watcher import POLL_INTERVAL, PollingWatcher, create_watcher
+    from change_queue import DEBOUNCE_SECONDS, ChangeQueue
+    from vault import load_script
+    VaultOrganizer = load_script('auto-organize.py').VaultOrganizer
 except ImportError as e:
     print(f"Import error: {e}")
     print("Make sure all required scripts are in the Scripts folder")
@@ -25,7 +33,9 @@ class VaultAutomation:
     def __init__(self, vault_path):
         self.vault_path = Path(vault_path)
         self.integration = ObsidianClaudeIntegration(vault_path)
-        self.organizer = VaultOrganizer(vault_path)
+        self.index = VaultIndex(vault_path)
+        self.organizer = VaultOrganizer(vault_path, index=self.index)
+        self.aggregates = VaultAggregates(self.index)
         
     def daily_tasks(self):
         """Run daily automation tasks"""
@@ -77,15 +87,14 @@ class VaultAutomation:
         archived_count = 0
         
         # Archive old session logs
-        claude_folder = self.vault_path / "09-Claude-Integration"
         archive_folder = self.vault_path / "07-Archives" / "Sessions"
         archive_folder.mkdir(parents=True, exist_ok=True)
         
-        if claude_folder.exists():
-            for file in claude_folder.glob("*.md"):
-                if file.stat().st_mtime < cutoff_date:
-                    shutil.move(str(file), str(archive_folder / file.name))
-                    archived_count += 1
+        # Materialize the listing first since files are moved while iterating
+        for entry in list(list_folder(self.vault_path, "09-Claude-Integration")):
+            if entry.mtime < cutoff_date:
+                shutil.move(str(entry.path), str(archive_folder / entry.name))
+                archived_count += 1
                     
         if archived_count > 0:
             print(f"Archived {archived_count} old session files")
@@ -109,23 +118,84 @@ class VaultAutomation:
         except KeyboardInterrupt:
             print("\nVault automation stopped.")
 
+    def process_changes(self, events) -> Dict:
+        """Re-index just the changed notes, update the aggregates and file new inbox notes"""
+        paths = sorted({path for event in events for path in event.paths()})
+        summary = self.index.apply_changes(events)
+        self.aggregates.sync()
+        
+        inbox = [path for path in paths if path.startswith("00-Inbox/") and path.count('/') == 1]
+        if inbox:
+            summary['organized'] = len(self.organizer.organize_paths(inbox))
+        return summary
+        
+    def watch(self, polling: bool = False, interval: float = POLL_INTERVAL,
+              debounce: float = DEBOUNCE_SECONDS, show_metrics: bool = False):
+        """Process note changes as they happen instead of waiting for the daily run"""
+        watcher = create_watcher(str(self.vault_path), polling, interval)
+        if isinstance(watcher, PollingWatcher):
+            # A burst of saves shows up at most once per poll, so quiet must outlast a poll
+            debounce = max(debounce, 1.5 * interval)
+        changes = ChangeQueue(debounce=debounce)
+        stopping = threading.Event()
+        
+        # Catch up on anything that changed while nothing was watching
+        self.index.refresh()
+        self.aggregates.sync()
+        self.organizer.organize_inbox(dry_run=False)
+        watcher.start()
+        
+        def produce():
+            # Blocks in put() while the queue is full, which stalls the watcher behind it
+            while not stopping.is_set():
+                for event in watcher.poll(0.5):
+                    changes.put(event)
+                    
+        producer = threading.Thread(target=produce, name="vault-watcher", daemon=True)
+        producer.start()
+        
+        print(f"Watching vault for changes ({type(watcher).__name__}). Press Ctrl+C to stop.")
+        try:
+            while True:
+                events = changes.get_batch(timeout=1.0)
+                if events:
+                    try:
+                        self.process_changes(events)
+                    except Exception as e:
+                        print(f"Error processing changes: {e}")
+                    if show_metrics:
+                        print(f"Queue: {changes.metrics()}")
+        except KeyboardInterrupt:
+            print("\nVault watch stopped.")
+            print(f"Queue: {changes.metrics()}")
+        finally:
+            stopping.set()
+            watcher.stop()
+
 def main():
-    vault_path = r'.'
-    automation = VaultAutomation(vault_path)
-    
     import argparse
     parser = argparse.ArgumentParser(description="Vault Automation")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
     parser.add_argument('--run-now', action='store_true', help='Run daily tasks immediately')
     parser.add_argument('--schedule', action='store_true', help='Run scheduled automation')
+    parser.add_argument('--watch', action='store_true', help='File inbox notes and update the index as notes change')
+    parser.add_argument('--poll', action='store_true', help='With --watch, poll stat snapshots instead of filesystem events')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Seconds between polls with --poll')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help='With --watch, seconds a note must stay unchanged before it is processed')
+    parser.add_argument('--metrics', action='store_true', help='With --watch, print queue depth and latency after each batch')
     
     args = parser.parse_args()
+    automation = VaultAutomation(args.vault)
     
     if args.run_now:
         automation.daily_tasks()
     elif args.schedule:
         automation.run_scheduled_tasks()
+    elif args.watch:
+        automation.watch(args.poll, args.interval, args.debounce, args.metrics)
     else:
-        print("Use --run-now for immediate execution or --schedule for automated scheduling")
+        print("Use --run-now for immediate execution, --schedule for automated scheduling or --watch to follow changes")
 
 if __name__ == "__main__":
     main()
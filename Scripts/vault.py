@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Vault Command Line
+One entry point for the daily workflow scripts; each subcommand imports only what it needs
+"""
+
+import sys
+import argparse
+import importlib.util
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Cold start budget for `vault daily`, checked by `vault startup-check`
+STARTUP_BUDGET_MS = 150
+
+# Commands a running vault daemon (vault_daemon.py) can serve from its warm index
+DAEMON_COMMANDS = ('context', 'analytics', 'organize')
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(filename: str):
+    """Import a hyphenated script such as auto-organize.py as a module"""
+    module_name = filename[:-3].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def cmd_daily(args):
+    from claude_integration import ObsidianClaudeIntegration
+    daily_file = ObsidianClaudeIntegration(args.vault).create_daily_note()
+    print(f"Daily note created: {daily_file}")
+
+
+def cmd_session(args):
+    from claude_integration import ObsidianClaudeIntegration
+    session_file = ObsidianClaudeIntegration(args.vault).create_session_log(args.type, args.project, args.goal)
+    print(f"Session started: {session_file}")
+
+
+def cmd_insights(args):
+    from claude_integration import ObsidianClaudeIntegration
+    ObsidianClaudeIntegration(args.vault).generate_insights_report()
+    print("Insights report generated!")
+
+
+def cmd_organize(args, organizer=None, out=None, err=None) -> int:
+    organizer = organizer or load_script('auto-organize.py').VaultOrganizer(args.vault)
+
+    if not getattr(args, 'confirmed', False):
+        print("=== Files to organize ===", file=out)
+        results = organizer.organize_inbox(dry_run=True, out=out)
+        if not results:
+            print("No files to organize.", file=out)
+            return 0
+        if args.dry_run:
+            return len(results)
+
+    if getattr(args, 'confirmed', False) or args.yes or input(f"\nOrganize {len(results)} files? (y/N): ").lower() == 'y':
+        results = organizer.organize_inbox(dry_run=False, out=out)
+        print("\n" + organizer.create_organization_report(results), file=out)
+    return len(results)
+
+
+def cmd_context(args, loader=None, out=None, err=None):
+    loader = loader or load_script('context-auto-loader.py').ContextAutoLoader(args.vault)
+    loader.last_pack = None
+    context = loader.generate_comprehensive_context(args.type, err)
+
+    if args.save:
+        print(f"Context saved to: {loader.save_context_to_file(context, args.type)}", file=out)
+    else:
+        print(context, file=out)
+    if loader.last_pack:
+        print(loader.last_pack.report(), file=err or sys.stderr)
+
+
+def cmd_analytics(args, analytics=None, out=None, err=None):
+    engine = load_script('analytics-engine.py')
+    engine.run_reports(analytics or engine.VaultAnalytics(args.vault, workers=args.workers), args, out)
+
+
+def cmd_startup_check(args):
+    """Time cold starts of `vault daily` in a scratch vault and fail when over budget"""
+    import shutil
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+
+    template = Path(args.vault) / "08-Templates" / "Daily Journal.md"
+    timings = []
+    with tempfile.TemporaryDirectory() as scratch:
+        (Path(scratch) / "08-Templates").mkdir()
+        if template.exists():
+            shutil.copy(template, Path(scratch) / "08-Templates" / "Daily Journal.md")
+        else:
+            (Path(scratch) / "08-Templates" / "Daily Journal.md").write_text("# {{date:YYYY-MM-DD}}\n", encoding='utf-8')
+
+        for _ in range(args.runs):
+            shutil.rmtree(Path(scratch) / "01-Daily", ignore_errors=True)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(Path(__file__).resolve()), '--vault', scratch, 'daily'],
+                           check=True, stdout=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    median = statistics.median(timings)
+    print(f"vault daily cold start: median {median:.0f} ms, best {min(timings):.0f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms} ms)")
+    if median > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        sys.exit(1)
+    print("OK")
+
+
+def context_type_arg(value: str) -> str:
+    """Accept quick, full, or a positive token budget"""
+    if value in ('quick', 'full') or (value.isdigit() and int(value) > 0):
+        return value
+    raise argparse.ArgumentTypeError(f"expected quick, full or a token budget, got '{value}'")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from date_range import add_range_arguments
+
+    parser = argparse.ArgumentParser(prog="vault", description="Obsidian vault workflow commands")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--timings', action='store_true', help='Print a per-stage timing breakdown at the end')
+    parser.add_argument('--no-daemon', action='store_true', help='Run in-process even if a vault daemon is running')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('daily', help="Create today's daily note").set_defaults(func=cmd_daily)
+
+    session = commands.add_parser('session', help='Start a Claude session log')
+    session.add_argument('--type', default='general', help='Session type')
+    session.add_argument('--project', default='', help='Project name')
+    session.add_argument('--goal', default='', help='Session goal')
+    session.set_defaults(func=cmd_session)
+
+    organize = commands.add_parser('organize', help='Sort inbox notes into folders')
+    organize.add_argument('--dry-run', action='store_true', help='Only show what would move')
+    organize.add_argument('--yes', action='store_true', help='Move without asking for confirmation')
+    organize.set_defaults(func=cmd_organize)
+
+    commands.add_parser('insights', help='Generate the insights report').set_defaults(func=cmd_insights)
+
+    context = commands.add_parser('context', help='Generate agent context')
+    context.add_argument('--type', type=context_type_arg, default='quick',
+                         help='quick, full, or a token budget such as 1500')
+    context.add_argument('--save', action='store_true', help='Save context to file instead of printing')
+    context.set_defaults(func=cmd_context)
+
+    analytics = commands.add_parser('analytics', help='Run vault analytics')
+    analytics.add_argument('--report', choices=['productivity', 'knowledge', 'comprehensive'],
+                           default='comprehensive', help='Type of report to generate')
+    analytics.add_argument('--workers', type=int, default=1, help='Parallel note parser processes')
+    add_range_arguments(analytics)
+    analytics.set_defaults(func=cmd_analytics)
+
+    check = commands.add_parser('startup-check', help='Verify `vault daily` cold start stays within budget')
+    check.add_argument('--budget-ms', type=int, default=STARTUP_BUDGET_MS, help='Allowed median start time')
+    check.add_argument('--runs', type=int, default=5, help='Cold starts to time')
+    check.set_defaults(func=cmd_startup_check)
+
+    return parser
+
+
+def run_on_daemon(args) -> bool:
+    """Forward a command to a running vault daemon; False when none answers and it should run in-process"""
+    import vault_daemon
+
+    forwarded = {key: value for key, value in vars(args).items()
+                 if key not in ('vault', 'timings', 'no_daemon', 'command', 'func')}
+    if args.command == 'organize' and not (args.dry_run or args.yes):
+        # Preview on the daemon, confirm here, then move on the daemon
+        response = vault_daemon.send_request(args.vault, 'organize', dict(forwarded, dry_run=True))
+        if response is None:
+            return False
+        _print_daemon_output(response)
+        if not response.get('ok') or not response.get('result'):
+            return True
+        if input(f"\nOrganize {response['result']} files? (y/N): ").lower() != 'y':
+            return True
+        forwarded['confirmed'] = True
+
+    response = vault_daemon.send_request(args.vault, args.command, forwarded)
+    if response is None:
+        return False
+    _print_daemon_output(response)
+    return True
+
+
+def _print_daemon_output(response: dict):
+    """Replay a daemon response's captured output, exiting non-zero if the command failed"""
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    if not response.get('ok'):
+        print(f"Vault daemon error: {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    """Main execution function"""
+    args = build_parser().parse_args()
+    if not args.timings:
+        if args.command in DAEMON_COMMANDS and not args.no_daemon and run_on_daemon(args):
+            return
+        args.func(args)
+        return
+
+    # Imported only when asked for so plain commands keep their cold start budget
+    import instrumentation
+    instrumentation.enable()
+    with instrumentation.span(f"vault {args.command}"):
+        args.func(args)
+    instrumentation.finish(Path(args.vault) / "claude_evolution.db")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Vault Aggregates
+Per-day, per-week, per-folder and per-tag counts updated by delta from the index change feed
+"""
+
+import json
+import re
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from vault_index import VaultIndex
+from vault_db import prefix_end
+from instrumentation import timed
+from tag_index import note_tags, tag_root
+from task_categorizer import DEFAULT_CATEGORIES, TaskCategorizer
+from task_index import note_date
+
+CURSOR_NAME = 'aggregates'
+
+# Bump when note_contributions changes so stored aggregates are rebuilt
+AGGREGATES_VERSION = 4
+
+SESSION_TIMESTAMP_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2}-\d{4})')
+
+# Grain -> (table, key column, count column); every table is keyed by (folder, key)
+GRAINS = {
+    'daily': ('agg_daily', 'day', 'notes'),
+    'weekly': ('agg_weekly', 'week', 'notes'),
+    'folder': ('agg_folder', 'metric', 'value'),
+    'tag': ('agg_tag', 'tag', 'uses'),
+    'dated': ('agg_dated', 'entry', 'value'),
+}
+
+# Dated entries are "YYYY-MM-DD|metric" so a day range is a primary key range scan
+DATED_METRIC_OFFSET = len('YYYY-MM-DD|') + 1  # 1-based for SQLite substr
+
+# Names each task's category; bump AGGREGATES_VERSION if its dictionary changes
+TASK_CATEGORIZER = TaskCategorizer(DEFAULT_CATEGORIES)
+
+
+def week_key(day: date) -> str:
+    """Week bucket as YYYY-Www using the calendar year and ISO week number"""
+    return f"{day.year}-W{day.isocalendar()[1]:02d}"
+
+
+def note_contributions(note: Dict, task_categories: Optional[List[str]] = None) -> Counter:
+    """Everything one note adds to the aggregate tables, keyed by (grain, folder, key)
+
+    task_categories holds the category of each of the note's tasks when already computed in bulk.
+    """
+    folder = note['parent']
+    created = datetime.fromtimestamp(note['ctime']).date()
+    counts = Counter()
+    counts['daily', folder, created.isoformat()] += 1
+    counts['weekly', folder, week_key(created)] += 1
+    counts['folder', folder, 'notes'] += 1
+
+    def add(metric: str, day: str, amount: int = 1):
+        """Count a folder metric both in total and on the day it belongs to"""
+        counts['folder', folder, metric] += amount
+        counts['dated', folder, f"{day}|{metric}"] += amount
+
+    for tag, uses in note_tags(note).items():
+        counts['tag', folder, tag_root(tag)] += uses
+        counts['dated', folder, f"{created.isoformat()}|tag:{tag_root(tag)}"] += uses
+
+    # Task totals and completion live in the task index; only categories are rolled up here
+    if task_categories is None:
+        task_categories = [TASK_CATEGORIZER.categorize(task) for _, task in note['tasks']]
+    task_day = note_date(note) if task_categories else None
+    for category in task_categories:
+        add(f"task:{category}", task_day)
+
+    if note['name'].endswith('-session.md'):
+        session_time = None
+        timestamp_match = SESSION_TIMESTAMP_PATTERN.search(note['name'])
+        if timestamp_match:
+            try:
+                session_time = datetime.strptime(timestamp_match.group(1), '%Y-%m-%d-%H%M')
+            except ValueError:
+                pass
+        session_day = (session_time.date() if session_time else created).isoformat()
+
+        add('sessions', session_day)
+        if note['session_type']:
+            add(f"session_type:{note['session_type']}", session_day)
+        if note['duration'] is not None:
+            add('duration_total', session_day, note['duration'])
+            add('duration_count', session_day)
+        if session_time:
+            add(f"session_hour:{session_time.hour}", session_day)
+            add(f"session_weekday:{session_time.strftime('%A')}", session_day)
+    return counts
+
+
+class VaultAggregates:
+    """Materialized note counts kept current by applying each note's change as a delta"""
+
+    def __init__(self, index: VaultIndex):
+        self.index = index
+        self.db = index.db
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the aggregate tables if they don't exist"""
+        with self.db.connection() as conn:
+            for table, key, value in GRAINS.values():
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        folder TEXT,
+                        {key} TEXT,
+                        {value} INTEGER,
+                        PRIMARY KEY (folder, {key})
+                    ) WITHOUT ROWID
+                """)
+            # What each note last added, so a change or delete can be subtracted exactly
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS agg_contributions (
+                    path TEXT PRIMARY KEY,
+                    data TEXT
+                )
+            """)
+
+    @timed()
+    def sync(self) -> Dict:
+        """Apply index changes since the last sync as deltas to the aggregate tables"""
+        cursor = self.index.get_cursor(CURSOR_NAME)
+        if self._stored_version() != AGGREGATES_VERSION:
+            cursor = 0
+        changed, removed, generation = self.index.snapshot_changes(cursor)
+
+        with self.db.connection() as conn:
+            if cursor == 0:
+                # First sync: the change feed holds every note
+                for table, _, _ in GRAINS.values():
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute("DELETE FROM agg_contributions")
+
+            delta = Counter()
+            for path in removed + [note['path'] for note in changed]:
+                row = conn.execute("SELECT data FROM agg_contributions WHERE path = ?", (path,)).fetchone()
+                if row:
+                    for grain, folder, key, count in json.loads(row[0]):
+                        delta[grain, folder, key] -= count
+
+            # Every changed task is categorized in one batch rather than note by note
+            categories = iter(TASK_CATEGORIZER.categorize_many(
+                [task for note in changed for _, task in note['tasks']]))
+            stored = []
+            for note in changed:
+                contributions = note_contributions(note, [next(categories) for _ in note['tasks']])
+                delta.update(contributions)
+                stored.append((note['path'], json.dumps([[*key, count] for key, count in contributions.items()])))
+
+            conn.executemany("DELETE FROM agg_contributions WHERE path = ?", [(path,) for path in removed])
+            conn.executemany("INSERT OR REPLACE INTO agg_contributions (path, data) VALUES (?, ?)", stored)
+            self._apply(conn, delta)
+
+            self.index.set_cursor(CURSOR_NAME, generation, conn)
+            conn.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('aggregates_version', ?)",
+                         (str(AGGREGATES_VERSION),))
+
+        return {'changed_notes': len(changed), 'removed_notes': len(removed),
+                'rows_touched': sum(1 for count in delta.values() if count)}
+
+    def _stored_version(self) -> int:
+        """Contribution format the stored aggregates were built with (0 = unknown)"""
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'aggregates_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _apply(self, conn, delta: Counter):
+        """Add each non-zero delta to its row and drop rows that fall to zero"""
+        for grain, (table, key, value) in GRAINS.items():
+            rows = [(folder, bucket, count) for (g, folder, bucket), count in delta.items()
+                    if g == grain and count]
+            if not rows:
+                continue
+            conn.executemany(f"""
+                INSERT INTO {table} (folder, {key}, {value}) VALUES (?, ?, ?)
+                ON CONFLICT (folder, {key}) DO UPDATE SET {value} = {value} + excluded.{value}
+            """, rows)
+            conn.executemany(f"DELETE FROM {table} WHERE folder = ? AND {key} = ? AND {value} = 0",
+                             [(folder, bucket) for folder, bucket, _ in rows])
+
+    def counts(self, grain: str, folder: str, prefix: str = '', since: Optional[str] = None,
+               until: Optional[str] = None) -> Dict[str, int]:
+        """Counts for one folder by key, optionally limited to keys with a prefix (stripped) or in [since, until]"""
+        table, key, value = GRAINS[grain]
+        query = f"SELECT {key}, {value} FROM {table} WHERE folder = ?"
+        params: Tuple = (folder,)
+        if prefix:
+            # Range scan on the primary key instead of LIKE
+            query += f" AND {key} >= ? AND {key} < ?"
+            params += (prefix, prefix_end(prefix))
+        if since is not None:
+            query += f" AND {key} >= ?"
+            params += (since,)
+        if until is not None:
+            query += f" AND {key} <= ?"
+            params += (until,)
+        with self.db.connection() as conn:
+            rows = conn.execute(query + f" ORDER BY {key}", params).fetchall()
+        return {bucket[len(prefix):]: count for bucket, count in rows}
+
+    def metric(self, folder: str, name: str) -> int:
+        """A single per-folder counter such as notes or sessions"""
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT value FROM agg_folder WHERE folder = ? AND metric = ?",
+                               (folder, name)).fetchone()
+        return row[0] if row else 0
+
+    def dated_counts(self, folder: str, prefix: str = '', since: Optional[str] = None,
+                     until: Optional[str] = None) -> Dict[str, int]:
+        """Per-folder counters with a prefix (stripped), summed over the days in [since, until]"""
+        query = f"""
+            SELECT substr(entry, {DATED_METRIC_OFFSET}) AS metric, SUM(value) FROM agg_dated
+            WHERE folder = ? AND entry >= ? AND entry < ?
+        """
+        params: Tuple = (folder, since or '', prefix_end((until or '9999-12-31') + '|'))
+        if prefix:
+            query += " AND metric >= ? AND metric < ?"
+            params += (prefix, prefix_end(prefix))
+        with self.db.connection() as conn:
+            rows = conn.execute(query + " GROUP BY metric ORDER BY metric", params).fetchall()
+        return {metric[len(prefix):]: count for metric, count in rows}
+
+    def dated_metric(self, folder: str, name: str, since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """A single per-folder counter summed over the days in [since, until]"""
+        with self.db.connection() as conn:
+            row = conn.execute(f"""
+                SELECT SUM(value) FROM agg_dated
+                WHERE folder = ? AND entry >= ? AND entry < ? AND substr(entry, {DATED_METRIC_OFFSET}) = ?
+            """, (folder, since or '', prefix_end((until or '9999-12-31') + '|'), name)).fetchone()
+        return row[0] or 0
+
+    def notes_by_month(self, folder: str, since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, int]:
+        """Notes created per YYYY-MM, rolled up from the daily table over the days in [since, until]"""
+        with self.db.connection() as conn:
+            rows = conn.execute("""
+                SELECT substr(day, 1, 7) AS month, SUM(notes) FROM agg_daily
+                WHERE folder = ? AND day >= ? AND day <= ? GROUP BY month ORDER BY month
+            """, (folder, since or '', until or '9999-12-31')).fetchall()
+        return dict(rows)
+
+    def first_day(self) -> Optional[str]:
+        """Creation day of the oldest note, None for an empty vault"""
+        with self.db.connection() as conn:
+            return conn.execute("SELECT MIN(day) FROM agg_daily").fetchone()[0]
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Aggregates")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--folder', help='Print the per-folder counters for this folder')
+
+    args = parser.parse_args()
+
+    aggregates = VaultAggregates(VaultIndex(args.vault))
+    summary = aggregates.sync()
+    if args.folder:
+        summary['folder'] = aggregates.counts('folder', args.folder)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Vault Daemon
+Keeps the vault index, derived stores and database connections warm and serves CLI requests over a local socket
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from vault import DAEMON_COMMANDS
+
+# Written to the vault root while a daemon is running; holds its address and auth token
+STATE_FILE = ".vault-daemon.json"
+
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 600
+
+
+def state_path(vault_path) -> Path:
+    """Where a running daemon advertises itself for this vault"""
+    return Path(vault_path).resolve() / STATE_FILE
+
+
+def socket_path(vault_path) -> str:
+    """Unix socket path for a vault, kept in the temp dir to stay under the socket path limit"""
+    digest = hashlib.md5(str(Path(vault_path).resolve()).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"vault-daemon-{digest}.sock")
+
+
+def read_state(vault_path) -> Optional[Dict]:
+    """The running daemon's advertised state, or None if there is none"""
+    try:
+        with open(state_path(vault_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _connect(state: Dict) -> socket.socket:
+    """Open a client socket to the daemon described by its state file"""
+    if state['transport'] == 'unix':
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = state['address']
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = tuple(state['address'])
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(REQUEST_TIMEOUT)
+    return sock
+
+
+def send_request(vault_path, command: str, args: Optional[Dict] = None) -> Optional[Dict]:
+    """Run a command on the vault's daemon; None means no daemon answered and the caller runs it in-process"""
+    state = read_state(vault_path)
+    if state is None:
+        return None
+    try:
+        with _connect(state) as sock:
+            request = {'token': state['token'], 'command': command, 'args': args or {}}
+            sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class VaultDaemon:
+    """Long-lived services sharing one warm index that a file watcher keeps current"""
+
+    def __init__(self, vault_path: str):
+        import secrets
+        import threading
+        from vault_index import VaultIndex
+
+        self.vault_path = str(Path(vault_path).resolve())
+        self.index = VaultIndex(self.vault_path)
+        self.token = secrets.token_hex(16)
+        self.requests_served = 0
+        self._services = {}
+        self._lock = threading.Lock()
+        # Services keep per-call state, so each serves one request at a time; different ones run concurrently
+        self._service_locks = {name: threading.Lock() for name in DAEMON_COMMANDS}
+        self._watching = threading.Event()
+        self._server = None
+
+    def service(self, name: str):
+        """The warm analytics, context or organize service, created on first use"""
+        with self._lock:
+            if name not in self._services:
+                from vault import load_script
+                if name == 'analytics':
+                    self._services[name] = load_script('analytics-engine.py').VaultAnalytics(
+                        self.vault_path, index=self.index)
+                elif name == 'context':
+                    self._services[name] = load_script('context-auto-loader.py').ContextAutoLoader(
+                        self.vault_path, index=self.index)
+                elif name == 'organize':
+                    self._services[name] = load_script('auto-organize.py').VaultOrganizer(
+                        self.vault_path, index=self.index)
+            return self._services[name]
+
+    def warm(self):
+        """Build the index and the analytics stores up front so the first request is fast"""
+        self.index.refresh()
+        self.service('analytics').reload()
+        self.service('context')
+        self.service('organize')
+
+    def watch(self, polling: bool = False):
+        """Apply note changes to the index as the watcher reports them, so requests never walk the vault"""
+        import threading
+        from change_queue import DEBOUNCE_SECONDS, ChangeQueue
+        from vault_watcher import PollingWatcher, create_watcher
+
+        watcher = create_watcher(self.vault_path, polling)
+        debounce = DEBOUNCE_SECONDS
+        if isinstance(watcher, PollingWatcher):
+            # A burst of saves shows up at most once per poll, so quiet must outlast a poll
+            debounce = max(debounce, 1.5 * watcher.interval)
+        changes = ChangeQueue(debounce=debounce)
+        self._watching.set()
+        watcher.start()
+
+        def produce():
+            try:
+                while self._watching.is_set():
+                    for event in watcher.poll(0.5):
+                        changes.put(event)
+            finally:
+                watcher.stop()
+
+        def apply():
+            while self._watching.is_set():
+                events = changes.get_batch(timeout=0.5)
+                if events:
+                    try:
+                        self.index.apply_changes(events)
+                    except Exception as e:
+                        print(f"Error indexing changes: {e}", file=sys.stderr)
+
+        threading.Thread(target=produce, name="vault-daemon-watcher", daemon=True).start()
+        threading.Thread(target=apply, name="vault-daemon-indexer", daemon=True).start()
+
+    def handle(self, request: Dict) -> Dict:
+        """Run one request against the watched index, capturing its output in per-request streams"""
+        import argparse
+        import io
+        import secrets
+        import vault
+
+        if not secrets.compare_digest(str(request.get('token', '')), self.token):
+            return {'ok': False, 'error': 'invalid token'}
+
+        command = request.get('command')
+        if command == 'status':
+            return {'ok': True, 'result': {'vault': self.vault_path, 'pid': os.getpid(),
+                                           'requests_served': self.requests_served,
+                                           'generation': self.index.generation}}
+        if command == 'stop':
+            import threading
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {'ok': True, 'result': 'stopping'}
+        if command not in DAEMON_COMMANDS:
+            return {'ok': False, 'error': f"unknown command '{command}'"}
+
+        args = argparse.Namespace(vault=self.vault_path, **request.get('args', {}))
+        stdout, stderr = io.StringIO(), io.StringIO()
+        service = self.service(command)
+        with self._service_locks[command]:
+            try:
+                if command == 'analytics':
+                    service.reload()
+                result = getattr(vault, f"cmd_{command}")(args, service, out=stdout, err=stderr)
+            except Exception as e:
+                return {'ok': False, 'error': f"{type(e).__name__}: {e}",
+                        'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+        with self._lock:
+            self.requests_served += 1
+        return {'ok': True, 'result': result, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+    def serve(self, tcp: bool = False, port: int = 0):
+        """Listen until stopped, advertising the address and token in the vault's state file"""
+        import socketserver
+
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError:
+                    response = {'ok': False, 'error': 'malformed request'}
+                self.wfile.write(json.dumps(response, default=str).encode('utf-8') + b"\n")
+
+        if tcp or not hasattr(socket, 'AF_UNIX'):
+            server = socketserver.ThreadingTCPServer(('127.0.0.1', port), RequestHandler)
+            state = {'transport': 'tcp', 'address': list(server.server_address)}
+        else:
+            address = socket_path(self.vault_path)
+            if os.path.exists(address):
+                os.unlink(address)
+            server = socketserver.ThreadingUnixStreamServer(address, RequestHandler)
+            os.chmod(address, 0o600)
+            state = {'transport': 'unix', 'address': address}
+        server.daemon_threads = True
+        self._server = server
+
+        state.update({'pid': os.getpid(), 'token': self.token})
+        state_file = state_path(self.vault_path)
+        fd = os.open(state_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        print(f"Vault daemon serving {self.vault_path} on {state['transport']} {state['address']}")
+        try:
+            server.serve_forever()
+        finally:
+            self._watching.clear()
+            server.server_close()
+            if read_state(self.vault_path) == state:
+                state_file.unlink()
+            if state['transport'] == 'unix' and os.path.exists(state['address']):
+                os.unlink(state['address'])
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Daemon")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--tcp', action='store_true', help='Listen on localhost TCP instead of a Unix socket')
+    parser.add_argument('--port', type=int, default=0, help='TCP port (default: any free port)')
+    parser.add_argument('--poll', action='store_true', help='Poll stat snapshots instead of filesystem events')
+    parser.add_argument('--status', action='store_true', help="Show the running daemon's status")
+    parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        response = send_request(args.vault, 'stop' if args.stop else 'status')
+        if response is None:
+            print("No vault daemon is running")
+            sys.exit(1)
+        print(json.dumps(response.get('result', response), indent=2))
+        return
+
+    if send_request(args.vault, 'status') is not None:
+        print("A vault daemon is already running for this vault")
+        sys.exit(1)
+
+    daemon = VaultDaemon(args.vault)
+    daemon.warm()
+    daemon.watch(args.poll)
+    try:
+        daemon.serve(tcp=args.tcp, port=args.port)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Vault Database Access
+Shared SQLite connections in WAL mode with a batched, latency-bounded write queue
+"""
+
+import atexit
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import instrumentation
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA mmap_size = 67108864",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Longest a queued write waits before the flusher commits it
+FLUSH_INTERVAL = 0.05
+
+# Queue length that triggers an immediate flush
+MAX_BATCH = 500
+
+
+def prefix_end(prefix: str) -> Optional[str]:
+    """Exclusive upper bound for a key range scan over the text keys starting with prefix.
+
+    The prefix with its last character incremented; SQLite compares text as UTF-8 bytes,
+    which sort in code point order. None when no such bound exists (an empty prefix).
+    """
+    while prefix:
+        last = ord(prefix[-1]) + 1
+        if 0xD800 <= last <= 0xDFFF:
+            # Surrogates never appear in stored text
+            last = 0xE000
+        if last <= sys.maxunicode:
+            return prefix[:-1] + chr(last)
+        prefix = prefix[:-1]
+    return None
+
+
+def open_connection(db_path, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection with the vault's pragmas applied, counting rows read when timings are on"""
+    factory = instrumentation.CountingConnection if instrumentation.enabled() else sqlite3.Connection
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread, factory=factory)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class VaultDB:
+    """Per-thread reader connections plus a single batching writer for one database file"""
+
+    _shared: Dict[str, 'VaultDB'] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path) -> 'VaultDB':
+        """Return the process-wide manager for a database file"""
+        key = str(Path(db_path).resolve())
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(db_path)
+            return cls._shared[key]
+
+    def __init__(self, db_path, flush_interval: float = FLUSH_INTERVAL, max_batch: int = MAX_BATCH):
+        self.db_path = Path(db_path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._local = threading.local()
+        self._pending: List[Tuple[str, tuple]] = []
+        self._queue_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._has_pending = threading.Event()
+        self._batch_full = threading.Event()
+        self._writer_conn = None
+        self._flusher = None
+        self._closed = False
+
+        atexit.register(self.close)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection; queued writes are flushed first so reads see them.
+
+        Used as `with db.connection() as conn:` it commits on success and rolls
+        back on error, exactly like a fresh sqlite3.connect() would.
+        """
+        if self._pending or self._write_lock.locked():
+            # Also wait out a batch the flusher is committing right now
+            self.flush()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = open_connection(self.db_path)
+        return conn
+
+    def enqueue(self, sql: str, params: Iterable = ()):
+        """Queue a write to be committed with others in the next batch"""
+        with self._queue_lock:
+            self._pending.append((sql, tuple(params)))
+            queued = len(self._pending)
+        self._has_pending.set()
+        if queued >= self.max_batch:
+            self._batch_full.set()
+        self._start_flusher()
+
+    def flush(self) -> int:
+        """Commit every queued write in one transaction and return how many ran.
+
+        The batch stays queued until its commit succeeds. When one statement fails, the
+        batch is replayed statement by statement so only the failing writes are dropped.
+        """
+        with self._write_lock:
+            with self._queue_lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+
+            if self._writer_conn is None:
+                self._writer_conn = open_connection(self.db_path, check_same_thread=False)
+                self._writer_conn.isolation_level = None
+
+            conn = self._writer_conn
+            with instrumentation.span("VaultDB.flush"):
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for sql, rows in self._group(batch):
+                        conn.executemany(sql, rows)
+                    conn.execute("COMMIT")
+                    written = len(batch)
+                except sqlite3.Error:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    written = self._replay(conn, batch)
+
+            with self._queue_lock:
+                del self._pending[:len(batch)]
+                if not self._pending:
+                    self._has_pending.clear()
+                if len(self._pending) < self.max_batch:
+                    self._batch_full.clear()
+            return written
+
+    @staticmethod
+    def _replay(conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]) -> int:
+        """Run a failed batch one statement at a time, dropping the ones that fail, and return how many ran"""
+        written = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in batch:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    conn.execute(sql, params)
+                    written += 1
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO queued_write")
+                    print(f"Dropping queued database write that failed ({e}): {sql.strip()} {params}",
+                          file=sys.stderr)
+                conn.execute("RELEASE queued_write")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return written
+
+    @staticmethod
+    def _group(batch: List[Tuple[str, tuple]]) -> List[Tuple[str, List[tuple]]]:
+        """Merge consecutive writes of the same statement into executemany groups"""
+        groups = []
+        for sql, params in batch:
+            if groups and groups[-1][0] == sql:
+                groups[-1][1].append(params)
+            else:
+                groups.append((sql, [params]))
+        return groups
+
+    def _start_flusher(self):
+        """Start the background flush thread on first use"""
+        if self._flusher is None and not self._closed:
+            with self._queue_lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="vault-db-flusher", daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        """Wait for queued writes, give the batch time to grow, then commit it"""
+        while not self._closed:
+            self._has_pending.wait()
+            if self._closed:
+                break
+            self._batch_full.wait(self.flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Error writing queued database changes: {e}", file=sys.stderr)
+
+    def close(self):
+        """Flush outstanding writes and stop the background thread"""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            print(f"Error writing queued database changes: {e}", file=sys.stderr)
+        self._closed = True
+        self._has_pending.set()
+        if self._writer_conn is not None:
+            self._writer_conn.close()
+            self._writer_conn = None
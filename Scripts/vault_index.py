@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Persistent Vault Index
+Incrementally maintained note metadata shared by all vault scripts
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from note_extractors import run_extractors, extractor_signature
+from vault_walker import VaultEntry, stat_entry, walk_vault
+from vault_db import VaultDB
+from instrumentation import count, timed
+
+# Upper bound on notes handed to a worker process at once
+MAX_CHUNK_SIZE = 256
+
+
+def parse_files(vault_path: str, rel_paths: List[str]) -> List[Tuple[str, Dict]]:
+    """Read and parse a chunk of notes; runs in worker processes"""
+    results = []
+    root = Path(vault_path)
+    for rel_path in rel_paths:
+        try:
+            with open(root / rel_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (UnicodeDecodeError, OSError):
+            continue
+        results.append((rel_path, run_extractors(content)))
+    return results
+
+
+class VaultIndex:
+    """Persistent per-note metadata index stored in claude_evolution.db"""
+
+    def __init__(self, vault_path: str, db_path: Optional[str] = None, workers: int = 1):
+        self.vault_path = Path(vault_path)
+        self.db_path = Path(db_path) if db_path else self.vault_path / "claude_evolution.db"
+        self.workers = max(1, workers)
+        self.db = VaultDB.shared(self.db_path)
+        self._refreshed = False
+        self._refresh_lock = threading.Lock()
+        self.init_schema()
+
+    def init_schema(self):
+        """Create the index tables if they don't exist"""
+        with self.db.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS note_index (
+                    path TEXT PRIMARY KEY,
+                    folder TEXT,
+                    parent TEXT,
+                    name TEXT,
+                    mtime_ns INTEGER,
+                    ctime REAL,
+                    size INTEGER,
+                    data TEXT,
+                    seq INTEGER DEFAULT 0
+                )
+            """)
+
+            # Indexes created before change tracking lack the seq column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(note_index)")}
+            if 'seq' not in columns:
+                conn.execute("ALTER TABLE note_index ADD COLUMN seq INTEGER DEFAULT 0")
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+            # Tombstones let derived structures catch up on deleted notes
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_removals (
+                    path TEXT PRIMARY KEY,
+                    seq INTEGER
+                )
+            """)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped every time the index content changes"""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'generation'"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _scan_files(self) -> Dict[str, VaultEntry]:
+        """Stat every markdown note in the vault, keyed by relative path"""
+        return {entry.rel_path: entry for entry in walk_vault(self.vault_path)}
+
+    @timed()
+    def refresh(self) -> Dict:
+        """Re-parse notes whose mtime or size changed and drop deleted ones"""
+        on_disk = self._scan_files()
+        summary = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        with self.db.connection() as conn:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in conn.execute(
+                    "SELECT path, mtime_ns, size FROM note_index"
+                )
+            }
+
+            # A changed extractor set invalidates every parsed row
+            signature = extractor_signature()
+            stored = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'extractors'"
+            ).fetchone()
+            reparse_all = stored is None or stored[0] != signature
+
+            removed = [path for path in known if path not in on_disk]
+            self._apply_scan(conn, on_disk, known, removed, reparse_all, summary)
+            if reparse_all:
+                conn.execute(
+                    "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('extractors', ?)",
+                    (signature,)
+                )
+
+        self._refreshed = True
+        return summary
+
+    @timed()
+    def refresh_paths(self, rel_paths: Iterable[str]) -> Dict:
+        """Re-index only the given notes, e.g. ones a file watcher reported, without walking the vault"""
+        if not self._refreshed or self._extractors_stale():
+            return self.refresh()
+
+        rel_paths = list(dict.fromkeys(rel_paths))
+        on_disk = {}
+        for rel_path in rel_paths:
+            entry = stat_entry(self.vault_path, rel_path)
+            if entry is not None:
+                on_disk[rel_path] = entry
+        summary = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        with self.db.connection() as conn:
+            known = {}
+            for rel_path in rel_paths:
+                row = conn.execute(
+                    "SELECT mtime_ns, size FROM note_index WHERE path = ?", (rel_path,)
+                ).fetchone()
+                if row:
+                    known[rel_path] = tuple(row)
+            removed = [path for path in known if path not in on_disk]
+            self._apply_scan(conn, on_disk, known, removed, False, summary)
+
+        return summary
+
+    def apply_changes(self, events) -> Dict:
+        """Bring the index up to date with a batch of watcher events (vault_watcher.WatchEvent)"""
+        edited = {event.path for event in events if event.kind == 'modified'}
+        for event in events:
+            # Re-key renamed notes instead of parsing them again; edited ones are re-parsed below
+            if event.kind == 'moved' and event.dest not in edited and (self.vault_path / event.dest).is_file():
+                self.move(event.path, event.dest)
+        return self.refresh_paths(event_path for event in events for event_path in event.paths())
+
+    def _extractors_stale(self) -> bool:
+        """Whether the stored rows were parsed by a different extractor set"""
+        with self.db.connection() as conn:
+            stored = conn.execute(
+                "SELECT value FROM index_meta WHERE key = 'extractors'"
+            ).fetchone()
+        return stored is None or stored[0] != extractor_signature()
+
+    def _apply_scan(self, conn: sqlite3.Connection, on_disk: Dict[str, VaultEntry],
+                    known: Dict[str, tuple], removed: List[str], reparse_all: bool, summary: Dict):
+        """Parse new and changed notes, write them and the removals as one generation"""
+        pending = []
+        for rel_path, entry in on_disk.items():
+            if not reparse_all and known.get(rel_path) == (entry.mtime_ns, entry.size):
+                summary['unchanged'] += 1
+            else:
+                pending.append(rel_path)
+
+        rows = []
+        for rel_path, parsed in self._parse_pending(pending):
+            rows.append(self._make_row(rel_path, on_disk[rel_path], parsed))
+            summary['updated' if rel_path in known else 'added'] += 1
+        count(files=len(rows), bytes=sum(on_disk[row[0]].size for row in rows))
+        summary['removed'] = len(removed)
+
+        if rows or removed:
+            seq = self._bump_generation(conn)
+            self._write_rows(conn, rows, seq)
+            self._write_removals(conn, removed, seq)
+
+    def _parse_pending(self, rel_paths: List[str]) -> List[Tuple[str, Dict]]:
+        """Parse changed notes, fanning out to a process pool when workers > 1"""
+        if self.workers == 1 or len(rel_paths) < 2 * self.workers:
+            return parse_files(str(self.vault_path), rel_paths)
+
+        from concurrent.futures import ProcessPoolExecutor
+        
+        chunk_size = min(MAX_CHUNK_SIZE, -(-len(rel_paths) // (self.workers * 4)))
+        chunks = [rel_paths[i:i + chunk_size] for i in range(0, len(rel_paths), chunk_size)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for chunk_results in executor.map(parse_files, [str(self.vault_path)] * len(chunks), chunks):
+                results.extend(chunk_results)
+
+        # Merge in path order so the outcome never depends on scheduling
+        results.sort(key=lambda item: item[0])
+        return results
+
+    def _make_row(self, rel_path: str, entry: VaultEntry, parsed: Dict) -> tuple:
+        """Build a note_index row from a relative path, walker entry and parsed data"""
+        parts = rel_path.split('/')
+        folder = parts[0] if len(parts) > 1 else ''
+        parent = '/'.join(parts[:-1])
+        return (rel_path, folder, parent, parts[-1], entry.mtime_ns,
+                entry.ctime, entry.size, json.dumps(parsed))
+
+    def _bump_generation(self, conn: sqlite3.Connection) -> int:
+        """Increment the index generation counter and return the new value"""
+        conn.execute("""
+            INSERT INTO index_meta (key, value) VALUES ('generation', '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+        """)
+        return int(conn.execute(
+            "SELECT value FROM index_meta WHERE key = 'generation'"
+        ).fetchone()[0])
+
+    def _write_rows(self, conn: sqlite3.Connection, rows: List[tuple], seq: int):
+        """Upsert note rows stamped with the generation that wrote them"""
+        if not rows:
+            return
+        conn.executemany("""
+            INSERT OR REPLACE INTO note_index (path, folder, parent, name, mtime_ns, ctime, size, data, seq)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [row + (seq,) for row in rows])
+        conn.executemany("DELETE FROM index_removals WHERE path = ?", [(row[0],) for row in rows])
+
+    def _write_removals(self, conn: sqlite3.Connection, paths: List[str], seq: int):
+        """Delete note rows and leave tombstones for change-feed consumers"""
+        if not paths:
+            return
+        conn.executemany("DELETE FROM note_index WHERE path = ?", [(path,) for path in paths])
+        conn.executemany(
+            "INSERT OR REPLACE INTO index_removals (path, seq) VALUES (?, ?)",
+            [(path, seq) for path in paths]
+        )
+
+    @timed()
+    def snapshot_changes(self, seq: int) -> Tuple[List[Dict], List[str], int]:
+        """Notes written and paths removed after the given generation (0 = everything), with that generation
+
+        All three are read in one transaction, so a refresh committed meanwhile by a watcher or
+        the daemon is left for the next sync instead of being skipped when the cursor is stored.
+        """
+        self.ensure_fresh()
+        with self.db.connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'generation'").fetchone()
+            generation = int(row[0]) if row else 0
+            # Rows indexed before change tracking carry seq 0
+            changed = [self._row_to_record(row) for row in conn.execute("""
+                SELECT path, folder, parent, name, mtime_ns, ctime, size, data
+                FROM note_index WHERE seq > ? ORDER BY path
+            """, (seq if seq > 0 else -1,))]
+            removed = [path for path, in conn.execute(
+                "SELECT path FROM index_removals WHERE seq > ? ORDER BY path", (seq,)
+            )]
+        return changed, removed, generation
+
+    def changes_since(self, seq: int) -> Tuple[List[Dict], List[str]]:
+        """Notes written and paths removed after the given generation (0 = everything)"""
+        changed, removed, _ = self.snapshot_changes(seq)
+        return changed, removed
+
+    def get_cursor(self, consumer: str) -> int:
+        """Generation a derived structure has already applied (0 = never synced)"""
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM index_meta WHERE key = ?", (f"cursor:{consumer}",)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def set_cursor(self, consumer: str, seq: int, conn: Optional[sqlite3.Connection] = None):
+        """Record a consumer's progress and drop tombstones every consumer has seen"""
+        if conn is None:
+            with self.db.connection() as conn:
+                return self.set_cursor(consumer, seq, conn)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, ?)",
+            (f"cursor:{consumer}", str(seq))
+        )
+        conn.execute("""
+            DELETE FROM index_removals WHERE seq <= (
+                SELECT MIN(CAST(value AS INTEGER)) FROM index_meta WHERE key LIKE 'cursor:%'
+            )
+        """)
+
+    def ensure_fresh(self):
+        """Refresh the index once per instance before the first query"""
+        if not self._refreshed:
+            with self._refresh_lock:
+                if not self._refreshed:
+                    self.refresh()
+
+    @timed()
+    def notes(self, folder: Optional[str] = None, recursive: bool = True) -> List[Dict]:
+        """Return indexed notes, optionally limited to a folder"""
+        self.ensure_fresh()
+
+        query = "SELECT path, folder, parent, name, mtime_ns, ctime, size, data FROM note_index"
+        params = ()
+        if folder is not None:
+            if recursive:
+                query += " WHERE path LIKE ? ESCAPE '\\'"
+                escaped = folder.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params = (f"{escaped}/%",)
+            else:
+                query += " WHERE parent = ?"
+                params = (folder,)
+        query += " ORDER BY path"
+
+        with self.db.connection() as conn:
+            return [self._row_to_record(row) for row in conn.execute(query, params)]
+
+    def last_path(self, folder: str) -> Optional[str]:
+        """Path of the last note directly inside a folder, in path order"""
+        self.ensure_fresh()
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT path FROM note_index WHERE parent = ? ORDER BY path DESC LIMIT 1", (folder,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, rel_path: str) -> Optional[Dict]:
+        """Return the indexed record for a single note path"""
+        self.ensure_fresh()
+        with self.db.connection() as conn:
+            row = conn.execute("""
+                SELECT path, folder, parent, name, mtime_ns, ctime, size, data
+                FROM note_index WHERE path = ?
+            """, (rel_path,)).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def move(self, old_path: str, new_path: str):
+        """Re-key an indexed note after it was moved, re-parsing it only if it also changed"""
+        entry = stat_entry(self.vault_path, new_path)
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT data, mtime_ns, size FROM note_index WHERE path = ?", (old_path,)
+            ).fetchone()
+            if row is None:
+                return
+            rows = []
+            if entry is not None:
+                if (row[1], row[2]) == (entry.mtime_ns, entry.size):
+                    # A rename keeps mtime and size, so the parsed data still describes the file
+                    rows = [self._make_row(new_path, entry, json.loads(row[0]))]
+                else:
+                    # Edited after the rename as well
+                    rows = [self._make_row(new_path, entry, parsed)
+                            for _, parsed in parse_files(str(self.vault_path), [new_path])]
+            seq = self._bump_generation(conn)
+            self._write_removals(conn, [old_path], seq)
+            self._write_rows(conn, rows, seq)
+
+    def _row_to_record(self, row: tuple) -> Dict:
+        """Convert a note_index row into a note record"""
+        path, folder, parent, name, mtime_ns, ctime, size, data = row
+        record = json.loads(data)
+        record.update({
+            'path': path,
+            'folder': folder,
+            'parent': parent,
+            'name': name,
+            'stem': name[:-3] if name.endswith('.md') else name,
+            'mtime': mtime_ns / 1e9,
+            'ctime': ctime,
+            'size': size
+        })
+        return record
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Index")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--workers', type=int, default=1, help='Parallel parser processes')
+
+    args = parser.parse_args()
+
+    index = VaultIndex(args.vault, workers=args.workers)
+    summary = index.refresh()
+    print(json.dumps(summary, indent=2))
+    print(f"Index generation: {index.generation}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Vault Walker
+Recursive os.scandir traversal that reuses DirEntry stat data and skips ignored paths
+"""
+
+import os
+import re
+import stat
+import fnmatch
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Pattern
+
+# Glob patterns matched against every path component below the vault root
+DEFAULT_IGNORE = ('.*', 'Scripts', 'node_modules', '__pycache__', '07-Archives')
+
+
+class VaultEntry(NamedTuple):
+    """A file found by the walker, with the stat fields scripts actually use"""
+    path: Path
+    rel_path: str
+    name: str
+    mtime_ns: int
+    ctime: float
+    size: int
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.name)[0]
+
+
+def compile_ignore(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Combine ignore globs into one anchored regex"""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns))
+
+
+DEFAULT_IGNORE_RE = compile_ignore(DEFAULT_IGNORE)
+
+
+def walk_vault(vault_path, folder: str = '', pattern: str = '*.md', recursive: bool = True,
+               ignore: Optional[Pattern] = DEFAULT_IGNORE_RE) -> Iterator[VaultEntry]:
+    """Yield matching files under a vault folder, skipping ignored directories"""
+    root = Path(vault_path)
+    name_re = re.compile(fnmatch.translate(pattern))
+    stack = [folder.strip('/')]
+
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            scanner = os.scandir(root / rel_dir if rel_dir else root)
+        except OSError:
+            continue
+
+        with scanner:
+            subdirs = []
+            for entry in scanner:
+                if ignore is not None and ignore.match(entry.name):
+                    continue
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir():
+                        if recursive:
+                            subdirs.append(rel_path)
+                        continue
+                    if not name_re.match(entry.name):
+                        continue
+                    info = entry.stat()
+                except OSError:
+                    continue
+                yield VaultEntry(Path(entry.path), rel_path, entry.name,
+                                 info.st_mtime_ns, info.st_ctime, info.st_size)
+
+        # Depth-first in name order keeps output stable across runs
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def list_folder(vault_path, folder: str, pattern: str = '*.md') -> Iterator[VaultEntry]:
+    """Yield matching files directly inside one vault folder"""
+    return walk_vault(vault_path, folder, pattern, recursive=False)
+
+
+def is_ignored(rel_path: str, ignore: Optional[Pattern] = DEFAULT_IGNORE_RE) -> bool:
+    """Whether any component of a vault-relative path matches the ignore globs"""
+    return ignore is not None and any(ignore.match(part) for part in rel_path.split('/'))
+
+
+def stat_entry(vault_path, rel_path: str, pattern: str = '*.md',
+               ignore: Optional[Pattern] = DEFAULT_IGNORE_RE) -> Optional[VaultEntry]:
+    """Entry for one vault-relative file as walk_vault would yield it, or None if missing or skipped"""
+    name = rel_path.rsplit('/', 1)[-1]
+    if not fnmatch.fnmatchcase(name, pattern) or is_ignored(rel_path, ignore):
+        return None
+    path = Path(vault_path) / rel_path
+    try:
+        info = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    return VaultEntry(path, rel_path, name, info.st_mtime_ns, info.st_ctime, info.st_size)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Vault Watcher
+Reports created, modified, deleted and moved notes from filesystem events, or by polling stat snapshots
+"""
+
+import os
+import queue
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from vault_walker import DEFAULT_IGNORE_RE, is_ignored, walk_vault
+
+# Seconds between stat snapshots when polling; with the debounce this files new inbox notes within a second
+POLL_INTERVAL = 0.25
+
+# Events buffered from watchdog's observer thread before it has to wait for poll()
+MAX_BUFFERED_EVENTS = 10000
+
+
+class WatchEvent(NamedTuple):
+    """One change to a note, with vault-relative posix paths"""
+    kind: str
+    path: str
+    dest: Optional[str] = None
+
+    def paths(self) -> List[str]:
+        """Every note path the event touches"""
+        return [self.path, self.dest] if self.dest else [self.path]
+
+
+class PollingWatcher:
+    """Diffs successive stat-only walks of the vault; no notes are read"""
+
+    def __init__(self, vault_path: str, interval: float = POLL_INTERVAL):
+        self.vault_path = Path(vault_path)
+        self.interval = interval
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self._next_poll = 0.0
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """mtime and size of every note, keyed by relative path"""
+        return {entry.rel_path: (entry.mtime_ns, entry.size) for entry in walk_vault(self.vault_path)}
+
+    def start(self):
+        self.snapshot = self._snapshot()
+        self._next_poll = time.monotonic() + self.interval
+
+    def stop(self):
+        pass
+
+    def poll(self, timeout: float) -> List[WatchEvent]:
+        """Events since the last poll; waits until the next snapshot is due, at most timeout seconds"""
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self.interval
+
+        current = self._snapshot()
+        previous, self.snapshot = self.snapshot, current
+        events = []
+        for rel_path, stamp in current.items():
+            if rel_path not in previous:
+                events.append(WatchEvent('created', rel_path))
+            elif previous[rel_path] != stamp:
+                events.append(WatchEvent('modified', rel_path))
+        events.extend(WatchEvent('deleted', rel_path) for rel_path in previous if rel_path not in current)
+        return events
+
+
+class WatchdogWatcher:
+    """inotify (or the platform equivalent) through watchdog, delivered from its observer thread"""
+
+    # watchdog event types worth reacting to; 'closed' marks the end of a write
+    KINDS = {'created': 'created', 'modified': 'modified', 'closed': 'modified',
+             'deleted': 'deleted', 'moved': 'moved'}
+
+    def __init__(self, vault_path: str):
+        self.vault_path = Path(vault_path).resolve()
+        self.events: 'queue.Queue[WatchEvent]' = queue.Queue(MAX_BUFFERED_EVENTS)
+        self._observer = None
+
+    def _relative(self, path) -> Optional[str]:
+        """Vault-relative note path for an absolute event path, or None if it is not a watched note"""
+        path = os.fsdecode(path)
+        try:
+            rel_path = Path(path).resolve().relative_to(self.vault_path).as_posix()
+        except ValueError:
+            return None
+        if not rel_path.endswith('.md') or is_ignored(rel_path, DEFAULT_IGNORE_RE):
+            return None
+        return rel_path
+
+    def start(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                kind = watcher.KINDS.get(event.event_type)
+                if kind is None or event.is_directory:
+                    return
+                src = watcher._relative(event.src_path)
+                if kind == 'moved':
+                    dest = watcher._relative(event.dest_path)
+                    if src and dest:
+                        watcher.events.put(WatchEvent('moved', src, dest))
+                    elif src:
+                        watcher.events.put(WatchEvent('deleted', src))
+                    elif dest:
+                        watcher.events.put(WatchEvent('created', dest))
+                elif src:
+                    watcher.events.put(WatchEvent(kind, src))
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), str(self.vault_path), recursive=True)
+        self._observer.start()
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def poll(self, timeout: float) -> List[WatchEvent]:
+        """Events delivered so far, waiting up to timeout seconds for the first one"""
+        try:
+            events = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+def create_watcher(vault_path: str, polling: bool = False, interval: float = POLL_INTERVAL):
+    """Filesystem-event watcher when watchdog is installed, stat polling otherwise"""
+    if not polling:
+        try:
+            import watchdog.observers  # noqa: F401
+            return WatchdogWatcher(vault_path)
+        except ImportError:
+            pass
+    return PollingWatcher(vault_path, interval)
+
+
+def main():
+    """Main execution function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault Watcher")
+    parser.add_argument('--vault', default='.', help='Path to Obsidian vault')
+    parser.add_argument('--poll', action='store_true', help='Poll stat snapshots instead of filesystem events')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Seconds between polls')
+
+    args = parser.parse_args()
+
+    watcher = create_watcher(args.vault, args.poll, args.interval)
+    watcher.start()
+    print(f"Watching {args.vault} with {type(watcher).__name__}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            for event in watcher.poll(1.0):
+                print(f"{event.kind}: {event.path}" + (f" -> {event.dest}" if event.dest else ""))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+
+if __name__ == "__main__":
+    main()
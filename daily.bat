@@ -1,4 +1,4 @@
 @echo off
 cd /d "."
-python Scripts/quick-daily.py
+python Scripts/vault.py daily
 pause
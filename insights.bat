@@ -1,4 +1,4 @@
 @echo off  
 cd /d "."
-python Scripts/quick-insights.py
+python Scripts/vault.py insights
 pause
@@ -1,3 +1,3 @@
 @echo off
 cd /d "."
-python Scripts/quick-organize.py
+python Scripts/vault.py organize
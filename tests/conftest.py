@@ -0,0 +1,21 @@
+"""Shared fixtures: the Scripts directory on sys.path and small generated vaults"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "Scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture(scope="session")
+def generated_vault(tmp_path_factory) -> Path:
+    """A small synthetic vault with daily notes, sessions and knowledge notes"""
+    from benchmarks.generate_vault import generate_vault
+
+    target = tmp_path_factory.mktemp("vault")
+    generate_vault(str(target), 200)
+    return target
@@ -0,0 +1,35 @@
+"""Date-range analytics over windows with and without journal data"""
+
+import argparse
+from datetime import date
+
+from date_range import DateRange
+from vault import load_script
+
+
+def test_comprehensive_report_for_window_without_journal_data(generated_vault):
+    engine = load_script('analytics-engine.py')
+    analytics = engine.VaultAnalytics(str(generated_vault))
+    window = DateRange(date(2000, 1, 1), date(2000, 3, 31), '2000-Q1')
+
+    energy = analytics.analyze_productivity_patterns(window)['energy_patterns']
+    assert energy['total_entries'] == 0
+    assert energy['energy_trend'] == 'stable'
+
+    report = analytics.generate_comprehensive_report(window)
+    assert "**Period:** 2000-01-01 to 2000-03-31" in report
+    assert (generated_vault / "11-Analytics" / "comprehensive-report-2000-Q1.md").exists()
+
+
+def test_quarterly_batch_covers_empty_and_populated_quarters(generated_vault, capsys):
+    engine = load_script('analytics-engine.py')
+    analytics = engine.VaultAnalytics(str(generated_vault))
+    args = argparse.Namespace(report='comprehensive', since='2000-01-01', until=None, period=None,
+                              every='quarter')
+
+    engine.run_reports(analytics, args)
+
+    windows = analytics.windows('2000-01-01', every='quarter')
+    assert "comprehensive analytics reports generated!" in capsys.readouterr().out
+    for window in windows:
+        assert (generated_vault / "11-Analytics" / f"comprehensive-report-{window.name}.md").exists()
@@ -0,0 +1,21 @@
+"""Routing inbox notes with the index's parsed fields"""
+
+from vault import load_script
+from vault_index import VaultIndex
+
+auto_organize = load_script('auto-organize.py')
+
+
+def test_daily_heading_past_the_excerpt_still_routes_to_daily(tmp_path):
+    (tmp_path / "00-Inbox").mkdir()
+    filler = "Plain words without any routing keyword. " * 40
+    (tmp_path / "00-Inbox" / "jotting.md").write_text(f"{filler}\n\n## Evening reflection\nGood day\n",
+                                                      encoding='utf-8')
+    index = VaultIndex(str(tmp_path), db_path=str(tmp_path / "index.db"))
+    index.refresh()
+
+    note = index.get("00-Inbox/jotting.md")
+    assert "reflection" not in note['excerpt'] and note['daily_markers']
+
+    results = auto_organize.VaultOrganizer(str(tmp_path), index).organize_inbox(dry_run=True)
+    assert [(result['folder'], result['reason']) for result in results] == [('01-Daily', "Daily note content")]
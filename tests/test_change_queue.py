@@ -0,0 +1,91 @@
+"""Coalescing of watcher events around moved notes"""
+
+import os
+
+from change_queue import ChangeQueue
+from vault_watcher import WatchEvent
+
+
+def drain(queue: ChangeQueue):
+    return sorted(queue.get_batch(timeout=0))
+
+
+def test_recreated_origin_survives_delete_of_moved_note():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('created', '00-Inbox/a.md'))
+    queue.put(WatchEvent('deleted', '05-Ideas/a.md'))
+
+    assert drain(queue) == [WatchEvent('created', '00-Inbox/a.md')]
+
+
+def test_create_at_origin_then_move_then_delete_cancels_out():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('created', '00-Inbox/a.md'))
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('deleted', '05-Ideas/a.md'))
+
+    assert drain(queue) == []
+
+
+def test_moved_then_deleted_note_is_deleted_at_its_origin():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('deleted', '05-Ideas/a.md'))
+
+    assert drain(queue) == [WatchEvent('deleted', '00-Inbox/a.md')]
+
+
+def test_deleting_the_recreated_origin_is_not_mistaken_for_the_move_source():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('created', '00-Inbox/a.md'))
+    queue.put(WatchEvent('deleted', '00-Inbox/a.md'))
+
+    assert drain(queue) == [WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md')]
+
+
+def test_edit_after_a_move_is_kept():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('modified', '05-Ideas/a.md'))
+
+    assert queue.get_batch(timeout=0) == [WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'),
+                                          WatchEvent('modified', '05-Ideas/a.md')]
+
+
+def test_edit_before_a_move_is_kept():
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('modified', '00-Inbox/a.md'))
+    queue.put(WatchEvent('moved', '00-Inbox/a.md', '05-Ideas/a.md'))
+    queue.put(WatchEvent('moved', '05-Ideas/a.md', '06-Knowledge/a.md'))
+
+    assert queue.get_batch(timeout=0) == [WatchEvent('moved', '00-Inbox/a.md', '06-Knowledge/a.md'),
+                                          WatchEvent('modified', '06-Knowledge/a.md')]
+    assert queue.metrics()['delivered'] == 1
+
+
+def test_moved_and_edited_note_is_reparsed(tmp_path):
+    from vault import load_script
+
+    (tmp_path / "05-Ideas").mkdir()
+    (tmp_path / "06-Knowledge").mkdir()
+    origin = tmp_path / "05-Ideas" / "a.md"
+    origin.write_text("Notes #alpha\n", encoding='utf-8')
+    automation = load_script('vault-automation.py').VaultAutomation(str(tmp_path))
+    automation.index.refresh()
+
+    # Same size and mtime after the edit, so only the queue knows the content changed
+    stamp = origin.stat()
+    dest = tmp_path / "06-Knowledge" / "a.md"
+    origin.rename(dest)
+    dest.write_text("Notes #gamma\n", encoding='utf-8')
+    os.utime(dest, ns=(stamp.st_atime_ns, stamp.st_mtime_ns))
+
+    queue = ChangeQueue(debounce=0)
+    queue.put(WatchEvent('moved', '05-Ideas/a.md', '06-Knowledge/a.md'))
+    queue.put(WatchEvent('modified', '06-Knowledge/a.md'))
+    automation.process_changes(queue.get_batch(timeout=0))
+
+    assert automation.index.get('05-Ideas/a.md') is None
+    assert automation.index.get('06-Knowledge/a.md')['tags'] == ['gamma']
@@ -0,0 +1,31 @@
+"""Context sections that miss their deadline"""
+
+import threading
+
+from vault import load_script
+
+context_auto_loader = load_script('context-auto-loader.py')
+
+
+def test_slow_section_without_cache_is_marked_unavailable(generated_vault):
+    loader = context_auto_loader.ContextAutoLoader(str(generated_vault), section_timeout=0.2, use_cache=False)
+    release = threading.Event()
+    builders = loader._section_builders()
+
+    def stalled_goals():
+        release.wait(10)
+        return {}
+
+    builders['active_goals'] = stalled_goals
+    loader._section_builders = lambda: builders
+    try:
+        sections = loader._gather_sections()
+        context = loader._generate_full_context(sections)
+    finally:
+        release.set()
+
+    assert isinstance(sections['active_goals'], context_auto_loader.UnavailableSection)
+    assert sections['user_profile']['name'] == "ahoyb"
+    assert "Short-term Goals" in context
+    assert loader._generate_quick_context(sections)
+    assert loader._context_items(sections)
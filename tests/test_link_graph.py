@@ -0,0 +1,67 @@
+"""Patching the stored link CSR arrays instead of rebuilding them"""
+
+from link_graph import LinkGraph
+from vault_index import VaultIndex
+
+
+def make_vault(tmp_path):
+    for folder in ("00-Inbox", "05-Ideas", "06-Knowledge"):
+        (tmp_path / folder).mkdir()
+    notes = {
+        "00-Inbox/a.md": "Links [[b]] and [[Ideas]] and [[missing]]\n",
+        "05-Ideas/b.md": "Back to [[a]], on to [[06-knowledge/c]]\n",
+        "06-Knowledge/c.md": "See [[b]]\n",
+        "06-Knowledge/d.md": "Links [[c]] and [[e]]\n",
+    }
+    for path, text in notes.items():
+        (tmp_path / path).write_text(text, encoding='utf-8')
+    # Untouched notes keep the changes below a fraction of the vault that still patches
+    for number in range(20):
+        (tmp_path / "06-Knowledge" / f"filler-{number:02d}.md").write_text("[[a]]\n" if number % 2 else "Text\n",
+                                                                          encoding='utf-8')
+    index = VaultIndex(str(tmp_path), db_path=str(tmp_path / "index.db"))
+    index.refresh()
+    return index
+
+
+def snapshot(graph):
+    return (graph.paths, list(graph.indptr), list(graph.indices), list(graph.rev_indptr),
+            list(graph.rev_indices), list(graph.unresolved_counts), graph.unresolved)
+
+
+def rebuilt(index):
+    graph = LinkGraph(index)
+    with index.db.connection() as conn:
+        graph._build(conn)
+    return snapshot(graph)
+
+
+def test_patched_arrays_match_a_full_build(tmp_path, monkeypatch):
+    index = make_vault(tmp_path)
+    LinkGraph(index).load()
+
+    # A note that now resolves a dangling link, an edit, a deletion and a rename
+    (tmp_path / "05-Ideas" / "e.md").write_text("Links [[d]]\n", encoding='utf-8')
+    (tmp_path / "00-Inbox" / "a.md").write_text("Only [[c]] now\n", encoding='utf-8')
+    (tmp_path / "06-Knowledge" / "c.md").unlink()
+    (tmp_path / "06-Knowledge" / "d.md").rename(tmp_path / "05-Ideas" / "d.md")
+    index.refresh()
+
+    def no_build(self, conn):
+        raise AssertionError("full build on a small change")
+
+    graph = LinkGraph(index)
+    with monkeypatch.context() as patch:
+        patch.setattr(LinkGraph, '_build', no_build)
+        graph.load()
+
+    assert snapshot(graph) == rebuilt(index)
+    assert graph.backlinks("05-Ideas/d.md") == ["05-Ideas/e.md"]
+    assert graph.unresolved == 3
+
+
+def test_stored_arrays_are_reused_without_changes(tmp_path):
+    index = make_vault(tmp_path)
+    first = snapshot(LinkGraph(index).load())
+
+    assert snapshot(LinkGraph(index).load()) == first == rebuilt(index)
@@ -0,0 +1,25 @@
+"""Prefix range scans over text keys, including characters outside the BMP"""
+
+from tag_index import TagIndex
+from vault_db import prefix_end
+from vault_index import VaultIndex
+
+
+def test_prefix_end_increments_the_last_character():
+    assert prefix_end("area/") == "area0"
+    assert prefix_end("a\uffff") == "a\U00010000"
+    assert prefix_end("a\U0010ffff") == "b"
+    assert prefix_end("\ud7ff") == "\ue000"
+    assert prefix_end("") is None
+
+
+def test_tag_ranges_include_astral_characters(tmp_path):
+    (tmp_path / "00-Inbox").mkdir()
+    (tmp_path / "00-Inbox" / "\U0001d49c.md").write_text("#area/\U0001d49clpha #area/beta\n", encoding='utf-8')
+    (tmp_path / "00-Inbox" / "plain.md").write_text("#area/beta\n", encoding='utf-8')
+    index = VaultIndex(str(tmp_path), db_path=str(tmp_path / "index.db"))
+    tags = TagIndex(index)
+    tags.sync()
+
+    assert tags.children("area") == [("area/beta", 2), ("area/\U0001d49clpha", 1)]
+    assert sorted(tags.tags_under("00-Inbox/")) == ["00-Inbox/plain.md", "00-Inbox/\U0001d49c.md"]
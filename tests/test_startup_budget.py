@@ -0,0 +1,26 @@
+"""`vault daily` must cold-start within STARTUP_BUDGET_MS"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+VAULT_DIR = Path(__file__).resolve().parent.parent
+
+
+def startup_check(*extra):
+    return subprocess.run(
+        [sys.executable, str(VAULT_DIR / "Scripts" / "vault.py"), '--vault', str(VAULT_DIR), 'startup-check',
+         '--runs', '3', *extra],
+        capture_output=True, text=True
+    )
+
+
+def test_vault_daily_cold_start_within_budget():
+    result = startup_check()
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_startup_check_fails_over_budget():
+    result = startup_check('--budget-ms', '1')
+    assert result.returncode == 1
+    assert "FAIL" in result.stdout
@@ -0,0 +1,34 @@
+"""Serving requests from the daemon's watched index"""
+
+import time
+
+from vault_daemon import VaultDaemon
+
+
+def organize(daemon):
+    return daemon.handle({'token': daemon.token, 'command': 'organize',
+                          'args': {'dry_run': True, 'yes': False}})
+
+
+def test_requests_read_the_index_the_watcher_keeps_current(tmp_path, monkeypatch):
+    (tmp_path / "00-Inbox").mkdir()
+    daemon = VaultDaemon(str(tmp_path))
+    daemon.warm()
+    daemon.watch(polling=True)
+    try:
+        def no_walk():
+            raise AssertionError("request walked the vault")
+
+        monkeypatch.setattr(daemon.index, 'refresh', no_walk)
+        assert "No files to organize." in organize(daemon)['stdout']
+
+        (tmp_path / "00-Inbox" / "project-plan.md").write_text("Roadmap\n", encoding='utf-8')
+        deadline = time.monotonic() + 10
+        while daemon.index.get("00-Inbox/project-plan.md") is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        response = organize(daemon)
+        assert response['ok'] and response['result'] == 1
+        assert "Would move: project-plan.md -> 04-Projects/" in response['stdout']
+    finally:
+        daemon._watching.clear()
@@ -0,0 +1,50 @@
+"""Committing the queued write batch"""
+
+import sqlite3
+
+import pytest
+
+from vault_db import VaultDB, open_connection
+
+
+def make_db(tmp_path):
+    db = VaultDB(tmp_path / "queue.db", flush_interval=60)
+    with db.connection() as conn:
+        conn.execute("CREATE TABLE notes (path TEXT PRIMARY KEY, words INTEGER NOT NULL)")
+    return db
+
+
+def stored(db):
+    with db.connection() as conn:
+        return conn.execute("SELECT path, words FROM notes ORDER BY path").fetchall()
+
+
+def test_failing_write_drops_only_itself(tmp_path):
+    db = make_db(tmp_path)
+    db.enqueue("INSERT INTO notes (path, words) VALUES (?, ?)", ("a.md", 1))
+    db.enqueue("INSERT INTO notes (path, words) VALUES (?, ?)", ("b.md", None))
+    db.enqueue("INSERT INTO notes (path, words) VALUES (?, ?)", ("c.md", 3))
+
+    assert db.flush() == 2
+    assert stored(db) == [("a.md", 1), ("c.md", 3)]
+    assert db.flush() == 0
+    db.close()
+
+
+def test_batch_stays_queued_until_it_commits(tmp_path):
+    db = make_db(tmp_path)
+    db._writer_conn = open_connection(db.db_path, check_same_thread=False)
+    db._writer_conn.isolation_level = None
+    db._writer_conn.execute("PRAGMA busy_timeout = 0")
+    db.enqueue("INSERT INTO notes (path, words) VALUES (?, ?)", ("a.md", 1))
+
+    blocker = sqlite3.connect(db.db_path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError):
+        db.flush()
+    blocker.execute("ROLLBACK")
+    blocker.close()
+
+    assert db.flush() == 1
+    assert stored(db) == [("a.md", 1)]
+    db.close()
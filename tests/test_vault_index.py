@@ -0,0 +1,39 @@
+"""Re-keying moved notes in the persistent vault index"""
+
+import os
+
+from vault_index import VaultIndex
+
+
+def make_vault(tmp_path):
+    (tmp_path / "00-Inbox").mkdir()
+    (tmp_path / "05-Ideas").mkdir()
+    (tmp_path / "00-Inbox" / "a.md").write_text("An idea #alpha\n", encoding='utf-8')
+    index = VaultIndex(str(tmp_path), db_path=str(tmp_path / "index.db"))
+    index.refresh()
+    return index
+
+
+def test_plain_rename_keeps_the_parsed_data(tmp_path):
+    index = make_vault(tmp_path)
+    os.rename(tmp_path / "00-Inbox" / "a.md", tmp_path / "05-Ideas" / "a.md")
+
+    index.move("00-Inbox/a.md", "05-Ideas/a.md")
+
+    assert index.get("00-Inbox/a.md") is None
+    assert index.get("05-Ideas/a.md")['tags'] == ['alpha']
+    assert index.refresh_paths(["00-Inbox/a.md", "05-Ideas/a.md"])['unchanged'] == 1
+
+
+def test_rename_then_edit_reparses_the_destination(tmp_path):
+    index = make_vault(tmp_path)
+    dest = tmp_path / "05-Ideas" / "a.md"
+    os.rename(tmp_path / "00-Inbox" / "a.md", dest)
+    dest.write_text("An idea worth keeping #beta\n", encoding='utf-8')
+
+    # One debounced 'moved' event covers both the rename and the edit
+    index.move("00-Inbox/a.md", "05-Ideas/a.md")
+
+    assert index.get("05-Ideas/a.md")['tags'] == ['beta']
+    index.refresh()
+    assert index.get("05-Ideas/a.md")['tags'] == ['beta']
@@ -0,0 +1,2 @@
+@echo off
+python "%~dp0Scripts\vault.py" --vault "%~dp0." %*